@@ -1,20 +1,64 @@
-import PyPDF2
-import pandas as pd
+import contextlib
+import copy
+import hashlib
+import itertools
+import json
 import re
-from typing import Dict, List, Any
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except:
-    pass
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Mapping, Optional, Sequence, Tuple, Type, Union
+from batch_processing import BatchFailure, DocumentLimits, parse_resumes
+from contact_scanner import CONTACT_KEYS, PHONE_PATTERNS, ContactScanner
+from document import LINE_PARTS, ResumeDocument, TextOrDocument, as_document
+from duplicate_index import DuplicateIndex
+from extraction_cache import ExtractionCache, content_digest
+from instrumentation import NULL_TRACE, Instrumentation, NullTrace
+from ner_fallback import NERFallback
+from page_parallel import PageParallelExtractor
+from output_writers import CheckpointJournal, StreamingCSVWriter, open_output_writer
+from pdf_backends import resolve_backend
+from pdf_sources import PDFInput, open_pdf_source, pdf_buffer, source_name
+from records import ResumeRecordBase, record_type
+from scheduling import SchedulePolicy
+from section_matcher import GrowingTextSections, SectionHeaderMatcher
+
+# Bump when a change to the parsing rules should invalidate cached records
+PARSER_VERSION = 4
+
+# Fields for a quick contact-only parse, all of which usually sit on page 1
+CONTACT_FIELDS = ('name', 'email', 'phone')
+
+# A postal address in the header: a numbered street, or "City, ST 12345"
+ADDRESS_LINES = 10
+STREET_PATTERN = re.compile(r"\b\d{1,6}\s+(?:[A-Za-z0-9.'-]+\s+){1,5}(?:street|st|avenue|ave|road|rd|boulevard|"
+                            r"blvd|lane|ln|drive|dr|court|ct|way|place|pl|terrace|parkway|pkwy)\b\.?",
+                            re.IGNORECASE)
+CITY_STATE_ZIP_PATTERN = re.compile(r"\b[A-Z][A-Za-z .'-]*,\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?\b")
+# Words that mark a header line as an employer or school rather than a person. Only
+# unambiguous ones: words like 'national' or 'group' also turn up in names and titles
+INSTITUTION_WORDS = frozenset(('institute', 'university', 'college', 'school', 'academy',
+                               'corporation', 'corp', 'inc', 'llc', 'ltd', 'plc', 'gmbh'))
+# Function words that turn up in all-caps organisation names but not in personal names
+CAPS_FUNCTION_WORDS = frozenset(('the', 'of', 'and', 'for', 'at', 'in'))
 
 class AdvancedResumePDFToCSV:
-    def __init__(self):
+    def __init__(self, strict: bool = False, cache: Optional[ExtractionCache] = None,
+                 instrumentation: Optional[Instrumentation] = None, backend='auto',
+                 duplicate_index: Optional[DuplicateIndex] = None, ner: Optional[NERFallback] = None,
+                 page_parallel: Optional[PageParallelExtractor] = None):
+        # In strict mode PDF read errors are raised instead of returning empty text
+        self.strict = strict
+        # Optional content-addressed cache of extracted text and parsed records
+        self.cache = cache
+        # Optional per-document stage timings; costs nothing when left as None
+        self.instrumentation = instrumentation
+        # Text extraction library, or an ordered list to fall back through ('auto' = fastest installed)
+        self.backend = resolve_backend(backend)
+        # Optional near-duplicate index; adds a duplicate_of field when set
+        self.duplicate_index = duplicate_index
+        # Optional spaCy fallback for the name and address the heuristics miss
+        self.ner = ner
+        # Optional process pool that splits the pages of very long PDFs
+        self.page_parallel = page_parallel
         self.resume_data = {
             'name': '',
             'email': '',
@@ -48,80 +92,113 @@ class AdvancedResumePDFToCSV:
             'interests': ['interests', 'hobbies', 'personal interests', 'activities'],
             'references': ['references', 'referees']
         }
+        if duplicate_index is not None:
+            self.resume_data['duplicate_of'] = ''
+        self._section_matcher = None
+        self._contact_scanner = ContactScanner()
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def iter_page_texts(self, pdf_path: PDFInput) -> Iterator[str]:
+        """Yield the text of each page in order, extracting pages only as they are consumed"""
+        # A path, or bytes, a buffer, an mmap or a binary file object, read without copying where possible
+        with open_pdf_source(pdf_path) as source:
+            yield from self.backend.iter_pages(source)
+
+    def _iter_whole_document(self, pdf_path: PDFInput, max_pages: Optional[int]) -> Iterator[str]:
+        """Page texts split across the page-parallel pool when it takes the document, else streamed here"""
+        split = None
+        if self.page_parallel is not None:
+            split = self.page_parallel.extract(self.backend, pdf_path, max_pages)
+        if split is not None:
+            yield from split
+        else:
+            yield from self.iter_page_texts(pdf_path)
+
+    def extract_text_from_pdf(self, pdf_path: PDFInput, max_pages: Optional[int] = None,
+                              trace: NullTrace = NULL_TRACE) -> str:
         """Extract text from PDF file with better error handling"""
+        page_texts = []
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                    except Exception as e:
-                        print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
+            with contextlib.closing(self._iter_whole_document(pdf_path, max_pages)) as pages:
+                for page_text in itertools.islice(pages, max_pages):
+                    trace.count_page()
+                    if page_text:
+                        page_texts.append(page_text + "\n")
+            return ''.join(page_texts)
+        except Exception as e:
+            if self.strict:
+                raise
+            print(f"Error reading PDF: {e}")
+            return ""
+
+    def extract_text_until(self, pdf_path: PDFInput, fields: Sequence[str], max_pages: Optional[int] = None,
+                           trace: NullTrace = NULL_TRACE) -> str:
+        """Extract pages only until every requested field is resolved or max_pages is reached"""
+        page_texts = []
+        pending = _PendingFields(self, fields) if fields else None
+        try:
+            with contextlib.closing(self.iter_page_texts(pdf_path)) as pages:
+                for page_text in itertools.islice(pages, max_pages):
+                    trace.count_page()
+                    if not page_text:
                         continue
-                return text
+                    page_texts.append(page_text + "\n")
+                    if pending is not None and pending.add(page_texts[-1]):
+                        break
         except Exception as e:
+            if self.strict:
+                raise
             print(f"Error reading PDF: {e}")
             return ""
+        return ''.join(page_texts)
+
+    def extractor_version(self) -> str:
+        """Identifies the text extractor, part of the text cache key"""
+        return self.backend.version()
+
+    def parser_version(self) -> str:
+        """Identifies the parsing rules and configuration, part of the record cache key"""
+        # Different backends yield different text, so records are cached per backend too
+        config = json.dumps([type(self).__name__, PARSER_VERSION, self.section_headers,
+                             self.extractor_version(), sorted(self.resume_data),
+                             self.ner.version() if self.ner is not None else None], sort_keys=True)
+        return hashlib.sha1(config.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _document_id(pdf_path: PDFInput, text: str) -> str:
+        """How a document is named in the duplicate index: its path or name, or a hash of an anonymous buffer's text"""
+        name = source_name(pdf_path)
+        if name is not None:
+            return name
+        return 'sha1:' + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _lookup_duplicate(self, pdf_path: PDFInput, text: str, trace: NullTrace):
+        """(the earlier document text duplicates or None, its signature or None to leave it unindexed)"""
+        if self.duplicate_index is None:
+            return None, None
+        with trace.stage('duplicate_lookup'):
+            signature = self.duplicate_index.signature(text)
+            if signature is None:
+                return None, None
+            return self.duplicate_index.find(signature, exclude=self._document_id(pdf_path, text)), signature
+
+    def _read_pdf_bytes(self, pdf_path: PDFInput):
+        """The whole PDF as bytes, or a view of the caller's buffer, for hashing and extraction"""
+        try:
+            return pdf_buffer(pdf_path)
+        except OSError as e:
+            if self.strict:
+                raise
+            print(f"Error reading PDF: {e}")
+            return None
     
-    def extract_contact_info(self, text: str) -> Dict[str, str]:
-        """Extract all contact information"""
-        contact_info = {}
-        
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        contact_info['email'] = emails[0] if emails else ""
-        
-        # Phone extraction with multiple patterns
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
-            r'\+?([0-9]{1,3})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})',
-            r'(\d{10})',
-            r'\+\d{1,3}\s?\d{3,4}\s?\d{3,4}\s?\d{3,4}'
-        ]
-        
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    contact_info['phone'] = ''.join(matches[0])
-                else:
-                    contact_info['phone'] = matches[0]
-                break
-        else:
-            contact_info['phone'] = ""
-        
-        # LinkedIn extraction
-        linkedin_pattern = r'(?:linkedin\.com/in/|linkedin\.com/pub/)([A-Za-z0-9\-\.]+)'
-        linkedin_matches = re.findall(linkedin_pattern, text, re.IGNORECASE)
-        contact_info['linkedin'] = f"linkedin.com/in/{linkedin_matches[0]}" if linkedin_matches else ""
-        
-        # GitHub extraction
-        github_pattern = r'(?:github\.com/)([A-Za-z0-9\-\.]+)'
-        github_matches = re.findall(github_pattern, text, re.IGNORECASE)
-        contact_info['github'] = f"github.com/{github_matches[0]}" if github_matches else ""
-        
-        # Website extraction
-        website_pattern = r'(?:https?://)?(?:www\.)?([A-Za-z0-9\-\.]+\.[A-Za-z]{2,})'
-        website_matches = re.findall(website_pattern, text)
-        # Filter out email domains and common sites
-        websites = [w for w in website_matches if not any(domain in w.lower() 
-                   for domain in ['gmail', 'yahoo', 'outlook', 'linkedin', 'github'])]
-        contact_info['website'] = websites[0] if websites else ""
-        
-        return contact_info
+    def extract_contact_info(self, text: str, fields: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """Extract all contact information (or just the given contact fields)"""
+        return self._contact_scanner.scan(text, fields)
     
-    def extract_name(self, text: str) -> str:
+    def extract_name(self, text: TextOrDocument) -> str:
         """Enhanced name extraction"""
-        lines = text.split('\n')
-        
         # Look for name in first few lines
-        for i, line in enumerate(lines[:7]):
+        for i, line in enumerate(as_document(text).lines(7)):
             line = line.strip()
             if not line:
                 continue
@@ -130,6 +207,11 @@ class AdvancedResumePDFToCSV:
             skip_words = ['resume', 'cv', 'curriculum', 'vitae', 'profile', 'contact', 'email', 'phone']
             if any(word in line.lower() for word in skip_words):
                 continue
+
+            # A section header right under the name is not the name
+            heading = line.lower().rstrip(':').strip()
+            if any(heading in keywords for keywords in self.section_headers.values()):
+                continue
                 
             # Skip lines with email or phone
             if '@' in line or re.search(r'\d{3,}', line):
@@ -138,122 +220,358 @@ class AdvancedResumePDFToCSV:
             # Check if it looks like a name (2-4 words, mostly alphabetic)
             words = line.split()
             if 2 <= len(words) <= 4 and all(word.replace('-', '').replace("'", '').isalpha() for word in words):
+                # An employer or school is not the name; if nothing else is, the NER fallback can look
+                lowered = {word.lower() for word in words}
+                if lowered & INSTITUTION_WORDS or (line.isupper() and lowered & CAPS_FUNCTION_WORDS):
+                    continue
                 return line
                 
         return ""
     
-    def find_section_boundaries(self, text: str) -> Dict[str, tuple]:
+    def extract_address(self, text: TextOrDocument) -> str:
+        """The part of a header line that looks like a postal address"""
+        for line in as_document(text).lines(ADDRESS_LINES):
+            for part in LINE_PARTS.findall(line):
+                if '@' not in part and (STREET_PATTERN.search(part) or CITY_STATE_ZIP_PATTERN.search(part)):
+                    return part.strip()
+        return ""
+
+    def find_section_boundaries(self, text: TextOrDocument) -> Dict[str, tuple]:
         """Find start and end positions of each section"""
-        text_lower = text.lower()
-        section_positions = {}
-        
-        for section_key, keywords in self.section_headers.items():
-            for keyword in keywords:
-                # Look for keyword as section header (often followed by colon or newline)
-                patterns = [
-                    rf'\n\s*{re.escape(keyword)}\s*:',
-                    rf'\n\s*{re.escape(keyword)}\s*\n',
-                    rf'^{re.escape(keyword)}\s*:',
-                    rf'^{re.escape(keyword)}\s*\n'
-                ]
-                
-                for pattern in patterns:
-                    match = re.search(pattern, text_lower, re.MULTILINE)
-                    if match:
-                        section_positions[section_key] = match.start()
-                        break
-                
-                if section_key in section_positions:
-                    break
-        
-        return section_positions
+        # Compile the header dictionary once, and again only if it was modified; a
+        # local reference keeps this safe when threads rebuild it concurrently
+        return self._matcher().find(as_document(text).lower)
+
+    def _matcher(self) -> SectionHeaderMatcher:
+        matcher = self._section_matcher
+        if matcher is None or matcher.section_headers != self.section_headers:
+            matcher = SectionHeaderMatcher(self.section_headers)
+            self._section_matcher = matcher
+        return matcher
     
-    def extract_section_content(self, text: str, section_key: str, section_positions: Dict[str, tuple]) -> str:
+    def extract_section_content(self, text: TextOrDocument, section_key: str,
+                                section_positions: Dict[str, tuple]) -> str:
         """Extract content between section boundaries"""
         if section_key not in section_positions:
             return ""
+        document = as_document(text)
         
         start_pos = section_positions[section_key]
         
         # Find the next section to determine end position
-        end_pos = len(text)
+        end_pos = len(document.text)
         for other_section, other_pos in section_positions.items():
             if other_section != section_key and other_pos > start_pos:
                 end_pos = min(end_pos, other_pos)
         
-        # Extract and clean the section content
-        section_text = text[start_pos:end_pos]
-        lines = section_text.split('\n')
-        
-        # Remove the section header line
-        content_lines = []
-        header_found = False
-        
-        for line in lines:
-            line = line.strip()
-            if not header_found:
-                # Skip until we pass the header
-                if any(keyword in line.lower() for keyword in self.section_headers[section_key]):
-                    header_found = True
-                continue
-            
-            if line:
-                content_lines.append(line)
-        
-        return '\n'.join(content_lines)
+        # Skip lines until we pass the header; the content is every non-empty line after it
+        keywords = self.section_headers[section_key]
+        for line_start, line_end in document.line_spans(start_pos, end_pos):
+            line = document.text[line_start:line_end].strip().lower()
+            if any(keyword in line for keyword in keywords):
+                return document.join_lines(line_end + 1, end_pos, '\n') if line_end < end_pos else ""
+        return ""
     
-    def parse_resume(self, pdf_path: str) -> Dict[str, Any]:
-        """Parse resume and extract all information"""
-        # Extract text from PDF
-        text = self.extract_text_from_pdf(pdf_path)
+    def record_type(self) -> Type[ResumeRecordBase]:
+        """The immutable record class parse_resume returns, one field per resume_data key"""
+        return record_type(self.resume_data)
+
+    def parse_resume(self, pdf_path: PDFInput, fields: Optional[Sequence[str]] = None,
+                     max_pages: Optional[int] = None) -> ResumeRecordBase:
+        """Parse resume and extract all information
+
+        Returns a new immutable record per call and leaves the parser
+        untouched, so one parser can serve many threads at once.
+        pdf_path may also be bytes, a bytearray, memoryview or mmap, a
+        binary file object, or a PDFDocument (e.g. from iter_archive);
+        buffers are read in place rather than copied.
+
+        With fields (e.g. CONTACT_FIELDS) pages are read only until those
+        fields are resolved, and max_pages caps how many pages are read at
+        all. Either way the record is built from the pages that were read,
+        and the cache is bypassed since the text is partial.
+        """
+        result = self.parse_resume_batch([pdf_path], fields, max_pages)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def parse_resume_batch(self, pdf_paths: Sequence[PDFInput], fields: Optional[Sequence[str]] = None,
+                           max_pages: Optional[int] = None) -> List[Union[ResumeRecordBase, Exception]]:
+        """Parse several resumes, sending those the NER fallback is needed for through it together
+
+        Gives the same records as parse_resume on each one. With an NER
+        fallback, the documents whose name or address the heuristics
+        missed share one nlp.pipe call instead of one each. An exception
+        from one document is returned in its place, so the others still
+        complete.
+        """
+        unknown = [field for field in fields or () if field not in self.resume_data]
+        if unknown:
+            raise ValueError(f"Unknown resume fields: {', '.join(unknown)}")
+
+        # resume_data is only the template; each document fills its own copy
+        record_class = self.record_type()
+        results: List[Union[ResumeRecordBase, Exception, None]] = []
+        # (position in results, data, trace, header for the model, work left once it has run)
+        pending: List[Tuple[int, Dict[str, Any], NullTrace, str, Callable[[], None]]] = []
+        for pdf_path in pdf_paths:
+            data = dict.fromkeys(record_class._fields, '')
+            trace = NULL_TRACE
+            if self.instrumentation is not None:
+                trace = self.instrumentation.start(source_name(pdf_path) or pdf_path, type(self).__name__)
+            try:
+                deferred = self._parse(pdf_path, fields, max_pages, trace, data)
+            except Exception as e:
+                results.append(self._failed(trace, e))
+                continue
+            if deferred is None:
+                trace.finish()
+                results.append(record_class._make(data[key] for key in record_class._fields))
+            else:
+                pending.append((len(results), data, trace, *deferred))
+                results.append(None)
+
+        if pending:
+            started = time.perf_counter()
+            try:
+                self.ner.fill([(header, data) for _, data, _, header, _ in pending])
+            except Exception as e:
+                for position, _, trace, _, _ in pending:
+                    results[position] = self._failed(trace, e)
+                return results
+            # Each document is charged its share of the batch
+            share = (time.perf_counter() - started) / len(pending)
+            for position, data, trace, _, finish in pending:
+                trace.add_stage('ner_fallback', share)
+                try:
+                    finish()
+                except Exception as e:
+                    results[position] = self._failed(trace, e)
+                    continue
+                trace.finish()
+                results[position] = record_class._make(data[key] for key in record_class._fields)
+        return results
+
+    @staticmethod
+    def _failed(trace: NullTrace, error: Exception) -> Exception:
+        trace.set('error', f"{type(error).__name__}: {error}")
+        trace.finish()
+        return error
+
+    def _parse(self, pdf_path: PDFInput, fields: Optional[Sequence[str]], max_pages: Optional[int],
+               trace: NullTrace, data: Dict[str, Any]) -> Optional[Tuple[str, Callable[[], None]]]:
+        """Fill data in place from the PDF
+
+        Returns None when data is complete. When the NER fallback still has
+        fields to fill, returns the header to run it on and a callable that
+        stores the finished record (in the duplicate index and the cache),
+        to be called once it has.
+        """
+        # Extract text from PDF, going through the cache when there is one
+        partial = fields is not None or max_pages is not None
+        if partial:
+            with trace.stage('extract_text_from_pdf'):
+                text = self.extract_text_until(pdf_path, fields or (), max_pages, trace)
+        elif self.cache is None:
+            with trace.stage('extract_text_from_pdf'):
+                text = self.extract_text_from_pdf(pdf_path, trace=trace)
+        else:
+            with trace.stage('cache_lookup'):
+                pdf_bytes = self._read_pdf_bytes(pdf_path)
+                if pdf_bytes is None:
+                    return None
+                digest = content_digest(pdf_bytes)
+                parser_version = self.parser_version()
+                record = self.cache.get_record(digest, parser_version)
+                if record is not None:
+                    trace.set('cache', 'record')
+                    data.update(record)
+                    if self.duplicate_index is None:
+                        return None
+                text = self.cache.get_text(digest, self.extractor_version())
+
+            if text is None:
+                with trace.stage('extract_text_from_pdf'):
+                    text = self.extract_text_from_pdf(pdf_bytes, trace=trace)
+                # Empty text may be a read error in non-strict mode, so never cache it
+                if text:
+                    self.cache.put_text(digest, self.extractor_version(), text)
+            elif record is None:
+                trace.set('cache', 'text')
+            if record is not None:
+                # What a document duplicates depends on what else is indexed, so it is never cached
+                if text:
+                    duplicate, signature = self._lookup_duplicate(pdf_path, text, trace)
+                    if duplicate is not None:
+                        trace.set('duplicate_of', duplicate.doc_id)
+                        data['duplicate_of'] = duplicate.doc_id
+                    elif signature is not None:
+                        self.duplicate_index.add(self._document_id(pdf_path, text), signature,
+                                                 parser_version, data)
+                return None
+        trace.set('chars', len(text))
         if not text:
-            return self.resume_data
+            return None
+        # Built once; the name and section extractors share its lowercase text and line index
+        document = ResumeDocument(text)
+
+        duplicate = signature = None
+        if not partial:
+            duplicate, signature = self._lookup_duplicate(pdf_path, text, trace)
         
         # Extract basic information
-        contact_info = self.extract_contact_info(text)
-        name = self.extract_name(text)
+        with trace.stage('extract_contact_info'):
+            contact_info = self.extract_contact_info(text)
+        with trace.stage('extract_name'):
+            name = self.extract_name(document)
+        with trace.stage('extract_address'):
+            address = self.extract_address(document)
         
         # Update resume data with basic info
-        self.resume_data.update(contact_info)
-        self.resume_data['name'] = name
+        data.update(contact_info)
+        data['name'] = name
+        data['address'] = address
         
-        # Find section boundaries
-        section_positions = self.find_section_boundaries(text)
-        
-        # Extract content for each section
-        for section_key in self.section_headers.keys():
-            content = self.extract_section_content(text, section_key, section_positions)
-            self.resume_data[section_key] = content
-        
-        return self.resume_data
+        if duplicate is not None:
+            trace.set('duplicate_of', duplicate.doc_id)
+            data['duplicate_of'] = duplicate.doc_id
+
+        if (duplicate is not None and self.duplicate_index.reuse_sections
+                and duplicate.parser_version == self.parser_version()):
+            # Contact details are cheap and may be the edit; the sections come from the original
+            for section_key in self.section_headers:
+                data[section_key] = duplicate.record.get(section_key, '')
+        else:
+            # Find section boundaries
+            with trace.stage('find_section_boundaries'):
+                section_positions = self.find_section_boundaries(document)
+
+            # Extract content for each section
+            with trace.stage('extract_section_content'):
+                for section_key in self.section_headers.keys():
+                    content = self.extract_section_content(document, section_key, section_positions)
+                    data[section_key] = content
+
+        def store():
+            if signature is not None and duplicate is None:
+                self.duplicate_index.add(self._document_id(pdf_path, text), signature,
+                                         self.parser_version(), data)
+            if self.cache is not None and not partial:
+                self.cache.put_record(digest, parser_version,
+                                      {key: value for key, value in data.items() if key != 'duplicate_of'})
+
+        if self.ner is not None and self.ner.wanted(data):
+            return self.ner.header(document), store
+        store()
+        return None
     
-    def save_to_csv(self, data: Dict[str, Any], output_path: str):
+    def save_to_csv(self, data: Mapping[str, Any], output_path: str):
         """Save extracted data to CSV file"""
-        # Convert dictionary to DataFrame
-        df = pd.DataFrame([data])
-        
-        # Save to CSV
-        df.to_csv(output_path, index=False)
+        # A single row needs no DataFrame; the csv module writes the same output
+        with StreamingCSVWriter(output_path, list(data.keys())) as writer:
+            writer.write_row(data)
+        print(f"Data saved to {output_path}")
+
+    def save_to_file(self, data: Mapping[str, Any], output_path: str, output_format: Optional[str] = None):
+        """Save extracted data as CSV, JSON Lines, Parquet, Arrow or a SQLite search index (inferred from the extension)"""
+        with open_output_writer(output_path, list(data.keys()), output_format=output_format) as writer:
+            writer.write_row(data)
         print(f"Data saved to {output_path}")
     
-    def process_multiple_resumes(self, pdf_paths: List[str], csv_output_path: str = "all_resumes_data.csv"):
-        """Process multiple resumes and save to a single CSV file"""
-        all_data = []
-        
-        for pdf_path in pdf_paths:
-            try:
-                data = self.parse_resume(pdf_path)
-                all_data.append(data)
-            except Exception as e:
-                print(f"Error processing {pdf_path}: {e}")
-                continue
-        
-        if all_data:
-            df = pd.DataFrame(all_data)
-            df.to_csv(csv_output_path, index=False)
-            print(f"Processed {len(all_data)} resumes. Data saved to {csv_output_path}")
+    def process_multiple_resumes(self, pdf_paths: Iterable[PDFInput], csv_output_path: str = "all_resumes_data.csv",
+                                 workers: int = 1, chunksize: Optional[int] = None,
+                                 flush_every: int = 100, resume: bool = False,
+                                 journal_path: Optional[str] = None, fields: Optional[Sequence[str]] = None,
+                                 max_pages: Optional[int] = None, append: bool = False,
+                                 source_column: bool = False, limits: Optional[DocumentLimits] = None,
+                                 failures_path: Optional[str] = None, output_format: Optional[str] = None,
+                                 partition_by: Optional[str] = None,
+                                 schedule: Union[str, SchedulePolicy] = 'largest-first') -> List[BatchFailure]:
+        """Process multiple resumes and save to a single CSV file
+
+        With workers > 1 (or None for one per CPU) the files are parsed on a
+        process pool; rows keep the input order either way. pdf_paths may be
+        a lazy iterable, such as iter_archive() over a ZIP or TAR of PDFs: it
+        is consumed only as fast as the workers keep up, and each document's
+        name (its path, or archive!member) identifies it in the output. Rows are streamed
+        to the CSV as they are parsed and flushed every flush_every files.
+        With resume=True a checkpoint journal (csv_output_path + '.journal'
+        unless journal_path is given) is kept, and files it already lists as
+        done are skipped. fields and max_pages are passed to parse_resume.
+        append=True adds rows to an existing CSV instead of replacing it; with
+        a journal too, resuming never truncates past where the output ended
+        before the first run. source_column=True adds a leading source_file column with each
+        row's PDF path. limits puts every document under a watchdog that
+        kills it when it runs too long, uses too much memory or has too many
+        pages. failures_path also writes each failure as a CSV row with its
+        reason. output_format is 'csv', 'jsonl', 'parquet', 'arrow' or
+        'sqlite', inferred from the output path's extension when None; the
+        columnar formats write a directory of part files that partition_by
+        ('date' or 'batch') can split, and 'sqlite' a full-text search index
+        (see search_index.py). schedule picks the order and grouping of work
+        on the pool when pdf_paths is a list; see parse_resumes. Returns the
+        files that failed to parse.
+        """
+        failures = []
+        # The counters live in the shared database, so this run's figures are the change from here
+        cache_before = self.cache.stats() if self.cache is not None else None
+        duplicates_before = self.duplicate_index.stats() if self.duplicate_index is not None else None
+
+        journal = None
+        if resume or journal_path:
+            journal = CheckpointJournal(journal_path or csv_output_path + '.journal')
+            if journal.done:
+                print(f"Resuming: skipping files already done in {journal.path} ({len(journal.done)} so far)")
+                remaining = (pdf for pdf in pdf_paths if source_name(pdf) not in journal.done)
+                # Filtered lazily so a streamed archive is still read one document at a time,
+                # but a list stays a list so the rest can still be scheduled by size
+                pdf_paths = list(remaining) if isinstance(pdf_paths, list) else remaining
+
+        # Workers get their own copy of this parser, raising on unreadable PDFs
+        parser = copy.copy(self)
+        parser.strict = True
+        parse_kwargs = {'fields': fields, 'max_pages': max_pages}
+        fieldnames = (['source_file'] if source_column else []) + list(self.resume_data)
+        with contextlib.ExitStack() as stack:
+            writer = stack.enter_context(open_output_writer(
+                csv_output_path, fieldnames, flush_every, journal, append, output_format, partition_by))
+            failure_writer = None
+            if failures_path is not None:
+                # Kept across resumed and appended runs like the rows themselves
+                failure_writer = stack.enter_context(StreamingCSVWriter(
+                    failures_path, ['source_file', 'reason', 'error'], flush_every,
+                    append=append or journal is not None))
+            for _, pdf_path, data, failure in parse_resumes(pdf_paths, parser, workers, chunksize,
+                                                              parse_kwargs, limits, schedule):
+                if failure is not None:
+                    print(f"Error processing {pdf_path}: {failure.error}")
+                    failures.append(failure)
+                    writer.record_failure(pdf_path, failure.error)
+                    if failure_writer is not None:
+                        failure_writer.write_row({'source_file': pdf_path, 'reason': failure.reason,
+                                                  'error': failure.error})
+                    continue
+                if source_column:
+                    data = {'source_file': pdf_path, **data}
+                writer.write_row(data, pdf_path)
+        
+        if writer.rows_written:
+            print(f"Processed {writer.rows_written} resumes. Data saved to {csv_output_path}")
         else:
             print("No resumes were successfully processed.")
+        if failures:
+            print(f"{len(failures)} resumes failed to parse.")
+        if cache_before is not None:
+            stats = _counter_change(cache_before, self.cache.stats())
+            print(f"Cache: {stats['records_hits']} record hits, {stats['records_misses']} misses; "
+                  f"{stats['texts_hits']} text hits, {stats['texts_misses']} misses")
+        if duplicates_before is not None:
+            after = self.duplicate_index.stats()
+            stats = _counter_change(duplicates_before, after)
+            print(f"Duplicates: {stats['duplicates']} of {stats['lookups']} lookups, "
+                  f"{stats['documents']} originals indexed ({after['documents']} in the index)")
+        return failures
 
 # Example usage
 if __name__ == "__main__":
@@ -308,3 +626,64 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"❌ An unexpected error occurred: {e}")
+
+
+def _counter_change(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    """How much each counter in after grew since before"""
+    return {name: value - before.get(name, 0) for name, value in after.items()}
+
+
+class _PendingFields:
+    """Which requested fields more pages could still change, looking at each page once
+
+    Fed the text one page at a time, it gives the same answer as checking
+    the whole text so far: contact patterns other than the phone cannot
+    cross a line break, so each page is searched on its own; the phone
+    only needs the first pattern's reach of the text before the page; the
+    name and address only read the first few lines; and section starts
+    come from a scan of the growing text that never goes back further
+    than its last non-blank line.
+    """
+
+    def __init__(self, parser: AdvancedResumePDFToCSV, fields: Sequence[str]):
+        self.parser = parser
+        self.missing = list(dict.fromkeys(fields))
+        self.header = ''
+        self.line_count = 0
+        self.phone_tail = ''
+        self.sections = (GrowingTextSections(parser._matcher())
+                         if any(field in parser.section_headers for field in self.missing) else None)
+
+    def add(self, page_text: str) -> bool:
+        """Take the next page's text; True once reading more pages could no longer change any field"""
+        parser = self.parser
+        if self.line_count < max(7, ADDRESS_LINES):
+            self.header += page_text
+        self.line_count += page_text.count('\n')
+        section_positions = self.sections.add(page_text.lower()) if self.sections is not None else None
+        phone_text = self.phone_tail + page_text
+        self.phone_tail = phone_text[-PHONE_PATTERNS[0][1]:]
+        contact_fields = [field for field in self.missing if field in CONTACT_KEYS]
+        contact_info = parser.extract_contact_info(page_text, contact_fields) if contact_fields else {}
+        still_missing = []
+        for field in self.missing:
+            if field == 'name':
+                # The name only comes from the first 7 lines, so it is final once they exist
+                resolved = self.line_count >= 7 or bool(parser.extract_name(self.header))
+            elif field == 'address':
+                resolved = self.line_count >= ADDRESS_LINES or bool(parser.extract_address(self.header))
+            elif field in parser.section_headers:
+                # A section can still grow until the next section header appears, and a
+                # better match for its header can still move it, so it is checked every page
+                start = section_positions.get(field)
+                if start is None or not any(pos > start for pos in section_positions.values()):
+                    still_missing.append(field)
+                continue
+            elif field == 'phone':
+                resolved = ContactScanner.phone_final(phone_text)
+            else:
+                resolved = bool(contact_info.get(field))
+            if not resolved:
+                still_missing.append(field)
+        self.missing = still_missing
+        return not still_missing
@@ -0,0 +1,344 @@
+import collections
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from pdf_sources import PDFInput, open_pdf_source, source_name
+from scheduling import WINDOW_PER_WORKER, SchedulePolicy, job_costs, job_size, windowed_units
+
+# Parser owned by the current pool worker, built once by _init_worker,
+# and the keyword arguments passed to every parse_resume call
+_worker_parser = None
+_worker_parse_kwargs: Dict[str, Any] = {}
+
+
+class BatchFailure(NamedTuple):
+    """A file that could not be parsed, with the reason
+
+    reason is 'error' for an exception from the parser, or the limit that
+    stopped the document: 'timeout', 'memory', 'pages', or 'crashed' when
+    the worker process died.
+    """
+    pdf_path: str
+    error: str
+    reason: str = 'error'
+
+
+class DocumentLimits(NamedTuple):
+    """Per-document resource limits enforced by the batch watchdog; None means unlimited"""
+    timeout: Optional[float] = None        # wall-clock seconds
+    max_memory_mb: Optional[int] = None    # resident memory of the worker process (read from /proc)
+    max_page_count: Optional[int] = None   # checked before any text is extracted
+
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in self)
+
+
+class PageLimitExceeded(Exception):
+    pass
+
+
+def _init_worker(parser, parse_kwargs: Dict[str, Any]):
+    """Install the worker's copy of the parser once and keep it for every task"""
+    global _worker_parser, _worker_parse_kwargs
+    _worker_parser = parser
+    _worker_parse_kwargs = parse_kwargs
+
+
+# The data is the parser's immutable record (a named tuple), compact to send between processes.
+# Results carry the document's name, never its content.
+BatchResult = Tuple[int, str, Optional[Mapping[str, Any]], Optional[BatchFailure]]
+Task = Tuple[int, PDFInput]
+
+
+def task_name(task: Task) -> str:
+    """The name a document is reported under: its path or archive!member, else its position"""
+    index, source = task
+    name = source_name(source)
+    return name if name is not None else f"<document {index}>"
+
+
+def _failure(pdf_path: str, error: Exception) -> BatchFailure:
+    if isinstance(error, PageLimitExceeded):
+        return BatchFailure(pdf_path, f"PageLimitExceeded: {error}", 'pages')
+    if isinstance(error, MemoryError):
+        return BatchFailure(pdf_path, f"MemoryError: {error}", 'memory')
+    return BatchFailure(pdf_path, f"{type(error).__name__}: {error}")
+
+
+def _parse_with(parser, parse_kwargs: Dict[str, Any], task: Task,
+                max_page_count: Optional[int] = None) -> BatchResult:
+    """Parse a single file, returning the failure instead of raising"""
+    index, source = task
+    pdf_path = task_name(task)
+    try:
+        if max_page_count is not None:
+            with open_pdf_source(source) as pdf:
+                pages = parser.backend.page_count(pdf)
+            if pages > max_page_count:
+                raise PageLimitExceeded(f"{pages} pages, limit is {max_page_count}")
+        return index, pdf_path, parser.parse_resume(source, **parse_kwargs), None
+    except Exception as e:
+        return index, pdf_path, None, _failure(pdf_path, e)
+
+
+def _parse_tasks(parser, parse_kwargs: Dict[str, Any], tasks: List[Task]) -> List[BatchResult]:
+    """Parse a run of files together where the parser can batch work across them (its NER fallback)"""
+    parse_batch = getattr(parser, 'parse_resume_batch', None)
+    if parse_batch is None:
+        return [_parse_with(parser, parse_kwargs, task) for task in tasks]
+    try:
+        outcomes = parse_batch([source for _, source in tasks], **parse_kwargs)
+    except Exception as e:
+        outcomes = [e] * len(tasks)
+    results = []
+    for task, outcome in zip(tasks, outcomes):
+        pdf_path = task_name(task)
+        if isinstance(outcome, Exception):
+            results.append((task[0], pdf_path, None, _failure(pdf_path, outcome)))
+        else:
+            results.append((task[0], pdf_path, outcome, None))
+    return results
+
+
+def _parse_chunk(chunk: List[Task]) -> List[BatchResult]:
+    """Pool entry point: parse a run of tasks with the worker's own parser"""
+    return _parse_tasks(_worker_parser, _worker_parse_kwargs, chunk)
+
+
+# Chunk size for inputs of unknown length, such as documents streamed from an archive
+STREAM_CHUNKSIZE = 4
+# Documents parsed together without a pool, so the parser can batch across them
+IN_PROCESS_CHUNKSIZE = 32
+# Chunks queued per pool worker: enough to keep it busy, few enough to bound memory
+PENDING_CHUNKS_PER_WORKER = 2
+
+
+def parse_resumes(pdf_paths: Iterable[PDFInput], parser, workers: Optional[int] = None,
+                  chunksize: Optional[int] = None, parse_kwargs: Optional[Dict[str, Any]] = None,
+                  limits: Optional[DocumentLimits] = None,
+                  schedule: Union[str, SchedulePolicy] = 'largest-first') -> Iterator[BatchResult]:
+    """Parse PDFs on a process pool, yielding (index, name, data, failure) in input order
+
+    When pdf_paths has a length, each document's file size and trailer page
+    count are read up front and schedule decides the order and grouping of
+    the work within each window of workers * WINDOW_PER_WORKER documents:
+    'largest-first' (the default) starts the biggest documents first and
+    groups small ones into shared units, 'input' keeps input order in
+    equal-length chunks, and a function taking (costs, workers, chunksize)
+    can return its own units of document positions (see scheduling.py).
+    chunksize caps the documents per unit. Results are held back only
+    until the rest of their window is done, so they still come out in
+    input order and reach the output (and its journal) as the batch goes;
+    work from at most the next window starts in the meantime.
+
+    pdf_paths can also be a lazy iterator, such as documents streamed from
+    an archive: it is then read in input order and only as far ahead as the
+    workers' queues, so streaming a huge archive keeps memory flat. parse_kwargs are passed
+    to every parse_resume call, e.g. fields or max_pages. Each chunk of
+    files goes through the parser's parse_resume_batch when it has one,
+    so its NER fallback runs once per chunk. With limits, every document
+    runs under the watchdog instead, one at a time, even with a single
+    worker, since only a separate process can be killed.
+    """
+    parse_kwargs = parse_kwargs or {}
+    workers = workers or os.cpu_count() or 1
+    total = len(pdf_paths) if hasattr(pdf_paths, '__len__') else None
+    if total is not None:
+        workers = min(workers, max(1, total))
+    tasks = enumerate(pdf_paths)
+    units = None
+    window = workers * WINDOW_PER_WORKER
+    if total is not None and workers > 1:
+        sources = list(pdf_paths)
+        costs = job_costs([job_size(source) for source in sources])
+        units = ((number, [(position, sources[position]) for position in unit])
+                 for number, unit in windowed_units(costs, workers, chunksize, schedule, window))
+
+    if limits is not None and limits.enabled():
+        if units is not None:
+            # One document per process either way; the schedule only sets the order
+            tasks = (task for _, unit in units for task in unit)
+        yield from _parse_watched(tasks, parser, parse_kwargs, workers, limits)
+        return
+
+    if workers == 1:
+        # Run in-process, no point paying for a pool
+        for chunk in iter(lambda: list(itertools.islice(tasks, chunksize or IN_PROCESS_CHUNKSIZE)), []):
+            yield from _parse_tasks(parser, parse_kwargs, chunk)
+        return
+
+    if units is not None:
+        done: Dict[int, BatchResult] = {}
+        next_index = 0
+        finished = queue.SimpleQueue()
+        in_flight = 0
+        waiting = next(units, None)
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(parser, parse_kwargs)) as pool:
+            while True:
+                # A bounded number of units at a time, and none past the window after the one
+                # being released, so held-back results never grow beyond about two windows
+                while (waiting is not None and in_flight < workers * PENDING_CHUNKS_PER_WORKER
+                       and waiting[0] <= next_index // window + 1):
+                    pool.apply_async(_parse_chunk, (waiting[1],), callback=finished.put,
+                                     error_callback=finished.put)
+                    in_flight += 1
+                    waiting = next(units, None)
+                if not in_flight:
+                    break
+                # Collected as they finish, so a large unit never holds up handing out the rest
+                results = finished.get()
+                in_flight -= 1
+                if isinstance(results, BaseException):
+                    raise results
+                for result in results:
+                    done[result[0]] = result
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+        return
+
+    if chunksize is None:
+        chunksize = STREAM_CHUNKSIZE
+    chunks = iter(lambda: list(itertools.islice(tasks, chunksize)), [])
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(parser, parse_kwargs)) as pool:
+        # Pool.imap would drain the whole input into its task queue up front, so
+        # submit a bounded window of chunks instead and collect them in order
+        pending = collections.deque(
+            pool.apply_async(_parse_chunk, (chunk,))
+            for chunk in itertools.islice(chunks, workers * PENDING_CHUNKS_PER_WORKER))
+        while pending:
+            results = pending.popleft().get()
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(pool.apply_async(_parse_chunk, (chunk,)))
+            yield from results
+
+
+# How often the watchdog samples worker memory when a memory limit is set
+MEMORY_POLL_INTERVAL = 0.05
+
+
+def _watched_worker(conn, parser, parse_kwargs: Dict[str, Any], max_page_count: Optional[int]):
+    """Parse one task at a time as the supervisor sends them; None means stop"""
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        conn.send(_parse_with(parser, parse_kwargs, task, max_page_count))
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Resident memory of a process, or None where /proc is not available"""
+    try:
+        with open(f'/proc/{pid}/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _WatchedWorker:
+    """One worker process, its pipe, and the task it is working on"""
+
+    def __init__(self, parser, parse_kwargs: Dict[str, Any], limits: DocumentLimits):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_watched_worker, args=(child_conn, parser, parse_kwargs, limits.max_page_count),
+            daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[Task] = None
+        self.deadline = float('inf')
+
+    def assign(self, task: Task, timeout: Optional[float]):
+        self.task = task
+        self.deadline = time.monotonic() + timeout if timeout is not None else float('inf')
+        self.conn.send(task)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def _parse_watched(tasks: Iterator[Task], parser, parse_kwargs: Dict[str, Any],
+                   workers: int, limits: DocumentLimits) -> Iterator[BatchResult]:
+    """Hand out one document at a time and kill any worker that breaks a limit
+
+    A killed worker is replaced straight away and its document becomes a
+    failure, so the other workers never wait on it. Tasks are pulled only
+    when a worker is free, and results are buffered and yielded in input
+    order.
+    """
+    done: Dict[int, BatchResult] = {}
+    next_index = 0
+    max_rss = limits.max_memory_mb * 1024 * 1024 if limits.max_memory_mb is not None else None
+    pool = [_WatchedWorker(parser, parse_kwargs, limits) for _ in range(workers)]
+
+    def fail(worker, error, reason):
+        index, pdf_path = worker.task[0], task_name(worker.task)
+        done[index] = (index, pdf_path, None, BatchFailure(pdf_path, error, reason))
+        worker.kill()
+        pool[pool.index(worker)] = _WatchedWorker(parser, parse_kwargs, limits)
+
+    try:
+        while True:
+            for worker in pool:
+                if worker.task is None:
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    worker.assign(task, limits.timeout)
+
+            busy = [worker for worker in pool if worker.task is not None]
+            if not busy:
+                break
+            wake = min(worker.deadline for worker in busy) - time.monotonic()
+            if max_rss is not None:
+                wake = min(wake, MEMORY_POLL_INTERVAL)
+            ready = wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy],
+                         timeout=max(0.0, wake) if wake != float('inf') else None)
+
+            for worker in busy:
+                if worker.conn in ready:
+                    try:
+                        result = worker.conn.recv()
+                    except EOFError:
+                        ready.append(worker.process.sentinel)
+                    else:
+                        done[result[0]] = result
+                        worker.task = None
+                        continue
+                if worker.process.sentinel in ready:
+                    worker.process.join()
+                    fail(worker, f"Worker exited with code {worker.process.exitcode}", 'crashed')
+                elif time.monotonic() >= worker.deadline:
+                    fail(worker, f"Timed out after {limits.timeout:g}s", 'timeout')
+                elif max_rss is not None:
+                    rss = _rss_bytes(worker.process.pid)
+                    if rss is not None and rss > max_rss:
+                        fail(worker, f"Worker used {rss / 1048576:.0f} MB, limit is "
+                                     f"{limits.max_memory_mb} MB", 'memory')
+
+            while next_index in done:
+                yield done.pop(next_index)
+                next_index += 1
+    finally:
+        for worker in pool:
+            worker.stop()
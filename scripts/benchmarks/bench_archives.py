@@ -0,0 +1,122 @@
+"""Batch conversion straight from ZIP/TAR archives versus extracting them first
+
+Packs a synthetic corpus into a stored ZIP, a deflated ZIP, a plain TAR
+and a gzipped TAR at two sizes. For each one it times extracting to a
+temporary directory and parsing the files there (the old way), against
+streaming the members with iter_archive. Each run happens in a fresh
+process so its peak resident memory can be reported; streaming should
+keep that flat as the archive grows. Rows are checked to be identical.
+
+Usage: python benchmarks/bench_archives.py [--files 100,400] [--pages 2] [--workers 1]
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfgen import synthetic_resume, write_pdf
+
+ARCHIVES = [('stored.zip', 'zip', zipfile.ZIP_STORED), ('deflated.zip', 'zip', zipfile.ZIP_DEFLATED),
+            ('plain.tar', 'tar', 'w'), ('packed.tar.gz', 'tar', 'w:gz')]
+
+
+def build_archives(out_dir, files, pages):
+    pdf_dir = os.path.join(out_dir, 'pdfs')
+    os.makedirs(pdf_dir)
+    paths = []
+    for i in range(files):
+        path = os.path.join(pdf_dir, f'resume_{i:05d}.pdf')
+        write_pdf(path, synthetic_resume(i, pages=pages))
+        paths.append(path)
+    archives = []
+    for name, kind, mode in ARCHIVES:
+        archive_path = os.path.join(out_dir, name)
+        if kind == 'zip':
+            with zipfile.ZipFile(archive_path, 'w', mode) as archive:
+                for path in paths:
+                    archive.write(path, os.path.basename(path))
+        else:
+            with tarfile.open(archive_path, mode) as archive:
+                for path in paths:
+                    archive.add(path, os.path.basename(path))
+        archives.append(archive_path)
+    return archives
+
+
+def child(mode, archive_path, output_path, workers):
+    """One measured run; prints its seconds and peak RSS as JSON"""
+    from advanced_resume_parser import AdvancedResumePDFToCSV
+    from pdf_sources import iter_archive
+
+    converter = AdvancedResumePDFToCSV()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'stream':
+            converter.process_multiple_resumes(iter_archive(archive_path), output_path, workers=workers)
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                if zipfile.is_zipfile(archive_path):
+                    with zipfile.ZipFile(archive_path) as archive:
+                        archive.extractall(tmp)
+                else:
+                    with tarfile.open(archive_path) as archive:
+                        archive.extractall(tmp)
+                paths = sorted(os.path.join(tmp, name) for name in os.listdir(tmp))
+                converter.process_multiple_resumes(paths, output_path, workers=workers)
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux
+    print(json.dumps({'seconds': seconds, 'peak_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+
+def measure(mode, archive_path, output_path, workers):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, archive_path,
+                             output_path, '--workers', str(workers)],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', default='100,400')
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'ARCHIVE', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child, args.workers)
+        return
+
+    print(f"{'archive':>14} {'files':>6} {'MB':>6} {'extract s':>10} {'stream s':>9} "
+          f"{'extract peak MB':>16} {'stream peak MB':>15}")
+    for files in (int(f) for f in args.files.split(',')):
+        with tempfile.TemporaryDirectory() as tmp:
+            for archive_path in build_archives(tmp, files, args.pages):
+                extracted_csv = os.path.join(tmp, 'extracted.csv')
+                streamed_csv = os.path.join(tmp, 'streamed.csv')
+                extracted = measure('extract', archive_path, extracted_csv, args.workers)
+                streamed = measure('stream', archive_path, streamed_csv, args.workers)
+                assert read_rows(extracted_csv) == read_rows(streamed_csv), archive_path
+                size_mb = os.path.getsize(archive_path) / 1048576
+                print(f"{os.path.basename(archive_path):>14} {files:>6} {size_mb:>6.1f} "
+                      f"{extracted['seconds']:>10.2f} {streamed['seconds']:>9.2f} "
+                      f"{extracted['peak_mb']:>16.1f} {streamed['peak_mb']:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Side-by-side throughput and text quality of the PDF extraction backends
+
+For every installed backend, extracts the synthetic corpus and reports
+pages per second plus how close the text is to the known ground truth:
+word recall, share of lines reproduced exactly, and how often name, email
+and phone come out of the full parser correctly.
+
+Usage: python benchmarks/bench_backends.py [--corpus DIR] [--count 100] [--backends pymupdf,pypdf2]
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import CONTACT_FIELDS, AdvancedResumePDFToCSV
+from corpus import load_corpus
+from pdf_backends import available_backends
+
+
+def word_recall(truth, text):
+    expected = collections.Counter(truth.split())
+    found = collections.Counter(text.split())
+    return sum((expected & found).values()) / max(1, sum(expected.values()))
+
+
+def line_match(truth, text):
+    lines = {line.strip() for line in text.split('\n')}
+    expected = [line.strip() for line in truth.split('\n') if line.strip()]
+    return sum(line in lines for line in expected) / max(1, len(expected))
+
+
+def measure(backend, documents):
+    converter = AdvancedResumePDFToCSV(backend=[backend])
+    texts = []
+    start = time.perf_counter()
+    for document in documents:
+        texts.append(converter.extract_text_from_pdf(document['path']))
+    elapsed = time.perf_counter() - start
+
+    correct = 0
+    for document in documents:
+        data = converter.parse_resume(document['path'])
+        correct += sum(data[field] == document[field] for field in CONTACT_FIELDS)
+    pages = sum(document['pages'] for document in documents)
+    return {
+        'seconds': elapsed,
+        'pages_per_s': pages / elapsed,
+        'word_recall': sum(word_recall(d['text'], t) for d, t in zip(documents, texts)) / len(documents),
+        'line_match': sum(line_match(d['text'], t) for d, t in zip(documents, texts)) / len(documents),
+        'contact_accuracy': correct / (len(documents) * len(CONTACT_FIELDS)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='corpus directory, generated if missing (default: a temp dir)')
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backends', default=','.join(available_backends()))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = load_corpus(args.corpus or tmp, args.count, args.seed)
+        print(f"{len(documents)} documents, {sum(d['pages'] for d in documents)} pages")
+        print(f"{'backend':>9} {'seconds':>8} {'pages/s':>9} {'speedup':>8} "
+              f"{'words':>7} {'lines':>7} {'contact':>8}")
+        baseline = None
+        for backend in args.backends.split(','):
+            result = measure(backend, documents)
+            if baseline is None:
+                baseline = result['seconds']
+            print(f"{backend:>9} {result['seconds']:>8.2f} {result['pages_per_s']:>9.1f} "
+                  f"{baseline / result['seconds']:>7.1f}x {result['word_recall']:>7.1%} "
+                  f"{result['line_match']:>7.1%} {result['contact_accuracy']:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
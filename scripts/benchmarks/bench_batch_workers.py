@@ -0,0 +1,58 @@
+"""Throughput of process_multiple_resumes as the worker count grows
+
+Usage: python benchmarks/bench_batch_workers.py [--files 400] [--pages 2] [--workers 1,2,4,8]
+                                               [--timeout 30]
+
+--timeout runs every document under the watchdog, to measure what it costs.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from batch_processing import DocumentLimits
+from pdfgen import synthetic_resume, write_pdf
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpus})
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=400)
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--workers', default=','.join(map(str, default_workers)))
+    parser.add_argument('--chunksize', type=int, default=None)
+    parser.add_argument('--timeout', type=float, default=None, help='per-document watchdog timeout')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f'resume_{i:05d}.pdf')
+            write_pdf(path, synthetic_resume(i, pages=args.pages))
+            pdf_paths.append(path)
+
+        converter = AdvancedResumePDFToCSV()
+        output_path = os.path.join(tmp, 'out.csv')
+        print(f"{args.files} files x {args.pages} pages, {cpus} CPUs")
+        print(f"{'workers':>8} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(',')):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter.process_multiple_resumes(pdf_paths, output_path, workers=workers,
+                                                   chunksize=args.chunksize,
+                                                   limits=DocumentLimits(timeout=args.timeout))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {args.files / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Cost of extract_contact_info as resumes get longer
+
+Compares the header-first ContactScanner with the previous eight findall
+sweeps over the whole text, and checks both return the same fields for
+every document of a synthetic corpus and for each timed resume.
+
+Usage: python benchmarks/bench_contact_scanner.py [--pages 1,5,20,40] [--repeat 50]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from contact_scanner import ContactScanner
+from corpus import generate_corpus, synthetic_document
+from pdfgen import synthetic_resume
+
+
+def findall_contact_info(text):
+    """The per-pattern findall sweeps the scanner replaced, kept as the reference"""
+    contact_info = {}
+
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, text)
+    contact_info['email'] = emails[0] if emails else ""
+
+    phone_patterns = [
+        r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
+        r'\+?([0-9]{1,3})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})',
+        r'(\d{10})',
+        r'\+\d{1,3}\s?\d{3,4}\s?\d{3,4}\s?\d{3,4}'
+    ]
+    for pattern in phone_patterns:
+        matches = re.findall(pattern, text)
+        if matches:
+            if isinstance(matches[0], tuple):
+                contact_info['phone'] = ''.join(matches[0])
+            else:
+                contact_info['phone'] = matches[0]
+            break
+    else:
+        contact_info['phone'] = ""
+
+    linkedin_pattern = r'(?:linkedin\.com/in/|linkedin\.com/pub/)([A-Za-z0-9\-\.]+)'
+    linkedin_matches = re.findall(linkedin_pattern, text, re.IGNORECASE)
+    contact_info['linkedin'] = f"linkedin.com/in/{linkedin_matches[0]}" if linkedin_matches else ""
+
+    github_pattern = r'(?:github\.com/)([A-Za-z0-9\-\.]+)'
+    github_matches = re.findall(github_pattern, text, re.IGNORECASE)
+    contact_info['github'] = f"github.com/{github_matches[0]}" if github_matches else ""
+
+    website_pattern = r'(?:https?://)?(?:www\.)?([A-Za-z0-9\-\.]+\.[A-Za-z]{2,})'
+    website_matches = re.findall(website_pattern, text)
+    websites = [w for w in website_matches if not any(domain in w.lower()
+               for domain in ['gmail', 'yahoo', 'outlook', 'linkedin', 'github'])]
+    contact_info['website'] = websites[0] if websites else ""
+
+    return contact_info
+
+
+def check_corpus(count):
+    """Both implementations agree on extracted text and on the raw ground-truth text"""
+    parser = AdvancedResumePDFToCSV()
+    with tempfile.TemporaryDirectory() as tmp:
+        for document in generate_corpus(tmp, count):
+            text = parser.extract_text_from_pdf(document['path'])
+            assert parser.extract_contact_info(text) == findall_contact_info(text), document['path']
+    for seed in range(count, count * 5):
+        text = synthetic_document(seed)['truth']['text']
+        assert ContactScanner().scan(text) == findall_contact_info(text), seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', default='1,5,20,40')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--check', type=int, default=100, help='corpus documents to compare first')
+    args = parser.parse_args()
+
+    check_corpus(args.check)
+    print(f"Outputs match on {args.check * 5} documents")
+
+    scanner = ContactScanner()
+    print(f"{'pages':>6} {'findall ms':>11} {'scanner ms':>11} {'contact-only ms':>16} {'speedup':>8}")
+    for pages in (int(p) for p in args.pages.split(',')):
+        text = '\n'.join(line for page in synthetic_resume(pages, pages=pages) for line in page)
+        assert scanner.scan(text) == findall_contact_info(text)
+        old = timeit.timeit(lambda: findall_contact_info(text), number=args.repeat) / args.repeat
+        new = timeit.timeit(lambda: scanner.scan(text), number=args.repeat) / args.repeat
+        # What the early-terminating contact parse asks for on every page
+        partial = timeit.timeit(lambda: scanner.scan(text, ('email', 'phone')), number=args.repeat) / args.repeat
+        print(f"{pages:>6} {old * 1000:>11.3f} {new * 1000:>11.3f} {partial * 1000:>16.3f} "
+              f"{old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
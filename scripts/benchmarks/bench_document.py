@@ -0,0 +1,175 @@
+"""Text stages per document with the shared ResumeDocument versus re-deriving every view
+
+Runs the name, section boundary and section content stages of both
+parsers on synthetic resumes of growing length. The reference functions
+below are the per-stage code before the document model: a full split for
+the name, a MULTILINE header scan, a split per section, and a lowercase
+copy plus a regex scan per keyword for each section of the basic parser. Outputs are checked to be identical
+on a corpus first; then time and peak traced allocation per document are
+printed.
+
+Usage: python benchmarks/bench_document.py [--pages 1,5,20,40] [--repeat 50]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from corpus import synthetic_document
+from document import ResumeDocument
+from pdfgen import synthetic_resume
+from resume_pdf_to_csv import ResumePDFToCSV
+
+BASIC_SECTIONS = [
+    (['summary', 'profile', 'objective', 'about'], ['experience', 'education', 'skills', 'work']),
+    (['experience', 'work experience', 'employment', 'work history'], ['education', 'skills', 'projects', 'certifications']),
+    (['education', 'academic', 'qualification', 'degree'], ['skills', 'experience', 'projects', 'certifications']),
+    (['skills', 'technical skills', 'competencies', 'technologies'], ['experience', 'education', 'projects', 'certifications']),
+    (['projects', 'project experience', 'key projects'], ['skills', 'education', 'certifications', 'achievements']),
+    (['certifications', 'certificates', 'licenses'], ['skills', 'projects', 'achievements', 'languages']),
+    (['achievements', 'awards', 'honors', 'accomplishments'], ['languages', 'references', 'interests']),
+    (['languages', 'language skills'], ['references', 'interests', 'hobbies']),
+]
+
+
+_reference_patterns = {}
+
+
+def reference_boundaries(section_headers, text):
+    """The single MULTILINE scan the matcher used before the start-of-text split"""
+    pattern = _reference_patterns.get(id(section_headers))
+    if pattern is None:
+        keywords = {keyword for words in section_headers.values() for keyword in words}
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        pattern = _reference_patterns[id(section_headers)] = re.compile(
+            rf'(?:(?P<newline>\n)\s*|^)(?P<keyword>{alternation})(?=\s*(?P<colon>:)|\s*\n)', re.MULTILINE)
+    matches = {}
+    for match in pattern.finditer(text.lower()):
+        rank = (0 if match.group('colon') else 1) if match.group('newline') is not None else \
+            (2 if match.group('colon') else 3)
+        matches.setdefault(match.group('keyword'), {}).setdefault(rank, match.start())
+    positions = {}
+    for section_key, words in section_headers.items():
+        for keyword in words:
+            if matches.get(keyword):
+                positions[section_key] = matches[keyword][min(matches[keyword])]
+                break
+    return positions
+
+
+def reference_name(section_headers, text):
+    for line in text.split('\n')[:7]:
+        line = line.strip()
+        if not line:
+            continue
+        if any(word in line.lower() for word in ['resume', 'cv', 'curriculum', 'vitae', 'profile',
+                                                  'contact', 'email', 'phone']):
+            continue
+        if any(line.lower().rstrip(':').strip() in keywords for keywords in section_headers.values()):
+            continue
+        if '@' in line or re.search(r'\d{3,}', line):
+            continue
+        words = line.split()
+        if 2 <= len(words) <= 4 and all(word.replace('-', '').replace("'", '').isalpha() for word in words):
+            return line
+    return ""
+
+
+def reference_section(section_headers, text, section_key, positions):
+    if section_key not in positions:
+        return ""
+    start_pos = positions[section_key]
+    end_pos = len(text)
+    for other_section, other_pos in positions.items():
+        if other_section != section_key and other_pos > start_pos:
+            end_pos = min(end_pos, other_pos)
+    content_lines = []
+    header_found = False
+    for line in text[start_pos:end_pos].split('\n'):
+        line = line.strip()
+        if not header_found:
+            if any(keyword in line.lower() for keyword in section_headers[section_key]):
+                header_found = True
+            continue
+        if line:
+            content_lines.append(line)
+    return '\n'.join(content_lines)
+
+
+def reference_basic_section(text, section_keywords, next_section_keywords):
+    text_lower = text.lower()
+    section_start = -1
+    for keyword in section_keywords:
+        match = re.search(rf'\b{re.escape(keyword.lower())}\b', text_lower)
+        if match:
+            section_start = match.start()
+            break
+    if section_start == -1:
+        return ""
+    section_end = len(text)
+    for keyword in next_section_keywords:
+        match = re.search(rf'\b{re.escape(keyword.lower())}\b', text_lower[section_start + 50:])
+        if match:
+            section_end = section_start + 50 + match.start()
+            break
+    lines = text[section_start:section_end].strip().split('\n')
+    return ' | '.join(line.strip() for line in lines[1:] if line.strip())
+
+
+def reference_stages(advanced, text):
+    positions = reference_boundaries(advanced.section_headers, text)
+    return ([reference_name(advanced.section_headers, text), positions]
+            + [reference_section(advanced.section_headers, text, key, positions) for key in advanced.section_headers]
+            + [reference_basic_section(text, *section) for section in BASIC_SECTIONS])
+
+
+def document_stages(advanced, basic, text):
+    document = ResumeDocument(text)
+    positions = advanced.find_section_boundaries(document)
+    return ([advanced.extract_name(document), positions]
+            + [advanced.extract_section_content(document, key, positions) for key in advanced.section_headers]
+            + [basic.extract_section_content(document, *section) for section in BASIC_SECTIONS])
+
+
+def peak_kb(function):
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', default='1,5,20,40')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--check', type=int, default=300, help='corpus documents to compare first')
+    args = parser.parse_args()
+
+    advanced, basic = AdvancedResumePDFToCSV(), ResumePDFToCSV()
+    # Compile both header patterns before timing
+    reference_boundaries(advanced.section_headers, '')
+    advanced.find_section_boundaries('')
+    for seed in range(args.check):
+        text = synthetic_document(seed)['truth']['text']
+        assert reference_stages(advanced, text) == document_stages(advanced, basic, text), seed
+    print(f"Outputs match on {args.check} documents")
+
+    print(f"{'pages':>6} {'before ms':>10} {'after ms':>9} {'speedup':>8} {'before peak KB':>15} {'after peak KB':>14}")
+    for pages in (int(p) for p in args.pages.split(',')):
+        text = '\n'.join(line for page in synthetic_resume(pages, pages=pages) for line in page) + '\n'
+        assert reference_stages(advanced, text) == document_stages(advanced, basic, text)
+        before = timeit.timeit(lambda: reference_stages(advanced, text), number=args.repeat) / args.repeat
+        after = timeit.timeit(lambda: document_stages(advanced, basic, text), number=args.repeat) / args.repeat
+        print(f"{pages:>6} {before * 1000:>10.3f} {after * 1000:>9.3f} {before / after:>7.1f}x "
+              f"{peak_kb(lambda: reference_stages(advanced, text)):>15.1f} "
+              f"{peak_kb(lambda: document_stages(advanced, basic, text)):>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Near-duplicate detection: batch time with and without the index, and its accuracy
+
+Writes a synthetic corpus in which --dup-rate of the files are re-exports
+of an earlier resume with a few lines edited, parses it with and without a
+DuplicateIndex, and checks every duplicate_of against the known originals.
+Also times single lookups as the index grows.
+
+Usage: python benchmarks/bench_duplicates.py [--files 400] [--dup-rate 0.15]
+"""
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from corpus import synthetic_document
+from duplicate_index import DuplicateIndex
+from pdfgen import write_pdf
+
+
+def edited(pages, rng):
+    """A lightly edited copy: a new phone line, one changed line and one dropped line"""
+    pages = [list(lines) for lines in pages]
+    lines = pages[0]
+    lines[2] = f'Phone: +1-{rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}'
+    page = rng.choice(pages)
+    if len(page) > 8:
+        page[rng.randrange(6, len(page))] += ' (updated)'
+        del page[rng.randrange(6, len(page))]
+    return pages
+
+
+def build_corpus(out_dir, files, dup_rate, seed=0):
+    """Write the PDFs in processing order; returns (paths, {duplicate path: original path})"""
+    rng = random.Random(seed)
+    paths, originals, truth = [], [], {}
+    for i in range(files):
+        path = os.path.join(out_dir, f'resume_{i:05d}.pdf')
+        if originals and rng.random() < dup_rate:
+            source_path, pages = rng.choice(originals)
+            write_pdf(path, edited(pages, rng))
+            truth[path] = source_path
+        else:
+            pages = synthetic_document(seed * 1_000_003 + i)['pages']
+            write_pdf(path, pages)
+            originals.append((path, pages))
+        paths.append(path)
+    return paths, truth
+
+
+def run(converter, paths, output_path):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter.process_multiple_resumes(paths, output_path, workers=1, source_column=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=400)
+    parser.add_argument('--dup-rate', type=float, default=0.15)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, truth = build_corpus(tmp, args.files, args.dup_rate)
+        output_path = os.path.join(tmp, 'out.csv')
+        plain = run(AdvancedResumePDFToCSV(), paths, output_path)
+
+        index = DuplicateIndex(os.path.join(tmp, 'dupes.db'), threshold=args.threshold)
+        indexed = run(AdvancedResumePDFToCSV(duplicate_index=index), paths, output_path)
+        with open(output_path, encoding='utf-8', newline='') as file:
+            found = {row['source_file']: row['duplicate_of'] for row in csv.DictReader(file) if row['duplicate_of']}
+
+        correct = sum(found.get(path) == original for path, original in truth.items())
+        false_positives = sum(path not in truth for path in found)
+        print(f"{args.files} files, {len(truth)} near-duplicates")
+        print(f"  without index {plain:.2f}s, with index {indexed:.2f}s")
+        print(f"  recall {correct / max(1, len(truth)):.1%}, {false_positives} false positives")
+
+        # Lookup cost as the index grows: one query per band regardless of size.
+        # Random signatures stand in for unrelated documents.
+        import numpy as np
+
+        probe = index.signature(AdvancedResumePDFToCSV().extract_text_from_pdf(paths[0]))
+        generator = np.random.RandomState(0)
+        big = DuplicateIndex(os.path.join(tmp, 'big.db'), threshold=args.threshold)
+        print(f"{'indexed':>8} {'lookup ms':>10}")
+        indexed_count = 0
+        for size in (1_000, 10_000, 50_000):
+            for i in range(indexed_count, size):
+                big.add(f'doc_{i}', generator.randint(0, 1 << 32, size=big.num_perm, dtype=np.uint32), 'v', {})
+            indexed_count = size
+            repeat = 200
+            start = time.perf_counter()
+            for _ in range(repeat):
+                big.find(probe)
+            print(f"{size:>8} {(time.perf_counter() - start) / repeat * 1000:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Latency saved by page-streaming extraction on long multi-page resumes
+
+Compares a full parse against a contact-only parse (stops once name, email
+and phone are found) and a max_pages cap. For every multi-page length it
+also checks a resume with an international number on page 1 and a US one
+on page 2: the US pattern outranks it in a full parse, so the contact-only
+parse must read on to page 2 and agree.
+
+Usage: python benchmarks/bench_early_termination.py [--pages 5,20,40] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import CONTACT_FIELDS, AdvancedResumePDFToCSV
+from pdfgen import synthetic_resume, write_pdf
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def moved_phone(pages):
+    """The resume with an international number in the header and a US one at the top of page 2"""
+    pages = [list(lines) for lines in pages]
+    email = pages[0][1].split(' | ')[0]
+    pages[0][1] = f'{email} | +44 7946 0958 123'
+    pages[1].insert(0, '(555) 123-4567')
+    return pages
+
+
+def contact_fields(converter, pdf_path, **kwargs):
+    record = converter.parse_resume(pdf_path, **kwargs)
+    return {field: record[field] for field in CONTACT_FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', default='1,5,20,40')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-pages', type=int, default=2)
+    args = parser.parse_args()
+
+    converter = AdvancedResumePDFToCSV()
+    print(f"{'pages':>6} {'full ms':>9} {'contact ms':>11} {'max_pages ms':>13} {'contact saves':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in (int(p) for p in args.pages.split(',')):
+            pdf_path = os.path.join(tmp, f'cv_{pages}.pdf')
+            write_pdf(pdf_path, synthetic_resume(pages, pages=pages))
+
+            full = best_of(args.repeat, lambda: converter.parse_resume(pdf_path))
+            contact = best_of(args.repeat, lambda: converter.parse_resume(pdf_path, fields=CONTACT_FIELDS))
+            assert contact_fields(converter, pdf_path, fields=CONTACT_FIELDS) == contact_fields(converter, pdf_path)
+            if pages > 1:
+                moved_path = os.path.join(tmp, f'cv_{pages}_moved_phone.pdf')
+                write_pdf(moved_path, moved_phone(synthetic_resume(pages, pages=pages)))
+                expected = contact_fields(converter, moved_path)
+                assert expected['phone'] == '5551234567', expected
+                assert contact_fields(converter, moved_path, fields=CONTACT_FIELDS) == expected
+            capped = best_of(args.repeat, lambda: converter.parse_resume(pdf_path, max_pages=args.max_pages))
+            print(f"{pages:>6} {full * 1000:>9.1f} {contact * 1000:>11.1f} {capped * 1000:>13.1f} "
+                  f"{(1 - contact / full) * 100:>13.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Batch throughput with the spaCy NER fallback on and off, and what it recovers
+
+Writes a corpus where some headers defeat the heuristics: names with a
+middle initial or a credential ("Jane A. Smith", "Jane Smith, MBA"), and
+addresses given only as "City, State". Some also have an organisation's
+letterhead above the name, which the heuristics must skip rather than
+take for the name. Converts it with the fallback off
+and on, and prints documents per second, how many documents were sent to
+the model, and how many names and addresses came out right. For scale it
+also times the per-document NLP the fallback avoids: nlp() on the full
+text of every document, one call each.
+
+The fallback uses --model when it is installed. Otherwise it uses a blank
+English pipeline with an entity ruler built from the corpus vocabulary,
+which exercises loading, batching and the header cut but costs far less
+per document than a statistical model, so the relative numbers are what
+carries over.
+
+Usage: python benchmarks/bench_ner.py [--files 300] [--workers 1] [--model en_core_web_sm]
+"""
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from corpus import synthetic_document
+from document import ResumeDocument
+from ner_fallback import NERFallback
+from pdfgen import FIRST_NAMES, LAST_NAMES, write_pdf
+
+LETTERHEADS = ['THE NATIONAL INSTITUTE', 'Northwind Technologies LLC', 'State University Career Center',
+               'ACADEMY OF ARTS']
+
+CITIES = [('Springfield', 'Illinois', 'IL'), ('Austin', 'Texas', 'TX'), ('Portland', 'Oregon', 'OR'),
+          ('Boston', 'Massachusetts', 'MA'), ('Denver', 'Colorado', 'CO')]
+
+
+def build_corpus(out_dir, count):
+    """Write the PDFs; returns (path, true name, true address, full text) per document"""
+    documents = []
+    for i in range(count):
+        rng = random.Random(i)
+        document = synthetic_document(i)
+        lines = document['pages'][0]
+        first, last = lines[0].split()
+        name = lines[0]
+        style = rng.random()
+        if style < 0.2:
+            name = f"{first} {rng.choice('ABCDEFGHJKLMNPRSTW')}. {last}"
+            lines[0] = name
+        elif style < 0.3:
+            lines[0] = f"{name}, {rng.choice(['MBA', 'PhD', 'PMP'])}"
+        elif style < 0.4:
+            lines.insert(0, rng.choice(LETTERHEADS))
+        city, state, code = rng.choice(CITIES)
+        address = ''
+        where = rng.random()
+        if where < 0.4:
+            address = f"{rng.randint(10, 9999)} {rng.choice(LAST_NAMES)} Street, {city}, {code} {rng.randint(10000, 99999)}"
+        elif where < 0.6:
+            address = f"{city}, {state}"
+        if address:
+            lines.insert(1, address)
+        path = os.path.join(out_dir, f'resume_{i:05d}.pdf')
+        write_pdf(path, document['pages'])
+        text = '\n'.join(line for page in document['pages'] for line in page)
+        documents.append((path, name, address, text))
+    return documents
+
+
+def stand_in_model(path):
+    """A saved blank pipeline whose entity ruler knows the corpus names and places"""
+    import spacy
+
+    nlp = spacy.blank('en')
+    ruler = nlp.add_pipe('entity_ruler')
+    initial = {'TEXT': {'REGEX': r'^[A-Z]\.$'}, 'OP': '?'}
+    ruler.add_patterns(
+        [{'label': 'PERSON', 'pattern': [{'TEXT': {'IN': FIRST_NAMES}}, initial, {'TEXT': {'IN': LAST_NAMES}}]}]
+        + [{'label': 'GPE', 'pattern': city} for city, _, _ in CITIES]
+        + [{'label': 'GPE', 'pattern': state} for _, state, _ in CITIES])
+    nlp.to_disk(path)
+    return path
+
+
+def convert(documents, output_path, workers, ner):
+    converter = AdvancedResumePDFToCSV(ner=ner)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter.process_multiple_resumes([path for path, _, _, _ in documents], output_path,
+                                           workers=workers, source_column=True)
+    seconds = time.perf_counter() - started
+    with open(output_path, encoding='utf-8', newline='') as file:
+        rows = list(csv.DictReader(file))
+    return seconds, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--model', default='en_core_web_sm')
+    args = parser.parse_args()
+
+    import spacy
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = build_corpus(tmp, args.files)
+        model = args.model
+        if not (spacy.util.is_package(model) or os.path.exists(model)):
+            print(f"{model} is not installed; using a blank pipeline with an entity ruler")
+            model = stand_in_model(os.path.join(tmp, 'stand_in_model'))
+        ner = NERFallback(model)
+
+        heuristics = AdvancedResumePDFToCSV()
+        for letterhead in LETTERHEADS:
+            assert heuristics.extract_name(f'{letterhead}\nSoftware engineer since 2015\n') == '', letterhead
+        headers = []
+        for _, _, _, text in documents:
+            document = ResumeDocument(text)
+            if ner.wanted({'name': heuristics.extract_name(document), 'address': heuristics.extract_address(document)}):
+                headers.append(ner.header(document))
+
+        print(f"{'NER':>4} {'seconds':>8} {'docs/s':>8} {'names right':>12} {'addresses right':>16}")
+        for label, fallback in (('off', None), ('on', ner)):
+            seconds, rows = convert(documents, os.path.join(tmp, f'ner_{label}.csv'), args.workers, fallback)
+            names = sum(row['name'] == name for row, (_, name, _, _) in zip(rows, documents))
+            addresses = sum(row['address'] == address for row, (_, _, address, _) in zip(rows, documents))
+            print(f"{label:>4} {seconds:>8.2f} {len(rows) / seconds:>8.1f} {names:>8}/{len(rows)} "
+                  f"{addresses:>12}/{len(rows)}")
+        print(f"{len(headers)} of {len(documents)} documents went to the model")
+
+        nlp = spacy.load(model)
+        texts = [text for _, _, _, text in documents]
+        started = time.perf_counter()
+        for text in texts:
+            nlp(text)
+        full = time.perf_counter() - started
+        started = time.perf_counter()
+        list(nlp.pipe(headers, batch_size=ner.batch_size))
+        batched = time.perf_counter() - started
+        print(f"Model time: {full:.2f}s for nlp() on every full text, {batched:.2f}s for "
+              f"{len(headers)} headers through nlp.pipe")
+
+
+if __name__ == '__main__':
+    main()
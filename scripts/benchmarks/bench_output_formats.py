@@ -0,0 +1,88 @@
+"""Write time, read time and size of each output format for a large batch
+
+Parses a small synthetic corpus once, then repeats its rows (each with its
+own source_file) up to --rows, so the comparison measures the writers and
+readers rather than PDF extraction. Reading loads the whole output into a
+pandas DataFrame, as a downstream consumer would. Synthetic text comes from
+a small vocabulary, so the compressed Parquet size is flattering.
+
+Usage: python benchmarks/bench_output_formats.py [--rows 10000] [--documents 200]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from corpus import generate_corpus
+from output_writers import open_output_writer
+
+OUTPUTS = [('csv', 'out.csv'), ('jsonl', 'out.jsonl'), ('parquet', 'out.parquet'), ('arrow', 'out.arrow')]
+
+
+def disk_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def read_back(output_format, path):
+    import pandas as pd
+
+    if output_format == 'csv':
+        return pd.read_csv(path, keep_default_na=False)
+    if output_format == 'jsonl':
+        return pd.read_json(path, lines=True, dtype=False)
+    import pyarrow.dataset
+
+    dataset_format = 'parquet' if output_format == 'parquet' else 'ipc'
+    return pyarrow.dataset.dataset(path, format=dataset_format).to_table().to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--documents', type=int, default=200, help='distinct PDFs parsed to make the rows')
+    parser.add_argument('--flush-every', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        converter = AdvancedResumePDFToCSV()
+        with contextlib.redirect_stdout(io.StringIO()):
+            parsed = [dict(converter.parse_resume(document['path']))
+                      for document in generate_corpus(os.path.join(tmp, 'corpus'), args.documents)]
+        rows = [{'source_file': f'resumes/resume_{i:06d}.pdf', **parsed[i % len(parsed)]}
+                for i in range(args.rows)]
+        fieldnames = list(rows[0])
+
+        print(f"{args.rows} rows, {sum(len(v) for row in rows for v in row.values()) / args.rows:.0f} "
+              f"chars per row")
+        print(f"{'format':>8} {'write s':>8} {'read s':>8} {'MB':>7} {'vs csv':>7}")
+        csv_size = None
+        for output_format, name in OUTPUTS:
+            path = os.path.join(tmp, name)
+            start = time.perf_counter()
+            with open_output_writer(path, fieldnames, args.flush_every) as writer:
+                for row in rows:
+                    writer.write_row(row, row['source_file'])
+            write_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            frame = read_back(output_format, path)
+            read_s = time.perf_counter() - start
+            assert len(frame) == args.rows and frame['education'].iloc[0] == rows[0]['education']
+
+            size = disk_size(path)
+            csv_size = csv_size or size
+            print(f"{output_format:>8} {write_s:>8.3f} {read_s:>8.3f} {size / 1e6:>7.2f} "
+                  f"{size / csv_size:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
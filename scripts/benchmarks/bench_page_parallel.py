@@ -0,0 +1,93 @@
+"""Single-document extraction latency against page count, in-process vs. page-parallel
+
+For each page count, writes one synthetic resume of that length and times
+extract_text_from_pdf on it in-process and with a PageParallelExtractor
+(pool already warm), checking that both return the same text. Documents
+below --threshold stay in-process, so their two timings should match.
+
+Latency only drops with at least as many CPUs as --workers. The benchmark
+also times each page range on its own (opening the document included, as
+a worker does) and estimates the latency with one CPU per worker: the
+slowest worker's share of the ranges plus the dispatch overhead measured
+here (the parallel wall time minus the time spent in the ranges).
+
+Usage: python benchmarks/bench_page_parallel.py [--pages 10,25,50,100,200] [--workers 4]
+                                                [--threshold 40] [--backend auto] [--repeat 5]
+"""
+import argparse
+import heapq
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from page_parallel import DEFAULT_PAGE_THRESHOLD, PageParallelExtractor, _extract_range
+from pdfgen import synthetic_resume, write_pdf
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def estimated_ms(range_ms, workers):
+    """When the last worker finishes if each takes the next range as soon as it is free"""
+    free = [0.0] * workers
+    for milliseconds in range_ms:
+        heapq.heappush(free, heapq.heappop(free) + milliseconds)
+    return max(free)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', default='10,25,50,100,200')
+    parser.add_argument('--workers', type=int, default=max(4, cpus))
+    parser.add_argument('--threshold', type=int, default=DEFAULT_PAGE_THRESHOLD)
+    parser.add_argument('--backend', default='auto')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backend = args.backend if args.backend == 'auto' else args.backend.split(',')
+    sequential = AdvancedResumePDFToCSV(strict=True, backend=backend)
+    page_parallel = PageParallelExtractor(args.workers, args.threshold)
+    parallel = AdvancedResumePDFToCSV(strict=True, backend=backend, page_parallel=page_parallel)
+    chosen = sequential.backend.backends[0].name
+    print(f"backend {chosen}, {args.workers} page workers, threshold {args.threshold} pages, {cpus} CPUs")
+    print(f"{'pages':>6} {'ranges':>7} {'in-process ms':>14} {'parallel ms':>12} {'est. ms':>8} {'speedup':>8}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for pages in (int(n) for n in args.pages.split(',')):
+                path = os.path.join(tmp, f'resume_{pages}.pdf')
+                write_pdf(path, synthetic_resume(pages, pages=pages))
+                expected = sequential.extract_text_from_pdf(path)
+                # Also starts the pool, so its start-up is not counted below
+                assert parallel.extract_text_from_pdf(path) == expected, f"{pages} pages: text differs"
+
+                alone = median_ms(lambda: sequential.extract_text_from_pdf(path), args.repeat)
+                split = median_ms(lambda: parallel.extract_text_from_pdf(path), args.repeat)
+                if pages < args.threshold:
+                    print(f"{pages:>6} {'-':>7} {alone:>14.1f} {split:>12.1f} {alone:>8.1f} {1:>7.1f}x")
+                    continue
+                ranges = page_parallel.ranges(pages)
+                range_ms = [median_ms(lambda: _extract_range((chosen, path, pages_range.start, pages_range.stop)),
+                                      args.repeat)
+                            for pages_range in ranges]
+                overhead = max(0.0, split - sum(range_ms))
+                estimate = estimated_ms(range_ms, args.workers) + overhead
+                print(f"{pages:>6} {len(ranges):>7} {alone:>14.1f} {split:>12.1f} {estimate:>8.1f} "
+                      f"{alone / estimate:>7.1f}x")
+    finally:
+        page_parallel.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Batch runtime on a skewed corpus, input-order chunks vs. largest-first scheduling
+
+Writes many 1-2 page resumes with a few very long ones near the end of the
+input, the case where input-order chunks leave one worker finishing the
+big documents after the rest are idle. Checks that the page counts read
+from the trailers match the real ones, converts the corpus with each
+schedule and checks the outputs are byte-for-byte the same, and prints
+the wall time and the number of work units.
+
+Wall time only shows the difference with at least as many CPUs as
+workers. So the benchmark also times each document on its own and replays
+both schedules over those times for each worker count, handing the next
+unit to whichever worker frees up first as the pool does. It prints that
+simulated makespan too, leaving out per-unit overhead and the limit on
+running more than one scheduling window ahead of the output.
+
+Usage: python benchmarks/bench_scheduling.py [--small 400] [--large 4] [--large-pages 60] [--workers 2,4,8]
+"""
+import argparse
+import contextlib
+import heapq
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from pdfgen import synthetic_resume, write_pdf
+from scheduling import SCHEDULES, job_costs, job_size, windowed_units
+
+
+def build_corpus(out_dir, small, large, large_pages):
+    """Write the PDFs; returns (path, pages) per document, the long ones in the last tenth"""
+    rng = random.Random(0)
+    pages = [rng.choice((1, 2)) for _ in range(small)]
+    tail = max(large, small // 10)
+    for position in rng.sample(range(small + large - tail, small + large), large):
+        pages.insert(position, large_pages)
+    documents = []
+    for i, count in enumerate(pages):
+        path = os.path.join(out_dir, f'resume_{i:05d}.pdf')
+        write_pdf(path, synthetic_resume(i, pages=count))
+        documents.append((path, count))
+    return documents
+
+
+def makespan(units, seconds, workers):
+    """When the last worker finishes if each takes the next unit as soon as it is free"""
+    free = [0.0] * workers
+    for unit in units:
+        heapq.heappush(free, heapq.heappop(free) + sum(seconds[position] for position in unit))
+    return max(free)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--small', type=int, default=400)
+    parser.add_argument('--large', type=int, default=4)
+    parser.add_argument('--large-pages', type=int, default=60)
+    parser.add_argument('--workers', default='2,4,8')
+    parser.add_argument('--chunksize', type=int, default=None)
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(',')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = build_corpus(tmp, args.small, args.large, args.large_pages)
+        pdf_paths = [path for path, _ in documents]
+
+        started = time.perf_counter()
+        sizes = [job_size(path) for path in pdf_paths]
+        metadata = time.perf_counter() - started
+        wrong = [path for (path, pages), size in zip(documents, sizes) if size.pages != pages]
+        assert not wrong, f"trailer page counts are wrong for {len(wrong)} files, e.g. {wrong[0]}"
+        costs = job_costs(sizes)
+        print(f"{len(documents)} files, {args.large} of {args.large_pages} pages; trailer page counts match; "
+              f"metadata read in {metadata * 1000:.0f} ms; {cpus} CPUs")
+
+        converter = AdvancedResumePDFToCSV()
+        seconds = []
+        for path in pdf_paths:
+            began = time.perf_counter()
+            converter.parse_resume(path)
+            seconds.append(time.perf_counter() - began)
+        print(f"Serial parse: {sum(seconds):.2f}s, the long files {max(seconds):.3f}s each at most")
+
+        print(f"{'schedule':>14} {'workers':>8} {'units':>6} {'wall s':>8} {'simulated s':>12}")
+        outputs = {}
+        for workers in worker_counts:
+            for name in SCHEDULES:
+                output_path = os.path.join(tmp, f'{name}_{workers}.csv')
+                began = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    converter.process_multiple_resumes(pdf_paths, output_path, workers=workers,
+                                                       chunksize=args.chunksize, schedule=name)
+                wall = time.perf_counter() - began
+                with open(output_path, 'rb') as file:
+                    outputs[name, workers] = file.read()
+                units = [unit for _, unit in windowed_units(costs, workers, args.chunksize, name)]
+                print(f"{name:>14} {workers:>8} {len(units):>6} {wall:>8.2f} "
+                      f"{makespan(units, seconds, workers):>12.2f}")
+        assert len(set(outputs.values())) == 1, "schedules produced different output"
+        print("Every schedule and worker count wrote identical output")
+
+
+if __name__ == '__main__':
+    main()
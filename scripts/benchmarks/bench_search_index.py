@@ -0,0 +1,140 @@
+"""Searching converted resumes: scanning the CSV vs. the SQLite FTS5 index
+
+Writes --rows synthetic parsed rows (the shape process_multiple_resumes
+produces, with multi-line sections) to a CSV, then times:
+
+- a full scan of the CSV for each query, which is what grepping the output
+  amounts to;
+- loading the rows into the index in bulk;
+- the same queries through ResumeSearchIndex.search, and email and phone
+  lookups through find.
+
+Rows are generated rather than parsed from PDFs, so 100k of them take
+seconds to write. Skills are drawn from about a hundred technologies with
+Zipf-like popularity, so a query matches a realistic share of resumes;
+the last query matches nearly every row, the worst case for ranking,
+since bm25 scores every match before the top 20 are known. The scan and
+the index must return the same resumes for each query.
+
+Usage: python benchmarks/bench_search_index.py [--rows 100000] [--repeat 20]
+"""
+import argparse
+import csv
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from output_writers import StreamingCSVWriter, open_output_writer, read_rows
+from pdfgen import COMPANIES, FIRST_NAMES, LAST_NAMES, SKILLS
+from search_index import ResumeSearchIndex
+
+# pdfgen's skills are the most popular; the rest are made-up technology names
+TECHNOLOGIES = [skill.lower() for skill in SKILLS] + [f'{prefix}{suffix}' for prefix in
+                                                      ('data', 'cloud', 'stream', 'graph', 'micro', 'web', 'sec', 'ml')
+                                                      for suffix in ('base', 'flow', 'ops', 'kit', 'mesh', 'lake',
+                                                                     'forge', 'stack', 'hub', 'scale')]
+POPULARITY = [1 / (rank + 1) for rank in range(len(TECHNOLOGIES))]
+
+# (FTS5 query, the sections it searches, the words every match must contain in them)
+QUERIES = [
+    ('kubernetes AND python', ('skills', 'experience'), ('kubernetes', 'python')),
+    ('rust AND kafka AND terraform', ('skills', 'experience'), ('rust', 'kafka', 'terraform')),
+    ('graphmesh', ('skills',), ('graphmesh',)),
+    ('engineer', ('experience',), ('engineer',)),
+]
+
+
+def synthetic_row(i, fieldnames):
+    rng = random.Random(i)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    experience = []
+    for _ in range(rng.randint(3, 8)):
+        used = rng.choices(TECHNOLOGIES, POPULARITY, k=2)
+        experience.append(f'Software Engineer | {rng.choice(COMPANIES)} | {rng.randint(2010, 2020)}-Present')
+        experience.append(f'Built services with {used[0]} and {used[1]}.')
+    row = dict.fromkeys(fieldnames, '')
+    row.update({
+        'source_file': f'resumes/resume_{i:06d}.pdf',
+        'name': f'{first} {last}',
+        'email': f'{first.lower()}.{last.lower()}{i}@example.com',
+        'phone': f'555{i:07d}',
+        'summary': f'Software engineer with {rng.randint(2, 15)}+ years of experience building web applications.',
+        'education': 'Bachelor of Science in Computer Science | State University | 2014',
+        'skills': ' | '.join(sorted(set(rng.choices(TECHNOLOGIES, POPULARITY, k=8)))),
+        'experience': '\n'.join(experience),
+        'languages': 'English | Spanish',
+    })
+    return row
+
+
+def scan(csv_path, sections, words):
+    """Source files of the rows whose sections contain every word, reading the whole CSV"""
+    matches = set()
+    with open(csv_path, encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            text = set(re.findall(r'\w+', ' '.join(row[section] for section in sections).lower()))
+            if all(word in text for word in words):
+                matches.add(row['source_file'])
+    return matches
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    fieldnames = ['source_file'] + list(AdvancedResumePDFToCSV().resume_data)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, index_path = os.path.join(tmp, 'all.csv'), os.path.join(tmp, 'all.db')
+        with StreamingCSVWriter(csv_path, fieldnames, flush_every=10_000) as writer:
+            for i in range(args.rows):
+                writer.write_row(synthetic_row(i, fieldnames))
+
+        started = time.perf_counter()
+        with open_output_writer(index_path, fieldnames, output_format='sqlite') as writer:
+            for row in read_rows(csv_path):
+                writer.write_row(row)
+        load = time.perf_counter() - started
+        print(f"{args.rows} rows: CSV {os.path.getsize(csv_path) / 1e6:.0f} MB, index "
+              f"{os.path.getsize(index_path) / 1e6:.0f} MB, loaded in {load:.1f}s "
+              f"({args.rows / load:.0f} rows/s, including reading the CSV)")
+
+        print(f"{'query':>30} {'matches':>8} {'CSV scan ms':>12} {'top 20 ms':>10}")
+        with ResumeSearchIndex(index_path) as index:
+            for query, sections, words in QUERIES:
+                began = time.perf_counter()
+                expected = scan(csv_path, sections, words)
+                scan_ms = (time.perf_counter() - began) * 1000
+                found = {hit.row['source_file'] for hit in index.search(query, sections, limit=args.rows)}
+                assert found == expected, f"{query!r}: index found {len(found)}, scan {len(expected)}"
+                top = median_ms(lambda: index.search(query, sections), args.repeat)
+                print(f"{query:>30} {len(expected):>8} {scan_ms:>12.0f} {top:>10.1f}")
+
+            probe = synthetic_row(args.rows // 2, fieldnames)
+            assert [row['source_file'] for row in index.find(email=probe['email'].upper())] == [probe['source_file']]
+            phone = f"({probe['phone'][:3]}) {probe['phone'][3:6]}-{probe['phone'][6:]}"
+            assert [row['source_file'] for row in index.find(phone=phone)] == [probe['source_file']]
+            email_ms = median_ms(lambda: index.find(email=probe['email']), args.repeat)
+            phone_ms = median_ms(lambda: index.find(phone=phone), args.repeat)
+            print(f"Lookups: email {email_ms:.2f} ms, phone {phone_ms:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Cost of find_section_boundaries as the header keyword list grows
+
+Compares the compiled SectionHeaderMatcher with the previous approach of
+searching four patterns per keyword, and checks both return the same
+boundaries.
+
+Usage: python benchmarks/bench_section_matcher.py [--sizes 0,50,200,800] [--repeat 200]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from pdfgen import synthetic_resume
+from section_matcher import SectionHeaderMatcher
+
+
+def per_keyword_boundaries(section_headers, text):
+    """The per-keyword search the matcher replaced, kept as the reference"""
+    text_lower = text.lower()
+    section_positions = {}
+    for section_key, keywords in section_headers.items():
+        for keyword in keywords:
+            patterns = [
+                rf'\n\s*{re.escape(keyword)}\s*:',
+                rf'\n\s*{re.escape(keyword)}\s*\n',
+                rf'^{re.escape(keyword)}\s*:',
+                rf'^{re.escape(keyword)}\s*\n'
+            ]
+            for pattern in patterns:
+                match = re.search(pattern, text_lower, re.MULTILINE)
+                if match:
+                    section_positions[section_key] = match.start()
+                    break
+            if section_key in section_positions:
+                break
+    return section_positions
+
+
+def grown_headers(base, extra_per_section):
+    """Pad every section with synonyms that never occur, placed first so all are tried"""
+    return {key: [f'{key} synonym {i}' for i in range(extra_per_section)] + list(keywords)
+            for key, keywords in base.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='0,10,50,200', help='extra synonyms per section')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    text = '\n'.join(line for page in synthetic_resume(0, pages=args.pages) for line in page)
+    base = AdvancedResumePDFToCSV().section_headers
+
+    print(f"{'keywords':>9} {'per-keyword ms':>15} {'compiled ms':>12} {'compile ms':>11} {'speedup':>8}")
+    for extra in (int(size) for size in args.sizes.split(',')):
+        headers = grown_headers(base, extra)
+        num_keywords = sum(len(keywords) for keywords in headers.values())
+        matcher = SectionHeaderMatcher(headers)
+        assert matcher.find(text.lower()) == per_keyword_boundaries(headers, text)
+
+        # re caches only a few hundred patterns, so large lists recompile every call
+        old = timeit.timeit(lambda: per_keyword_boundaries(headers, text), number=args.repeat) / args.repeat
+        new = timeit.timeit(lambda: matcher.find(text.lower()), number=args.repeat) / args.repeat
+        compile_time = timeit.timeit(lambda: SectionHeaderMatcher(headers), number=5) / 5
+        print(f"{num_keywords:>9} {old * 1000:>15.3f} {new * 1000:>12.3f} {compile_time * 1000:>11.3f} "
+              f"{old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Sharded batch runs as local processes, merged, against one unsharded run
+
+Writes a synthetic corpus, converts it once with run_converter.py, then
+again as N concurrent `--shard i/N` processes followed by
+`--merge-shards N`, and checks the merged CSV is byte-for-byte the
+unsharded one. It also checks that the merge refuses a missing shard
+output and a shard whose journal was cut short, and that rerunning that
+shard picks up where its journal ends, and it repeats the comparison for
+a ZIP archive input.
+
+Speedup needs as many CPUs (or machines) as shards. --files should stay
+above 200 so each of two shards checkpoints more than once.
+
+Usage: python benchmarks/bench_shards.py [--files 400] [--pages 2] [--shards 2,4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS)
+
+from pdfgen import synthetic_resume, write_pdf
+from sharding import Shard, shard_journal_path
+
+CONVERTER = os.path.join(SCRIPTS, 'run_converter.py')
+
+
+def start(*args):
+    return subprocess.Popen([sys.executable, CONVERTER, *args, '--workers', '1'],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+
+def finish(process, expect_ok=True):
+    output = process.communicate()[0]
+    if (process.returncode == 0) != expect_ok:
+        raise AssertionError(f"exit {process.returncode}, expected {'success' if expect_ok else 'failure'}:\n{output}")
+    return output
+
+
+def run(*args, expect_ok=True):
+    return finish(start(*args), expect_ok)
+
+
+def read(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def run_shards(source, output, count):
+    processes = [start(source, output, '--shard', f'{index}/{count}') for index in range(count)]
+    for process in processes:
+        finish(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=400)
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--shards', default='2,4')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_dir = os.path.join(tmp, 'pdfs')
+        os.makedirs(pdf_dir)
+        for i in range(args.files):
+            write_pdf(os.path.join(pdf_dir, f'resume_{i:05d}.pdf'), synthetic_resume(i, pages=args.pages))
+
+        single = os.path.join(tmp, 'single.csv')
+        began = time.perf_counter()
+        run(pdf_dir, single)
+        single_seconds = time.perf_counter() - began
+        print(f"{'shards':>7} {'shard s':>8} {'merge s':>8} {'total s':>8} {'speedup':>8}")
+        print(f"{1:>7} {single_seconds:>8.2f} {0:>8.2f} {single_seconds:>8.2f} {1:>7.1f}x")
+
+        for count in (int(n) for n in args.shards.split(',')):
+            output = os.path.join(tmp, f'sharded_{count}.csv')
+            began = time.perf_counter()
+            run_shards(pdf_dir, output, count)
+            sharded = time.perf_counter()
+            run(pdf_dir, output, '--merge-shards', str(count))
+            merged = time.perf_counter()
+            assert read(output) == read(single), f"merged output of {count} shards differs"
+            print(f"{count:>7} {sharded - began:>8.2f} {merged - sharded:>8.2f} {merged - began:>8.2f} "
+                  f"{single_seconds / (merged - began):>7.1f}x")
+
+        # A shard that never ran
+        last = Shard(1, 2)
+        output = os.path.join(tmp, 'partial.csv')
+        run(pdf_dir, output, '--shard', '0/2')
+        assert 'has no output' in run(pdf_dir, output, '--merge-shards', '2', expect_ok=False)
+        assert not os.path.exists(output)
+
+        # A shard that crashed after its first checkpoint, with rows written past it:
+        # the merge refuses it and a rerun resumes from the checkpoint
+        run(pdf_dir, output, '--shard', str(last))
+        journal = shard_journal_path(output, last)
+        with open(journal, encoding='utf-8') as file:
+            lines = file.readlines()
+        first_checkpoint = [line for line in lines if json.loads(line)['offset'] == json.loads(lines[0])['offset']]
+        assert len(first_checkpoint) < len(lines), "use more --files so a shard checkpoints twice"
+        with open(journal, 'w', encoding='utf-8') as file:
+            file.writelines(first_checkpoint)
+        assert 'shard 1/2 is missing' in run(pdf_dir, output, '--merge-shards', '2', expect_ok=False)
+        assert 'Resuming' in run(pdf_dir, output, '--shard', str(last))
+        run(pdf_dir, output, '--merge-shards', '2')
+        assert read(output) == read(single)
+        print("Merge refuses a missing or interrupted shard; the rerun shard resumes and merges cleanly")
+
+        archive = os.path.join(tmp, 'pdfs.zip')
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as bundle:
+            for name in sorted(os.listdir(pdf_dir)):
+                bundle.write(os.path.join(pdf_dir, name), name)
+        single_archive = os.path.join(tmp, 'archive_single.csv')
+        run(archive, single_archive)
+        output = os.path.join(tmp, 'archive_sharded.csv')
+        run_shards(archive, output, 2)
+        run(archive, output, '--merge-shards', '2')
+        assert read(output) == read(single_archive)
+        print("Sharded archive input merges to the unsharded output")
+
+
+if __name__ == '__main__':
+    main()
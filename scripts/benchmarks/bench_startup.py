@@ -0,0 +1,74 @@
+"""Wall-clock cost of `python run_converter.py` on a single file
+
+Runs the CLI as a fresh interpreter several times and reports the median,
+plus the bare import time of advanced_resume_parser. With --record the
+result is appended as a JSON line so startup cost can be tracked over time.
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--record startup_history.jsonl]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from pdfgen import synthetic_resume, write_pdf
+
+
+def time_command(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=SCRIPTS_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--record', help='append the result to this JSON-lines file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, 'resume.pdf')
+        write_pdf(pdf_path, synthetic_resume(0))
+        output_path = os.path.join(tmp, 'out.csv')
+
+        baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+        import_only = time_command([sys.executable, '-c', 'import advanced_resume_parser'], args.runs)
+        cli = time_command([sys.executable, 'run_converter.py', pdf_path, output_path], args.runs)
+
+    result = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'interpreter_ms': statistics.median(baseline) * 1000,
+        'import_ms': statistics.median(import_only) * 1000,
+        'run_converter_ms': statistics.median(cli) * 1000,
+        'run_converter_min_ms': min(cli) * 1000,
+    }
+    for key in ('interpreter_ms', 'import_ms', 'run_converter_ms', 'run_converter_min_ms'):
+        print(f"{key:>22}: {result[key]:8.1f}")
+
+    if args.record:
+        with open(args.record, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
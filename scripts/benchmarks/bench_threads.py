@@ -0,0 +1,74 @@
+"""One parser shared by many threads: correctness, throughput and record conversion
+
+Parses a synthetic corpus serially, then again with a single
+AdvancedResumePDFToCSV (with an extraction cache) shared by a thread pool,
+and checks every thread got exactly the serial record for its own file.
+Then compares building a DataFrame and an Arrow table from the records
+against building them from dicts.
+
+Usage: python benchmarks/bench_threads.py [--documents 200] [--threads 1,2,4,8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from corpus import generate_corpus
+from extraction_cache import ExtractionCache
+from records import records_to_arrow, records_to_dataframe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--threads', default='1,2,4,8')
+    parser.add_argument('--repeat', type=int, default=25, help='record conversion repetitions')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [document['path'] for document in generate_corpus(tmp, args.documents)]
+        start = time.perf_counter()
+        serial = [AdvancedResumePDFToCSV().parse_resume(path) for path in paths]
+        serial_seconds = time.perf_counter() - start
+        print(f"serial: {serial_seconds:.2f}s")
+
+        print(f"{'threads':>8} {'seconds':>8} {'docs/s':>8}")
+        for threads in (int(t) for t in args.threads.split(',')):
+            # A fresh cache per run, so every run extracts the PDFs and writes to SQLite
+            cache = ExtractionCache(os.path.join(tmp, f'cache_{threads}.db'))
+            shared = AdvancedResumePDFToCSV(cache=cache)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as pool:
+                records = list(pool.map(shared.parse_resume, paths))
+            seconds = time.perf_counter() - start
+            assert records == serial, f"threaded results differ with {threads} threads"
+            print(f"{threads:>8} {seconds:>8.2f} {len(paths) / seconds:>8.1f}")
+            # And again from the cache, whose connections are per thread
+            with ThreadPoolExecutor(threads) as pool:
+                assert list(pool.map(shared.parse_resume, paths)) == serial
+
+        import pandas as pd
+
+        rows = serial * max(1, 10_000 // len(serial))
+        dicts = [dict(record) for record in rows]
+        timings = {}
+        for label, build in (('DataFrame from dicts', lambda: pd.DataFrame(dicts)),
+                             ('DataFrame from records', lambda: records_to_dataframe(rows)),
+                             ('Arrow from records', lambda: records_to_arrow(rows))):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                build()
+            timings[label] = (time.perf_counter() - start) / args.repeat
+        assert records_to_dataframe(rows).equals(pd.DataFrame(dicts))
+        print(f"{len(rows)} rows:")
+        for label, seconds in timings.items():
+            print(f"  {label:<24} {seconds * 1000:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Synthetic resume PDF corpus with known ground truth
+
+Every document varies in page count, section order, header synonyms and
+contact formats. A manifest.json next to the PDFs records what each one
+contains so benchmarks can also check extraction quality.
+
+Usage: python benchmarks/corpus.py OUT_DIR [--count 200] [--seed 0]
+"""
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+from pdfgen import COMPANIES, FIRST_NAMES, LAST_NAMES, SKILLS, write_pdf
+
+LINES_PER_PAGE = 50
+
+# Header synonyms the parsers know, per section
+HEADER_SYNONYMS = {
+    'summary': ['Summary', 'Profile', 'Objective', 'About Me', 'Professional Summary', 'Career Objective'],
+    'experience': ['Experience', 'Work Experience', 'Employment History', 'Professional Experience', 'Work History'],
+    'education': ['Education', 'Academic Background', 'Qualifications', 'Educational Background'],
+    'skills': ['Skills', 'Technical Skills', 'Core Competencies', 'Key Skills', 'Technologies'],
+    'projects': ['Projects', 'Key Projects', 'Notable Projects', 'Personal Projects'],
+    'certifications': ['Certifications', 'Certificates', 'Licenses', 'Credentials'],
+    'achievements': ['Achievements', 'Awards', 'Honors', 'Accomplishments'],
+    'languages': ['Languages', 'Language Skills'],
+    'interests': ['Interests', 'Hobbies', 'Activities'],
+}
+
+UNIVERSITIES = ['State University', 'Institute of Technology', 'City College', 'National University']
+
+
+def _phone(rng: random.Random) -> str:
+    a, b, c = rng.randint(200, 999), rng.randint(200, 999), rng.randint(1000, 9999)
+    return rng.choice([
+        f'+1-{a}-{b}-{c}',
+        f'({a}) {b}-{c}',
+        f'{a}.{b}.{c}',
+        f'{a}{b}{c}',
+        f'+91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}',
+        f'+44 {rng.randint(1000, 9999)} {rng.randint(100, 999)} {rng.randint(100, 999)}',
+    ])
+
+
+def _header(rng: random.Random, section: str) -> str:
+    header = rng.choice(HEADER_SYNONYMS[section])
+    return rng.choice([header, header.upper(), header + ':', header.upper() + ':'])
+
+
+def _section_body(rng: random.Random, section: str, lines: int) -> List[str]:
+    if section == 'experience':
+        body = []
+        while len(body) < lines:
+            body.append(f'Software Engineer | {rng.choice(COMPANIES)} | {rng.randint(2008, 2020)}-Present')
+            body.append(f'Built services with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}.')
+        return body[:lines]
+    if section == 'education':
+        return [f'B.Sc. Computer Science | {rng.choice(UNIVERSITIES)} | {rng.randint(2005, 2020)}'
+                for _ in range(lines)]
+    if section == 'skills':
+        return [' | '.join(rng.sample(SKILLS, 6)) for _ in range(lines)]
+    return [f'{section.title()} item {i + 1}: {" ".join(rng.sample(SKILLS, 3))}' for i in range(lines)]
+
+
+def synthetic_document(seed: int) -> Dict[str, Any]:
+    """Pages and ground truth for one varied resume"""
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    email = rng.choice([f'{first}.{last}{seed}@example.com', f'{first[0]}{last}{seed}@mail.example.org',
+                        f'{last}_{first}{seed}@corp.example.net']).lower()
+    phone = _phone(rng)
+    # Most resumes are short, a few are long CVs
+    pages = rng.choices([1, 2, 3, 5, 10, 20, 40], weights=[40, 30, 12, 8, 5, 3, 2])[0]
+
+    contact = [email, phone]
+    linkedin = github = ''
+    if rng.random() < 0.6:
+        linkedin = f'linkedin.com/in/{first.lower()}-{last.lower()}-{seed}'
+        contact.append(linkedin)
+    if rng.random() < 0.4:
+        github = f'github.com/{first.lower()}{seed}'
+        contact.append(github)
+    lines = [f'{first} {last}']
+    if rng.random() < 0.5:
+        lines.append(' | '.join(contact))
+    else:
+        lines.extend(contact)
+
+    sections = rng.sample(list(HEADER_SYNONYMS), rng.randint(4, len(HEADER_SYNONYMS)))
+    if 'experience' not in sections:
+        sections.append('experience')
+    rng.shuffle(sections)
+    budget = max(len(sections) * 2, pages * LINES_PER_PAGE - len(lines) - len(sections))
+    # Experience soaks up most of the length on long documents
+    sizes = {section: 2 + rng.randint(0, 3) for section in sections}
+    sizes['experience'] += max(0, budget - sum(sizes.values()))
+    for section in sections:
+        lines.append(_header(rng, section))
+        lines.extend(_section_body(rng, section, sizes[section]))
+
+    return {
+        'pages': [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)],
+        'truth': {
+            'name': f'{first} {last}',
+            'email': email,
+            'phone': phone,
+            'linkedin': linkedin,
+            'github': github,
+            'sections': sections,
+            'text': '\n'.join(lines),
+        },
+    }
+
+
+def generate_corpus(out_dir: str, count: int = 200, seed: int = 0) -> List[Dict[str, Any]]:
+    """Write count PDFs to out_dir plus manifest.json, returning the manifest entries"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+    for i in range(count):
+        document = synthetic_document(seed * 1_000_003 + i)
+        path = os.path.join(out_dir, f'resume_{i:05d}.pdf')
+        write_pdf(path, document['pages'])
+        manifest.append({'path': path, 'pages': len(document['pages']), **document['truth']})
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump({'count': count, 'seed': seed, 'documents': manifest}, file)
+    return manifest
+
+
+def load_corpus(out_dir: str, count: int = 200, seed: int = 0) -> List[Dict[str, Any]]:
+    """Reuse the corpus in out_dir if it matches count and seed, otherwise generate it"""
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest['count'] == count and manifest['seed'] == seed:
+            return manifest['documents']
+    return generate_corpus(out_dir, count, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('out_dir')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    manifest = generate_corpus(args.out_dir, args.count, args.seed)
+    print(f"Wrote {len(manifest)} PDFs ({sum(doc['pages'] for doc in manifest)} pages) to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Load test for resume_service.py: p50/p99 latency and throughput
+
+Starts the service locally (unless --url points at a running one), fires
+--requests POSTs from --concurrency keep-alive connections using synthetic
+PDFs, and reports latency percentiles and throughput of the successful
+(200) responses. Rejected (503, queue full) and timed-out (504) requests
+return without parsing, so they are counted separately rather than
+pulling the percentiles down.
+
+Usage: python benchmarks/load_test.py [--requests 500] [--concurrency 16] [--workers N]
+"""
+import argparse
+import asyncio
+import collections
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+
+
+async def post(reader, writer, host, path, body):
+    writer.write(f'POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n'.encode()
+                 + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, path, bodies, counter, total, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            index = next(counter)
+            if index >= total:
+                break
+            start = time.perf_counter()
+            status = await post(reader, writer, host, path, bodies[index % len(bodies)])
+            latencies[status].append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, path, bodies, total, concurrency):
+    counter = iter(range(total + concurrency))
+    latencies = collections.defaultdict(list)  # status code -> seconds per request
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, path, bodies, counter, total, latencies)
+                           for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(host, port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Service did not start on {host}:{port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='running service, e.g. http://127.0.0.1:8080/parse')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=None, help='workers for the spawned service')
+    parser.add_argument('--queue', type=int, default=32, help='queue size for the spawned service')
+    parser.add_argument('--documents', type=int, default=50, help='distinct synthetic PDFs to send')
+    parser.add_argument('--fields', help="e.g. 'contact' to request a contact-only parse")
+    args = parser.parse_args()
+
+    service = None
+    with tempfile.TemporaryDirectory() as tmp:
+        bodies = []
+        for document in generate_corpus(tmp, args.documents):
+            with open(document['path'], 'rb') as file:
+                bodies.append(file.read())
+
+        if args.url:
+            url = urlsplit(args.url)
+            host, port, path = url.hostname, url.port or 80, url.path or '/parse'
+        else:
+            host, port, path = '127.0.0.1', free_port(), '/parse'
+            command = [sys.executable, 'resume_service.py', '--host', host, '--port', str(port),
+                       '--queue', str(args.queue)]
+            if args.workers:
+                command += ['--workers', str(args.workers)]
+            service = subprocess.Popen(command, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL)
+        if args.fields:
+            path += f'?fields={args.fields}'
+
+        try:
+            wait_for_port(host, port)
+            elapsed, latencies = asyncio.run(
+                run_load(host, port, path, bodies, args.requests, args.concurrency))
+        finally:
+            if service is not None:
+                service.terminate()
+                service.wait()
+
+    ordered = sorted(latencies.get(200, ()))
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f}s "
+          f"({len(ordered) / elapsed:.1f} parsed/s)")
+    if ordered:
+        print(f"  200 x{len(ordered)}: p50 {percentile(ordered, 0.50) * 1000:.1f} ms   "
+              f"p90 {percentile(ordered, 0.90) * 1000:.1f} ms   p99 {percentile(ordered, 0.99) * 1000:.1f} ms   "
+              f"max {ordered[-1] * 1000:.1f} ms")
+    else:
+        print("  no request succeeded")
+    print(f"  rejected (503) x{len(latencies.get(503, ()))}   timed out (504) x{len(latencies.get(504, ()))}")
+    others = {code: len(times) for code, times in latencies.items() if code not in (200, 503, 504)}
+    if others:
+        print("  other status codes: " + ', '.join(f"{code} x{count}" for code, count in sorted(others.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Minimal text-only PDF writer used to build benchmark inputs without extra dependencies"""
+import random
+from typing import List
+
+FIRST_NAMES = ['Jane', 'John', 'Priya', 'Carlos', 'Mei', 'Ahmed', 'Olga', 'Kwame', 'Sara', 'Liam']
+LAST_NAMES = ['Smith', 'Patel', 'Garcia', 'Chen', 'Khan', 'Ivanova', 'Mensah', 'Rossi', 'Murphy', 'Kim']
+SKILLS = ['Python', 'JavaScript', 'React', 'Node.js', 'Django', 'PostgreSQL', 'MongoDB', 'AWS',
+          'Docker', 'Kubernetes', 'Git', 'Agile', 'Scrum', 'Go', 'Rust', 'Terraform', 'Kafka']
+COMPANIES = ['TechCorp Inc.', 'StartupXYZ', 'DataWorks', 'CloudNine Ltd', 'Acme Systems']
+
+
+def _escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path: str, pages: List[List[str]]):
+    """Write a PDF with one Helvetica text block per page"""
+    objects = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    page_objects = []
+    for lines in pages:
+        stream = 'BT /F1 10 Tf 14 TL 50 780 Td\n'
+        stream += ''.join(f'({_escape(line)}) Tj T*\n' for line in lines)
+        stream += 'ET'
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        page_objects.append((content_id, f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream'))
+        page_objects.append((page_id, f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                                      f'/Contents {content_id} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>'))
+
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids)
+    objects.append((1, '<< /Type /Catalog /Pages 2 0 R >>'))
+    objects.append((2, f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'))
+    objects.append((font_id, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'))
+    objects.extend(page_objects)
+    objects.sort()
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for obj_id, body in objects:
+        offsets[obj_id] = len(out)
+        out += f'{obj_id} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref_pos = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    for obj_id, _ in objects:
+        out += f'{offsets[obj_id]:010d} 00000 n \n'.encode('latin-1')
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n'.encode('latin-1')
+
+    with open(path, 'wb') as file:
+        file.write(out)
+
+
+def synthetic_resume(seed: int, pages: int = 1, lines_per_page: int = 50) -> List[List[str]]:
+    """Build the page lines of a plausible resume"""
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f'{first} {last}',
+        f'{first.lower()}.{last.lower()}{seed}@example.com | +1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}',
+        f'linkedin.com/in/{first.lower()}{last.lower()} | github.com/{first.lower()}{seed}',
+        '',
+        'Summary',
+        f'Software engineer with {rng.randint(2, 15)}+ years of experience building web applications.',
+        '',
+        'Experience',
+    ]
+    body = []
+    while len(lines) + len(body) < pages * lines_per_page - 12:
+        company = rng.choice(COMPANIES)
+        body.append(f'Software Engineer | {company} | {rng.randint(2010, 2020)}-Present')
+        body.append(f'Built services with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}.')
+    lines.extend(body)
+    lines.extend([
+        '',
+        'Education',
+        'Bachelor of Science in Computer Science | State University | 2014',
+        '',
+        'Skills',
+        ' | '.join(rng.sample(SKILLS, 8)),
+        '',
+        'Languages',
+        'English | Spanish',
+    ])
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
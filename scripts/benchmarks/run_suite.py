@@ -0,0 +1,165 @@
+"""Per-stage timings of both parsers over the synthetic corpus
+
+Each stage is timed on its own for every document (best of --repeat) and
+the results are written as JSON. Pass --compare with an earlier results
+file to see how each stage moved.
+
+Usage:
+    python benchmarks/run_suite.py [--corpus DIR] [--count 200] [--output results.json]
+    python benchmarks/run_suite.py --compare before.json [--output after.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from advanced_resume_parser import AdvancedResumePDFToCSV
+from corpus import load_corpus
+from resume_pdf_to_csv import ResumePDFToCSV
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def advanced_stages(parser, pdf_path):
+    """(stage, callable) pairs in pipeline order for AdvancedResumePDFToCSV"""
+    text = parser.extract_text_from_pdf(pdf_path)
+    positions = parser.find_section_boundaries(text)
+
+    def all_sections():
+        for section_key in parser.section_headers:
+            parser.extract_section_content(text, section_key, positions)
+
+    return [
+        ('extract_text_from_pdf', lambda: parser.extract_text_from_pdf(pdf_path)),
+        ('extract_contact_info', lambda: parser.extract_contact_info(text)),
+        ('extract_name', lambda: parser.extract_name(text)),
+        ('find_section_boundaries', lambda: parser.find_section_boundaries(text)),
+        ('extract_section_content', all_sections),
+    ]
+
+
+def basic_stages(parser, pdf_path):
+    """(stage, callable) pairs for ResumePDFToCSV, whose sections only run inside parse_resume"""
+    text = parser.extract_text_from_pdf(pdf_path)
+    return [
+        ('extract_text_from_pdf', lambda: parser.extract_text_from_pdf(pdf_path)),
+        ('extract_email', lambda: parser.extract_email(text)),
+        ('extract_phone', lambda: parser.extract_phone(text)),
+        ('extract_name', lambda: parser.extract_name(text)),
+        ('parse_resume', lambda: parser.parse_resume(pdf_path)),
+    ]
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        'calls': len(timings),
+        'total_s': sum(timings),
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def run(documents, repeat):
+    suites = {
+        'AdvancedResumePDFToCSV': (AdvancedResumePDFToCSV(), advanced_stages),
+        'ResumePDFToCSV': (ResumePDFToCSV(), basic_stages),
+    }
+    results = {}
+    for suite_name, (parser, stages_for) in suites.items():
+        timings = {}
+        for document in documents:
+            for stage, func in stages_for(parser, document['path']):
+                timings.setdefault(stage, []).append(best_time(func, repeat))
+        results[suite_name] = {stage: summarize(values) for stage, values in timings.items()}
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def print_summary(report):
+    print(f"{'parser':<24} {'stage':<25} {'mean ms':>10} {'p95 ms':>10} {'total s':>9}")
+    for suite_name, stages in report['results'].items():
+        for stage, summary in stages.items():
+            print(f"{suite_name:<24} {stage:<25} {summary['mean_ms']:>10.3f} {summary['p95_ms']:>10.3f} "
+                  f"{summary['total_s']:>9.2f}")
+
+
+def compare(before, after):
+    print(f"{'parser':<24} {'stage':<25} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for suite_name, stages in after['results'].items():
+        for stage, summary in stages.items():
+            old = before['results'].get(suite_name, {}).get(stage)
+            if old is None:
+                print(f"{suite_name:<24} {stage:<25} {'-':>10} {summary['mean_ms']:>10.3f} {'new':>8}")
+                continue
+            change = (summary['mean_ms'] / old['mean_ms'] - 1) * 100 if old['mean_ms'] else 0.0
+            print(f"{suite_name:<24} {stage:<25} {old['mean_ms']:>10.3f} {summary['mean_ms']:>10.3f} "
+                  f"{change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='corpus directory, generated if missing (default: a temp dir)')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = load_corpus(args.corpus or tmp, args.count, args.seed)
+        started = time.perf_counter()
+        results = run(documents, args.repeat)
+        elapsed = time.perf_counter() - started
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'corpus': {'count': args.count, 'seed': args.seed,
+                       'pages': sum(document['pages'] for document in documents)},
+            'repeat': args.repeat,
+            'wall_s': elapsed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            compare(json.load(file), report)
+    else:
+        print_summary(report)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
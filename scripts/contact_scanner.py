@@ -0,0 +1,114 @@
+import re
+from typing import Dict, Iterable, Optional
+
+CONTACT_KEYS = ('email', 'phone', 'linkedin', 'github', 'website')
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Tried in order: the first pattern with a match anywhere in the text wins.
+# Each is paired with the most characters a match attempt can read, so a
+# match near the end of the header region can be told apart from one that
+# was cut short by it.
+PHONE_PATTERNS = (
+    (re.compile(r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})'), 17),
+    (re.compile(r'\+?([0-9]{1,3})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})'), 19),
+    (re.compile(r'(\d{10})'), 10),
+    (re.compile(r'\+\d{1,3}\s?\d{3,4}\s?\d{3,4}\s?\d{3,4}'), 19),
+)
+
+LINKEDIN_PATTERN = re.compile(r'(?:linkedin\.com/in/|linkedin\.com/pub/)([A-Za-z0-9\-\.]+)', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'(?:github\.com/)([A-Za-z0-9\-\.]+)', re.IGNORECASE)
+WEBSITE_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?([A-Za-z0-9\-\.]+\.[A-Za-z]{2,})')
+WEBSITE_EXCLUDED = ('gmail', 'yahoo', 'outlook', 'linkedin', 'github')
+
+# Contact details almost always sit in the first few lines
+HEADER_CHARS = 1500
+
+
+class ContactScanner:
+    """First email, phone, LinkedIn, GitHub and website in a text, header first
+
+    Gives exactly what running each pattern's findall over the whole text
+    and keeping the first result gives, without building the match lists.
+    Every pattern is searched in the header region first (cut at a line
+    break), and the rest of the text is only searched for fields the
+    header did not settle.
+
+    The email, LinkedIn, GitHub and website patterns never cross a line
+    break, so a header match is final. The phone patterns can, but each
+    match attempt reads a bounded number of characters, so only matches
+    starting that close to the cut are checked again against the full text.
+    """
+
+    def __init__(self, header_chars: int = HEADER_CHARS):
+        self.header_chars = header_chars
+
+    def _header_end(self, text: str) -> int:
+        cut = text.find('\n', self.header_chars)
+        return len(text) if cut == -1 else cut
+
+    def scan(self, text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Contact fields of text; fields limits the work to the ones asked for"""
+        if fields is None:
+            wanted = CONTACT_KEYS
+        else:
+            fields = set(fields)
+            wanted = [key for key in CONTACT_KEYS if key in fields]
+        end = self._header_end(text)
+        contact_info = {}
+        for key in wanted:
+            contact_info[key] = getattr(self, '_' + key)(text, end)
+        return contact_info
+
+    @staticmethod
+    def _first(pattern, text: str, end: int):
+        """First match of a pattern that cannot cross a line break; text[end] is one"""
+        return pattern.search(text, 0, end) or pattern.search(text, end)
+
+    def _email(self, text: str, end: int) -> str:
+        match = self._first(EMAIL_PATTERN, text, end)
+        return match.group() if match else ""
+
+    def _phone(self, text: str, end: int) -> str:
+        for pattern, reach in PHONE_PATTERNS:
+            match = pattern.search(text, 0, end)
+            safe = end - reach
+            if end < len(text) and (match is None or match.start() >= safe):
+                # Not settled inside the header; attempts starting before `safe` failed for good
+                match = pattern.search(text, max(0, safe))
+            if match:
+                # Same value findall would give: the group, the joined groups, or the whole match
+                groups = match.groups('')
+                if not groups:
+                    return match.group()
+                return ''.join(groups) if len(groups) > 1 else groups[0]
+        return ""
+
+    @staticmethod
+    def phone_final(text: str) -> bool:
+        """Whether more text after text could no longer change its phone number
+
+        Only a match of the first pattern is final, and only once the text
+        runs on past everything its match attempt reads: a later pattern's
+        match gives way to a first-pattern match anywhere further on.
+        """
+        pattern, reach = PHONE_PATTERNS[0]
+        match = pattern.search(text)
+        return match is not None and match.start() < len(text) - reach
+
+    def _linkedin(self, text: str, end: int) -> str:
+        match = self._first(LINKEDIN_PATTERN, text, end)
+        return f"linkedin.com/in/{match.group(1)}" if match else ""
+
+    def _github(self, text: str, end: int) -> str:
+        match = self._first(GITHUB_PATTERN, text, end)
+        return f"github.com/{match.group(1)}" if match else ""
+
+    def _website(self, text: str, end: int) -> str:
+        for bounds in ((0, end), (end, len(text))):
+            for match in WEBSITE_PATTERN.finditer(text, *bounds):
+                website = match.group(1)
+                lowered = website.lower()
+                if not any(domain in lowered for domain in WEBSITE_EXCLUDED):
+                    return website
+        return ""
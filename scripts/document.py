@@ -0,0 +1,105 @@
+import re
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Separators between the parts of a contact line, e.g. "City, ST | email | phone"
+LINE_PARTS = re.compile(r'[^|•·\t]+')
+
+def _is_word_char(char: str) -> bool:
+    # What \w means to re for str patterns
+    return char.isalnum() or char == '_'
+
+
+class ResumeDocument:
+    """One resume's text and the views of it every extractor shares
+
+    Built once per parse. The lowercase text is computed on first use and
+    then serves every case-insensitive search. Line start offsets are
+    indexed from the top only as far as some extractor reads, so taking
+    the first few lines never splits the whole document, and the lines of
+    a section are found by searching for line breaks from its start.
+    Lines are the pieces of text.split('\\n'), handed out as (start, end)
+    spans or as slices of just the lines that are needed.
+    """
+
+    __slots__ = ('text', '_lower', '_line_starts', '_indexed_to')
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lower = None
+        # Start offset of every line found so far; the first line starts at 0
+        self._line_starts: List[int] = [0]
+        # Everything before this offset has been scanned for line breaks
+        self._indexed_to = 0
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    def _index_lines(self, count: int):
+        """Extend the line start index until it holds count lines or the text ends"""
+        text, starts = self.text, self._line_starts
+        while len(starts) < count + 1 and self._indexed_to <= len(text):
+            newline = text.find('\n', self._indexed_to)
+            if newline == -1:
+                self._indexed_to = len(text) + 1
+                break
+            starts.append(newline + 1)
+            self._indexed_to = newline + 1
+
+    def lines(self, count: int) -> List[str]:
+        """The first count lines, the same as text.split('\\n')[:count]"""
+        self._index_lines(count)
+        starts = self._line_starts
+        # Each line ends just before the next one starts; the last one at the end of the text
+        ends = [start - 1 for start in starts[1:count + 1]]
+        if len(ends) < count:
+            ends.append(len(self.text))
+        return [self.text[start:end] for start, end in zip(starts, ends)]
+
+    def line_spans(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """(start, end) of each piece of text[start:end].split('\\n'), found as they are consumed"""
+        end = len(self.text) if end is None else min(end, len(self.text))
+        find = self.text.find
+        while True:
+            newline = find('\n', start, end)
+            if newline == -1:
+                yield start, end
+                return
+            yield start, newline
+            start = newline + 1
+
+    def find_word(self, keyword: str, start: int = 0) -> int:
+        """Offset of the first whole-word, case-insensitive keyword at or after start, else -1
+
+        Gives what re.search(rf'\\b{re.escape(keyword)}\\b', lower[start:]) would,
+        offset by start, using str.find instead of a regex scan and without
+        slicing: the text before start counts as the start of the string.
+        """
+        if not keyword:
+            match = re.search(r'\b\b', self.lower[start:])
+            return start + match.start() if match else -1
+        lower = self.lower
+        first_is_word, last_is_word = _is_word_char(keyword[0]), _is_word_char(keyword[-1])
+        position = lower.find(keyword, start)
+        while position != -1:
+            before = position > start and _is_word_char(lower[position - 1])
+            after_end = position + len(keyword)
+            after = after_end < len(lower) and _is_word_char(lower[after_end])
+            if before != first_is_word and after != last_is_word:
+                return position
+            position = lower.find(keyword, position + 1)
+        return -1
+
+    def join_lines(self, start: int, end: int, separator: str) -> str:
+        """Non-empty, stripped lines of text[start:end] joined by separator"""
+        return separator.join(filter(None, (line.strip() for line in self.text[start:end].split('\n'))))
+
+
+TextOrDocument = Union[str, ResumeDocument]
+
+
+def as_document(text: TextOrDocument) -> ResumeDocument:
+    """Extractors take either; plain text gets a document of its own"""
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
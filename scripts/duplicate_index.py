@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    parser_version TEXT NOT NULL,
+    record TEXT NOT NULL,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS buckets_doc ON buckets (doc_id);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# MinHash permutations are multiply-shift hashes, (a * x + b) >> 32 in wrapping
+# 64-bit arithmetic, over 32-bit shingle hashes: no modulo, so cheap in numpy
+_MAX_HASH = (1 << 32) - 1
+# Odd multiplier combining consecutive word hashes into a shingle hash
+_SHINGLE_MIX = 0x9E3779B97F4A7C15
+# Fixed so signatures stay comparable across processes and runs
+_SEED = 1
+# Shingles hashed per numpy block, bounding the temporary matrix on long documents
+_BLOCK = 4096
+
+_WORD = re.compile(r'\w+')
+
+
+class DuplicateMatch(NamedTuple):
+    """An earlier document whose text is a near-duplicate of the one being parsed"""
+    doc_id: str
+    similarity: float
+    parser_version: str
+    record: Dict[str, Any]
+
+
+class DuplicateIndex:
+    """Persistent MinHash/LSH index of parsed resumes, for spotting near-duplicates
+
+    Each document's text becomes a set of word shingles, summarised by a
+    MinHash signature of num_perm values. The signature is cut into bands;
+    documents sharing any band's bucket are candidates, and a candidate
+    counts as a duplicate when the signatures agree on at least threshold
+    of their values (the estimated Jaccard similarity of the shingles). A
+    lookup costs one indexed query per band however large the index grows.
+
+    With 128 permutations in 16 bands, pairs above ~0.7 similarity almost
+    always share a bucket. The parsed record of every original is stored
+    with its signature so a duplicate can reuse its sections. Like
+    ExtractionCache, it lives in SQLite (WAL) and every process and thread
+    opens its own connection, so batch workers can share it.
+
+    It flags duplicates; it does not make a run faster. The signature
+    needs the text, so a duplicate is still extracted in full, and
+    hashing plus lookups add to the batch time. A document is indexed
+    when its parse finishes, so two copies parsed at the same time on
+    different workers can both come out as originals; a later run still
+    matches either of them.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_words: int = 3, reuse_sections: bool = True):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_words = shingle_words
+        # False only flags duplicates and still parses them in full
+        self.reuse_sections = reuse_sections
+        self._permutations = None
+        self._local = threading.local()
+        self._check_meta()
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork or be shared between threads,
+        # so each thread of each process opens its own
+        local = self._local
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _check_meta(self):
+        """Signatures are only comparable with the same settings, so pin them in the file"""
+        conn = self._connection()
+        settings = json.dumps({'num_perm': self.num_perm, 'bands': self.bands,
+                               'shingle_words': self.shingle_words, 'seed': _SEED}, sort_keys=True)
+        conn.execute('INSERT OR IGNORE INTO meta (name, value) VALUES (?, ?)', ('settings', settings))
+        stored = conn.execute("SELECT value FROM meta WHERE name = 'settings'").fetchone()[0]
+        if stored != settings:
+            raise ValueError(f"{self.path} was built with different settings: {stored}")
+
+    def _count(self, name: str):
+        self._connection().execute(
+            'INSERT INTO counters (name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + 1', (name,))
+
+    def shingle_hashes(self, text: str):
+        """Distinct 64-bit hashes of every run of shingle_words consecutive words"""
+        import numpy as np
+
+        words = _WORD.findall(text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        # Hash each word once, then mix neighbours arithmetically instead of joining strings
+        hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words),
+                             dtype=np.uint64, count=len(words))
+        size = min(self.shingle_words, len(words))
+        shingles = hashes[:len(hashes) - size + 1].copy()
+        for offset in range(1, size):
+            shingles = shingles * np.uint64(_SHINGLE_MIX) + hashes[offset:len(hashes) - size + 1 + offset]
+        return np.unique(shingles)
+
+    def signature(self, text: str):
+        """MinHash signature of text as a uint32 numpy array, or None for text without words"""
+        import numpy as np
+
+        hashes = self.shingle_hashes(text)
+        if not len(hashes):
+            return None
+        if self._permutations is None:
+            generator = np.random.RandomState(_SEED)
+            self._permutations = (
+                generator.randint(0, 1 << 63, size=self.num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1),
+                generator.randint(0, 1 << 63, size=self.num_perm, dtype=np.uint64),
+            )
+        a, b = self._permutations
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        for start in range(0, len(hashes), _BLOCK):
+            block = hashes[start:start + _BLOCK, np.newaxis]
+            permuted = (block * a + b) >> np.uint64(32)
+            np.minimum(signature, permuted.min(axis=0), out=signature)
+        return signature.astype(np.uint32)
+
+    def _buckets(self, signature) -> List[int]:
+        rows = self.num_perm // self.bands
+        raw = signature.tobytes()
+        width = rows * signature.itemsize
+        return [int.from_bytes(hashlib.blake2b(raw[band * width:(band + 1) * width], digest_size=8).digest(),
+                               'big', signed=True)
+                for band in range(self.bands)]
+
+    def find(self, signature, exclude: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """The most similar earlier document at or above threshold, other than exclude"""
+        import numpy as np
+
+        conn = self._connection()
+        candidates = set()
+        for band, bucket in enumerate(self._buckets(signature)):
+            candidates.update(row[0] for row in conn.execute(
+                'SELECT doc_id FROM buckets WHERE band = ? AND bucket = ?', (band, bucket)))
+        candidates.discard(exclude)
+
+        best = None
+        for doc_id in candidates:
+            row = conn.execute('SELECT signature, parser_version, record FROM documents WHERE doc_id = ?',
+                               (doc_id,)).fetchone()
+            if row is None:
+                continue
+            similarity = float(np.mean(np.frombuffer(row[0], dtype=np.uint32) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (doc_id, similarity, row[1], row[2])
+        self._count('lookups')
+        if best is None:
+            return None
+        self._count('duplicates')
+        return DuplicateMatch(best[0], best[1], best[2], json.loads(best[3]))
+
+    def add(self, doc_id: str, signature, parser_version: str, record: Dict[str, Any]):
+        """Index a document as an original, replacing any earlier entry with the same id"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM buckets WHERE doc_id = ?', (doc_id,))
+            conn.execute('INSERT OR REPLACE INTO documents (doc_id, signature, parser_version, record, added) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         (doc_id, signature.tobytes(), parser_version, json.dumps(record), time.time()))
+            conn.executemany('INSERT INTO buckets (band, bucket, doc_id) VALUES (?, ?, ?)',
+                             [(band, bucket, doc_id) for band, bucket in enumerate(self._buckets(signature))])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        """Indexed documents, lookups and duplicates found so far"""
+        conn = self._connection()
+        counts = {'lookups': 0, 'duplicates': 0}
+        counts.update(conn.execute('SELECT name, value FROM counters'))
+        counts['documents'] = conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+        return counts
+
+    def close(self):
+        """Close the calling thread's connection"""
+        local = self._local
+        if getattr(local, 'conn', None) is not None and local.pid == os.getpid():
+            local.conn.close()
+        local.conn = None
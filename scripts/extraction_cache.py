@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    digest TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, extractor)
+);
+CREATE TABLE IF NOT EXISTS records (
+    digest TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    record TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, parser_version)
+);
+CREATE INDEX IF NOT EXISTS texts_last_used ON texts (last_used);
+CREATE INDEX IF NOT EXISTS records_last_used ON records (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def content_digest(pdf_bytes: bytes) -> str:
+    """Content address of a PDF"""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class ExtractionCache:
+    """Persistent SQLite cache of extracted text and parsed records
+
+    Text is keyed by the PDF's content digest plus the extractor version, and
+    parsed records by the digest plus the parser's configuration version, so
+    changing section rules re-parses from cached text instead of re-reading
+    the PDF. When the stored size passes max_bytes the least recently used
+    entries are evicted. Hit and miss counts are kept in the database, so
+    they add up across batch workers and runs.
+    """
+
+    # How many writes between checks of the total size
+    EVICT_CHECK_EVERY = 50
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        # Create the schema up front so a bad path fails here, not in a worker
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork or be shared between threads,
+        # so each thread of each process opens its own
+        local = self._local
+        if getattr(local, 'conn', None) is None or local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        del state['_writes_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._writes_lock = threading.Lock()
+
+    def _count(self, name: str):
+        self._connection().execute(
+            'INSERT INTO counters (name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + 1', (name,))
+
+    def _get(self, table: str, key_column: str, value_column: str, digest: str, key: str) -> Optional[str]:
+        conn = self._connection()
+        row = conn.execute(f'SELECT {value_column} FROM {table} WHERE digest = ? AND {key_column} = ?',
+                           (digest, key)).fetchone()
+        if row is None:
+            self._count(f'{table}_misses')
+            return None
+        conn.execute(f'UPDATE {table} SET last_used = ? WHERE digest = ? AND {key_column} = ?',
+                     (time.time(), digest, key))
+        self._count(f'{table}_hits')
+        return row[0]
+
+    def _put(self, table: str, key_column: str, value_column: str, digest: str, key: str, value: str):
+        self._connection().execute(
+            f'INSERT OR REPLACE INTO {table} (digest, {key_column}, {value_column}, size, last_used) '
+            'VALUES (?, ?, ?, ?, ?)', (digest, key, value, len(value.encode('utf-8')), time.time()))
+        with self._writes_lock:
+            self._writes += 1
+            check = self._writes % self.EVICT_CHECK_EVERY == 0
+        if check:
+            self.evict()
+
+    def get_text(self, digest: str, extractor: str) -> Optional[str]:
+        return self._get('texts', 'extractor', 'text', digest, extractor)
+
+    def put_text(self, digest: str, extractor: str, text: str):
+        self._put('texts', 'extractor', 'text', digest, extractor, text)
+
+    def get_record(self, digest: str, parser_version: str) -> Optional[Dict[str, Any]]:
+        record = self._get('records', 'parser_version', 'record', digest, parser_version)
+        return json.loads(record) if record is not None else None
+
+    def put_record(self, digest: str, parser_version: str, record: Dict[str, Any]):
+        self._put('records', 'parser_version', 'record', digest, parser_version, json.dumps(record))
+
+    def size(self) -> int:
+        """Total bytes of cached text and records"""
+        conn = self._connection()
+        return sum(conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {table}').fetchone()[0]
+                   for table in ('texts', 'records'))
+
+    def evict(self):
+        """Drop least recently used entries until the cache is back under max_bytes"""
+        conn = self._connection()
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        rows = conn.execute(
+            'SELECT table_name, rowid, size FROM ('
+            "  SELECT 'texts' AS table_name, rowid, size, last_used FROM texts"
+            "  UNION ALL SELECT 'records', rowid, size, last_used FROM records"
+            ') ORDER BY last_used')
+        doomed = []
+        for table, rowid, size in rows:
+            if excess <= 0:
+                break
+            doomed.append((table, rowid))
+            excess -= size
+        rows.close()
+        conn.execute('BEGIN')
+        for table, rowid in doomed:
+            conn.execute(f'DELETE FROM {table} WHERE rowid = ?', (rowid,))
+        conn.execute('COMMIT')
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counts for text and records, plus the stored size"""
+        counts = {name: 0 for name in ('texts_hits', 'texts_misses', 'records_hits', 'records_misses')}
+        counts.update(self._connection().execute('SELECT name, value FROM counters'))
+        counts['size_bytes'] = self.size()
+        return counts
+
+    def close(self):
+        """Close the calling thread's connection"""
+        local = self._local
+        if getattr(local, 'conn', None) is not None and local.pid == os.getpid():
+            local.conn.close()
+        local.conn = None
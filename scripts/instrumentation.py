@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class _NullStage:
+    """Reusable do-nothing context manager so disabled timing allocates nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullTrace:
+    """Stand-in trace used when instrumentation is off"""
+
+    def stage(self, name: str) -> _NullStage:
+        return _NULL_STAGE
+
+    def add_stage(self, name: str, seconds: float):
+        pass
+
+    def count_page(self):
+        pass
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TRACE = NullTrace()
+
+
+class _Stage:
+    def __init__(self, trace: 'DocumentTrace', name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace.add_stage(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class DocumentTrace:
+    """Timings and counts for one document, handed to the Instrumentation when finished"""
+
+    def __init__(self, instrumentation: 'Instrumentation', source: str, parser: str):
+        self.instrumentation = instrumentation
+        self.started = time.perf_counter()
+        self.metrics: Dict[str, Any] = {
+            'source': source,
+            'parser': parser,
+            'pages': 0,
+            'chars': 0,
+            'stages': {},
+            'total_s': 0.0,
+        }
+
+    def stage(self, name: str) -> _Stage:
+        """Time a block as the named stage (repeated stages add up)"""
+        return _Stage(self, name)
+
+    def add_stage(self, name: str, seconds: float):
+        """Charge time measured elsewhere, e.g. a share of a batched stage"""
+        stages = self.metrics['stages']
+        stages[name] = stages.get(name, 0.0) + seconds
+
+    def count_page(self):
+        self.metrics['pages'] += 1
+
+    def set(self, key: str, value: Any):
+        self.metrics[key] = value
+
+    def finish(self):
+        self.metrics['total_s'] = time.perf_counter() - self.started
+        self.instrumentation.emit(self.metrics)
+
+
+class Instrumentation:
+    """Per-document stage timings, page and character counts
+
+    Every finished document is passed to callback (if any) and appended as
+    one JSON line to log_path (if any). Parsers take an Instrumentation as
+    their instrumentation argument; with none set they use NULL_TRACE and
+    skip all timing. In batch mode each worker gets a copy, so callback
+    must be picklable when the pool does not fork.
+    """
+
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 log_path: Optional[str] = None):
+        self.callback = callback
+        self.log_path = log_path
+        self._log = None
+        self._pid = None
+        # Threads sharing one parser share this too
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_log'] = None
+        state['_pid'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def start(self, source: Any, parser: str) -> DocumentTrace:
+        """Begin tracing one document; call finish() on the result when it is done"""
+        return DocumentTrace(self, source if isinstance(source, str) else type(source).__name__, parser)
+
+    def emit(self, metrics: Dict[str, Any]):
+        if self.callback is not None:
+            self.callback(metrics)
+        if self.log_path is not None:
+            line = json.dumps(metrics) + '\n'
+            # One handle per process, and one write per line so workers don't interleave
+            with self._lock:
+                if self._log is None or self._pid != os.getpid():
+                    self._log = open(self.log_path, 'a', encoding='utf-8', buffering=1)
+                    self._pid = os.getpid()
+                self._log.write(line)
+
+    def close(self):
+        if self._log is not None and self._pid == os.getpid():
+            self._log.close()
+        self._log = None
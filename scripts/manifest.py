@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileManifest:
+    """Path, size, mtime and hash of every PDF already converted into an output
+
+    changed() returns only new or modified files. A file whose size and
+    mtime are unchanged is trusted without hashing; if only the mtime
+    moved (a copy or touch), the hash decides.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, object]] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.entries = json.load(file)['files']
+        # Stat and hash results from changed(), reused by mark_done()
+        self._seen: Dict[str, Dict[str, object]] = {}
+
+    def changed(self, pdf_paths: List[str]) -> List[str]:
+        """The subset of pdf_paths that is new or differs from the manifest"""
+        pending = []
+        for pdf_path in pdf_paths:
+            key = os.path.abspath(pdf_path)
+            stat = os.stat(pdf_path)
+            current = {'size': stat.st_size, 'mtime': stat.st_mtime}
+            known = self.entries.get(key)
+            if known and known['size'] == current['size'] and known['mtime'] == current['mtime']:
+                continue
+            current['sha256'] = file_digest(pdf_path)
+            self._seen[key] = current
+            if known and known['sha256'] == current['sha256']:
+                # Same bytes, just touched: remember the new mtime, nothing to parse
+                self.entries[key] = current
+                continue
+            pending.append(pdf_path)
+        return pending
+
+    def known(self, pdf_path: str) -> bool:
+        """Whether an earlier run converted this path, so the output has a row for it"""
+        return os.path.abspath(pdf_path) in self.entries
+
+    def mark_done(self, pdf_paths: List[str]):
+        for pdf_path in pdf_paths:
+            key = os.path.abspath(pdf_path)
+            self.entries[key] = self._seen.pop(key, None) or {
+                'size': os.path.getsize(pdf_path),
+                'mtime': os.path.getmtime(pdf_path),
+                'sha256': file_digest(pdf_path),
+            }
+
+    def save(self):
+        # Write then rename so a crash never leaves a half-written manifest
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': 1, 'files': self.entries}, file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
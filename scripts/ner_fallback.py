@@ -0,0 +1,125 @@
+import os
+import threading
+from typing import Any, Dict, Sequence, Tuple
+
+from document import LINE_PARTS, ResumeDocument
+
+DEFAULT_MODEL = 'en_core_web_sm'
+
+# Fields the fallback can fill, and the entity labels each one is taken from
+NER_FIELDS = ('name', 'address')
+NAME_LABELS = ('PERSON',)
+ADDRESS_LABELS = ('FAC', 'GPE', 'LOC')
+
+# Only the header is sent to the model: the name and address sit at the top
+HEADER_LINES = 10
+HEADER_CHARS = 1000
+
+# Pipeline components entity recognition needs; the rest are switched off
+_NER_PIPES = ('tok2vec', 'transformer', 'ner', 'entity_ruler')
+
+
+class NERFallback:
+    """spaCy entities for the name and address where the heuristics found none
+
+    The parser hands over the header of each document it could not
+    complete, and documents parsed together share one nlp.pipe call. The
+    model is loaded on first use in each process and never pickled, so a
+    pool worker loads it once and keeps it for every document it parses.
+    model is an installed package name or a path to a saved pipeline.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, fields: Sequence[str] = NER_FIELDS,
+                 batch_size: int = 64, header_lines: int = HEADER_LINES):
+        import spacy
+
+        unknown = [field for field in fields if field not in NER_FIELDS]
+        if unknown:
+            raise ValueError(f"NER can only fill {', '.join(NER_FIELDS)}, not {', '.join(unknown)}")
+        # Fail here rather than in every worker
+        if not (spacy.util.is_package(model) or os.path.exists(model)):
+            raise ValueError(f"spaCy model {model!r} is not installed; try: python -m spacy download {model}")
+        self.model = model
+        self.fields = tuple(fields)
+        self.batch_size = batch_size
+        self.header_lines = header_lines
+        self._nlp = None
+        self._version = None
+        # Threads sharing a parser take turns on the model
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_nlp'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        """Identifies the model and settings, part of the parser's record cache key"""
+        # Reading package metadata parses files, so do it once
+        if self._version is None:
+            import spacy
+
+            package_version = spacy.util.get_package_version(self.model) if spacy.util.is_package(self.model) else None
+            self._version = f"{self.model}=={package_version or 'path'}:{','.join(self.fields)}:{self.header_lines}"
+        return self._version
+
+    def _pipeline(self):
+        if self._nlp is None:
+            import spacy
+
+            nlp = spacy.load(self.model)
+            nlp.select_pipes(disable=[name for name in nlp.pipe_names if name not in _NER_PIPES])
+            self._nlp = nlp
+        return self._nlp
+
+    def wanted(self, data: Dict[str, Any]) -> bool:
+        """Whether the heuristics left any of the fallback's fields empty"""
+        return any(not data.get(field) for field in self.fields)
+
+    def header(self, document: ResumeDocument) -> str:
+        """The part of a document the model reads"""
+        return '\n'.join(document.lines(self.header_lines))[:HEADER_CHARS]
+
+    def fill(self, pending: Sequence[Tuple[str, Dict[str, Any]]]):
+        """Fill the empty fields of each (header, data) pair in place, in one batch"""
+        if not pending:
+            return
+        with self._lock:
+            nlp = self._pipeline()
+            docs = list(nlp.pipe((header for header, _ in pending), batch_size=self.batch_size))
+        for doc, (header, data) in zip(docs, pending):
+            if 'name' in self.fields and not data.get('name'):
+                data['name'] = _entity_name(doc.ents)
+            if 'address' in self.fields and not data.get('address'):
+                data['address'] = _entity_address(doc.ents, header)
+
+
+def _entity_name(ents) -> str:
+    """The first person entity shaped like a full name"""
+    for ent in ents:
+        if ent.label_ not in NAME_LABELS:
+            continue
+        words = ent.text.split()
+        if 2 <= len(words) <= 4 and all(word.replace('.', '').replace('-', '').replace("'", '').isalpha()
+                                        for word in words):
+            return ' '.join(words)
+    return ""
+
+
+def _entity_address(ents, header: str) -> str:
+    """The part of the header line around the first place entity"""
+    for ent in ents:
+        if ent.label_ not in ADDRESS_LABELS:
+            continue
+        line_start = header.rfind('\n', 0, ent.start_char) + 1
+        line_end = header.find('\n', ent.end_char)
+        line = header[line_start:line_end if line_end != -1 else len(header)]
+        for part in LINE_PARTS.finditer(line):
+            if part.start() <= ent.start_char - line_start < part.end():
+                return part.group().strip()
+    return ""
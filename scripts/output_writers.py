@@ -0,0 +1,487 @@
+import csv
+import glob
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+
+class CheckpointJournal:
+    """Append-only record of finished files so an interrupted batch can resume
+
+    Each line is a JSON object with the file path, its status and the size the
+    output file had once that file's row was safely flushed. On resume the
+    output is truncated back to the last recorded size, so a row written after
+    the last checkpoint is never duplicated. A run that appends to an existing
+    output first records where it ended, so a resume never cuts into it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        # Files whose latest entry is a failure; a resumed run retries them
+        self.failed: Set[str] = set()
+        # None until the first checkpoint: there is nothing to truncate back to yet
+        self.committed_offset: Optional[int] = None
+        # Part files of a columnar dataset, relative to its directory, that checkpoints committed
+        self.parts: Set[str] = set()
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash: everything after it never committed
+                    break
+                if entry['status'] == 'ok':
+                    self.done.add(entry['path'])
+                    self.failed.discard(entry['path'])
+                elif entry['status'] == 'failed':
+                    self.failed.add(entry['path'])
+                self.parts.update(entry.get('parts', ()))
+                self.committed_offset = max(self.committed_offset or 0, entry['offset'])
+
+    def start(self, offset: int, parts: Iterable[str] = ()):
+        """Checkpoint where an appended-to output ended, unless an earlier run of this journal did"""
+        if self.committed_offset is None:
+            self.committed_offset = offset
+            self.parts.update(parts)
+            self.record([{'status': 'start', 'offset': offset, 'parts': sorted(parts)}])
+
+    def record(self, entries: List[Dict[str, Any]]):
+        """Append entries and push them to disk"""
+        for entry in entries:
+            self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class _StreamingTextWriter:
+    """Shared plumbing for the line-oriented writers: buffering, flushing, the journal
+
+    Only the rows since the last flush are held in memory, so the footprint
+    stays the same however long the batch is. With a journal, every flush
+    also checkpoints which files made it into the output, and on resume the
+    output is truncated back to the last checkpoint. With append=True rows
+    are added after any existing ones.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], flush_every: int = 100,
+                 journal: Optional[CheckpointJournal] = None, append: bool = False):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.flush_every = flush_every
+        self.journal = journal
+        self.rows_written = 0
+        self._since_flush = 0
+        self._pending: List[Dict[str, Any]] = []
+
+        if journal is not None and journal.committed_offset is not None and os.path.exists(path):
+            # Drop anything past the last checkpoint before appending
+            self._file = open(path, 'r+', encoding='utf-8', newline='')
+            self._file.truncate(journal.committed_offset)
+            self._file.seek(journal.committed_offset)
+        elif append:
+            self._file = open(path, 'a', encoding='utf-8', newline='')
+            if journal is not None:
+                journal.start(self._file.tell())
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._start()
+
+    def _start(self):
+        pass
+
+    def _write(self, row: Dict[str, Any]):
+        raise NotImplementedError
+
+    def write_row(self, row: Dict[str, Any], source: Optional[str] = None):
+        """Write one parsed row; source is the file it came from, for the journal"""
+        self._write(row)
+        self.rows_written += 1
+        if source is not None:
+            self._pending.append({'path': source, 'status': 'ok'})
+        self._count_towards_flush()
+
+    def record_failure(self, source: str, error: str):
+        """Note a failed file in the journal without writing a row"""
+        self._pending.append({'path': source, 'status': 'failed', 'error': error})
+        self._count_towards_flush()
+
+    def _count_towards_flush(self):
+        self._since_flush += 1
+        if self._since_flush >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._since_flush = 0
+        self._file.flush()
+        if self.journal is not None:
+            # The output must be on disk before the journal says so
+            os.fsync(self._file.fileno())
+            offset = self._file.tell()
+            for entry in self._pending:
+                entry['offset'] = offset
+            self.journal.record(self._pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        if self.journal is not None:
+            self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class StreamingCSVWriter(_StreamingTextWriter):
+    """Write rows to CSV as they arrive, flushing every flush_every rows
+
+    The header is written only when the file starts out empty, so appended
+    and resumed runs keep a single header.
+    """
+
+    def _start(self):
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, lineterminator='\n')
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def _write(self, row: Dict[str, Any]):
+        self._writer.writerow(row)
+
+
+class JSONLinesWriter(_StreamingTextWriter):
+    """Write one JSON object per row as they arrive
+
+    Multi-line section text stays on one line as escaped newlines, so the
+    file can be split or loaded line by line without a CSV parser.
+    """
+
+    def _write(self, row: Dict[str, Any]):
+        record = {name: row.get(name, '') for name in self.fieldnames}
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+# Columnar formats write a directory of part files, one per run, so runs append
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+OUTPUT_FORMATS = ('csv', 'jsonl') + tuple(COLUMNAR_FORMATS) + ('sqlite',)
+
+
+def arrow_schema(fieldnames: List[str]):
+    """The explicit Arrow schema for resume rows: every field is nullable UTF-8 text"""
+    import pyarrow
+
+    return pyarrow.schema([pyarrow.field(name, pyarrow.string()) for name in fieldnames],
+                          metadata={'source': 'resume-pdf-to-csv'})
+
+
+class ColumnarWriter:
+    """Write rows to a Parquet or Arrow IPC dataset directory
+
+    Rows are buffered into columns and written as one row group per
+    row_group_size rows. Each run writes its own part file, so append=True
+    simply adds a file and append=False removes the previous run's parts.
+    partition_by='date' or 'batch' puts the part under a hive-style
+    date=YYYY-MM-DD or batch=<batch_id> subdirectory, which pyarrow and
+    pandas read back as a column.
+
+    A part is written as *.tmp and renamed when complete, so a crash never
+    leaves a file without its footer. With a journal every flush closes
+    the current part, which makes each checkpoint durable on its own, and
+    records its name; on resume, parts the journal never recorded (renamed
+    just before a crash, or left by a run without a journal) are removed.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], flush_every: int = 100,
+                 journal: Optional[CheckpointJournal] = None, append: bool = False,
+                 output_format: str = 'parquet', partition_by: Optional[str] = None,
+                 batch_id: Optional[str] = None, row_group_size: int = 10_000):
+        import pyarrow  # noqa: F401  (fail early when the optional dependency is missing)
+
+        if output_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format: {output_format}")
+        if partition_by not in (None, 'date', 'batch'):
+            raise ValueError("partition_by must be None, 'date' or 'batch'")
+        self.path = path
+        self.fieldnames = fieldnames
+        self.flush_every = flush_every
+        self.journal = journal
+        self.output_format = output_format
+        self.partition_by = partition_by
+        self.batch_id = batch_id or time.strftime('%Y%m%dT%H%M%S')
+        self.row_group_size = row_group_size
+        self.schema = arrow_schema(fieldnames)
+        self.rows_written = 0
+        self._since_flush = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._columns: Dict[str, List[Any]] = {name: [] for name in fieldnames}
+        self._buffered = 0
+        self._part = None
+        self._part_path = None
+        self._part_number = 0
+
+        os.makedirs(path, exist_ok=True)
+        suffix = COLUMNAR_FORMATS[output_format]
+        resuming = journal is not None and journal.committed_offset is not None
+        kept = []
+        for part in glob.glob(os.path.join(path, '**', 'part-*' + suffix + '*'), recursive=True):
+            name = os.path.relpath(part, path)
+            # Leftovers from a crash, rows past the last checkpoint, or the previous run when not appending
+            if part.endswith('.tmp') or (resuming and name not in journal.parts) or not (append or resuming):
+                os.remove(part)
+            else:
+                kept.append(name)
+        if append and journal is not None:
+            journal.start(0, kept)
+
+    def _partition_dir(self) -> str:
+        if self.partition_by == 'date':
+            return os.path.join(self.path, 'date=' + time.strftime('%Y-%m-%d'))
+        if self.partition_by == 'batch':
+            return os.path.join(self.path, 'batch=' + self.batch_id)
+        return self.path
+
+    def _open_part(self):
+        import pyarrow
+
+        directory = self._partition_dir()
+        os.makedirs(directory, exist_ok=True)
+        self._part_number += 1
+        name = (f"part-{self.batch_id}-{os.getpid()}-{self._part_number:05d}"
+                f"{COLUMNAR_FORMATS[self.output_format]}")
+        self._part_path = os.path.join(directory, name)
+        if self.output_format == 'parquet':
+            import pyarrow.parquet
+
+            self._part = pyarrow.parquet.ParquetWriter(self._part_path + '.tmp', self.schema,
+                                                       compression='zstd')
+        else:
+            self._part = pyarrow.ipc.new_file(self._part_path + '.tmp', self.schema)
+
+    def _close_part(self) -> Optional[str]:
+        """Finish the open part; returns its name relative to the dataset, or None if none was open"""
+        if self._part is None:
+            return None
+        self._part.close()
+        os.replace(self._part_path + '.tmp', self._part_path)
+        self._part = None
+        return os.path.relpath(self._part_path, self.path)
+
+    def _write_buffer(self):
+        import pyarrow
+
+        if not self._buffered:
+            return
+        if self._part is None:
+            self._open_part()
+        table = pyarrow.Table.from_pydict(self._columns, schema=self.schema)
+        if self.output_format == 'parquet':
+            self._part.write_table(table, row_group_size=self.row_group_size)
+        else:
+            self._part.write_table(table)
+        self._columns = {name: [] for name in self.fieldnames}
+        self._buffered = 0
+
+    def write_row(self, row: Dict[str, Any], source: Optional[str] = None):
+        """Write one parsed row; source is the file it came from, for the journal"""
+        for name in self.fieldnames:
+            self._columns[name].append(row.get(name))
+        self._buffered += 1
+        self.rows_written += 1
+        if source is not None:
+            self._pending.append({'path': source, 'status': 'ok'})
+        if self.journal is None and self._buffered >= self.row_group_size:
+            self._write_buffer()
+        self._count_towards_flush()
+
+    def record_failure(self, source: str, error: str):
+        """Note a failed file in the journal without writing a row"""
+        self._pending.append({'path': source, 'status': 'failed', 'error': error})
+        self._count_towards_flush()
+
+    def _count_towards_flush(self):
+        self._since_flush += 1
+        if self._since_flush >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self._since_flush = 0
+        if self.journal is None:
+            # Without checkpoints, keep buffering up to a full row group
+            return
+        self._write_buffer()
+        part = self._close_part()
+        if part is not None:
+            self._pending.append({'status': 'part', 'parts': [part]})
+        for entry in self._pending:
+            entry['offset'] = self.rows_written
+        self.journal.record(self._pending)
+        self._pending = []
+
+    def close(self):
+        if self.journal is not None:
+            self.flush()
+            self.journal.close()
+        else:
+            self._write_buffer()
+            self._close_part()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def infer_output_format(path: str) -> str:
+    """Pick the output format from the path's extension, CSV by default"""
+    extension = os.path.splitext(path.rstrip('/\\'))[1].lower()
+    return {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet',
+            '.arrow': 'arrow', '.feather': 'arrow', '.db': 'sqlite', '.sqlite': 'sqlite',
+            '.sqlite3': 'sqlite'}.get(extension, 'csv')
+
+
+def open_output_writer(path: str, fieldnames: List[str], flush_every: int = 100,
+                       journal: Optional[CheckpointJournal] = None, append: bool = False,
+                       output_format: Optional[str] = None, partition_by: Optional[str] = None):
+    """Open the streaming writer for output_format (inferred from path when None)"""
+    output_format = output_format or infer_output_format(path)
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}; choose from {', '.join(OUTPUT_FORMATS)}")
+    if output_format in COLUMNAR_FORMATS:
+        return ColumnarWriter(path, fieldnames, flush_every, journal, append, output_format, partition_by)
+    if partition_by is not None:
+        raise ValueError("partition_by only applies to parquet and arrow output")
+    if output_format == 'sqlite':
+        from search_index import SearchIndexWriter
+
+        return SearchIndexWriter(path, fieldnames, flush_every, journal, append)
+    if output_format == 'jsonl':
+        return JSONLinesWriter(path, fieldnames, flush_every, journal, append)
+    return StreamingCSVWriter(path, fieldnames, flush_every, journal, append)
+
+
+def read_rows(path: str, output_format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Rows of an output written by open_output_writer, in the order they were written"""
+    output_format = output_format or infer_output_format(path)
+    if output_format in COLUMNAR_FORMATS:
+        import pyarrow
+
+        suffix = COLUMNAR_FORMATS[output_format]
+        # Part names start with the run's timestamp, so sorting them gives write order;
+        # *.tmp parts were never checkpointed
+        for part in sorted(glob.glob(os.path.join(path, '**', 'part-*' + suffix), recursive=True)):
+            if output_format == 'parquet':
+                import pyarrow.parquet
+
+                batches = pyarrow.parquet.ParquetFile(part).iter_batches()
+            else:
+                reader = pyarrow.ipc.open_file(part)
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            for batch in batches:
+                yield from batch.to_pylist()
+        return
+    if output_format == 'sqlite':
+        from search_index import ResumeSearchIndex
+
+        with ResumeSearchIndex(path) as index:
+            yield from index.rows()
+        return
+    with open(path, encoding='utf-8', newline='') as file:
+        if output_format == 'jsonl':
+            for line in file:
+                yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def drop_rows(path: str, drop: Callable[[str], bool], output_format: Optional[str] = None) -> int:
+    """Remove the rows whose source_file drop() accepts from an output in place; returns how many
+
+    CSV and JSON Lines are rewritten to a temporary file that then replaces
+    the output, columnar outputs part by part the same way, and a SQLite
+    index deletes the rows. Outputs without a source_file column are left
+    alone.
+    """
+    output_format = output_format or infer_output_format(path)
+    if not os.path.exists(path):
+        return 0
+    if output_format in COLUMNAR_FORMATS:
+        return _drop_columnar_rows(path, drop, output_format)
+    if output_format == 'sqlite':
+        from search_index import delete_rows
+
+        return delete_rows(path, drop)
+
+    dropped = 0
+    temp_path = path + '.tmp'
+    with open(path, encoding='utf-8', newline='') as source, \
+            open(temp_path, 'w', encoding='utf-8', newline='') as target:
+        if output_format == 'jsonl':
+            for line in source:
+                if drop(json.loads(line).get('source_file', '')):
+                    dropped += 1
+                else:
+                    target.write(line)
+        else:
+            reader = csv.reader(source)
+            # The dialect DictWriter uses, so kept rows come out byte for byte the same
+            writer = csv.writer(target, lineterminator='\n')
+            header = next(reader, [])
+            column = header.index('source_file') if 'source_file' in header else None
+            writer.writerow(header)
+            for row in reader:
+                if column is not None and drop(row[column]):
+                    dropped += 1
+                else:
+                    writer.writerow(row)
+        target.flush()
+        os.fsync(target.fileno())
+    if dropped:
+        os.replace(temp_path, path)
+    else:
+        os.remove(temp_path)
+    return dropped
+
+
+def _drop_columnar_rows(path: str, drop: Callable[[str], bool], output_format: str) -> int:
+    import pyarrow
+
+    dropped = 0
+    for part in glob.glob(os.path.join(path, '**', 'part-*' + COLUMNAR_FORMATS[output_format]), recursive=True):
+        if output_format == 'parquet':
+            import pyarrow.parquet
+
+            table = pyarrow.parquet.ParquetFile(part).read()
+        else:
+            table = pyarrow.ipc.open_file(part).read_all()
+        if 'source_file' not in table.column_names:
+            continue
+        keep = pyarrow.array([not drop(source or '') for source in table.column('source_file').to_pylist()],
+                             pyarrow.bool_())
+        kept = table.filter(keep)
+        if kept.num_rows == table.num_rows:
+            continue
+        dropped += table.num_rows - kept.num_rows
+        if not kept.num_rows:
+            os.remove(part)
+            continue
+        # Same name, so the part keeps its place in write order
+        if output_format == 'parquet':
+            pyarrow.parquet.write_table(kept, part + '.tmp', compression='zstd')
+        else:
+            with pyarrow.ipc.new_file(part + '.tmp', kept.schema) as writer:
+                writer.write_table(kept)
+        os.replace(part + '.tmp', part)
+    return dropped
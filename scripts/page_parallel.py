@@ -0,0 +1,136 @@
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+from pdf_backends import BACKENDS, ExtractionBackend, FallbackChain
+from pdf_sources import PDFInput, open_pdf_source
+from scheduling import job_size
+
+# Documents shorter than this are extracted in-process: opening them again in
+# every worker and shipping the text back costs more than it saves
+DEFAULT_PAGE_THRESHOLD = 40
+# Each task reopens the document, so ranges are never shorter than this
+MIN_PAGES_PER_TASK = 8
+# Ranges per worker: more than one so a slow stretch of pages does not hold up the rest
+RANGES_PER_WORKER = 2
+
+
+def _extract_range(task: Tuple[str, object, int, int]) -> List[str]:
+    """Worker side: open the document independently and extract pages start to stop"""
+    backend_name, source, start, stop = task
+    with open_pdf_source(source) as opened:
+        return list(BACKENDS[backend_name].iter_pages(opened, start, stop))
+
+
+class PageParallelExtractor:
+    """Split the pages of one long PDF across a process pool and join them back in order
+
+    Only documents with at least threshold pages go to the pool; shorter
+    ones, and everything in a daemonic process such as a batch pool worker
+    (which may not start processes of its own), are left to the in-process
+    path. The pool is started on first use and kept for later documents;
+    it is never pickled, so a copy sent to another process starts its own.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threshold: int = DEFAULT_PAGE_THRESHOLD):
+        if threshold < 1:
+            raise ValueError("threshold must be at least one page")
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pool'] = state['_pool_pid'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = multiprocessing.Pool(self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def ranges(self, page_count: int) -> List[range]:
+        """Contiguous page ranges, in order, that the pages are split into"""
+        per_task = max(MIN_PAGES_PER_TASK, math.ceil(page_count / (self.workers * RANGES_PER_WORKER)))
+        return [range(start, min(start + per_task, page_count)) for start in range(0, page_count, per_task)]
+
+    def extract(self, chain: FallbackChain, pdf_path: PDFInput,
+                max_pages: Optional[int] = None) -> Optional[List[str]]:
+        """The text of each page (up to max_pages), or None to extract in-process instead
+
+        The pages are read with the first backend in chain that can open
+        the document, the one the in-process path would use. If any range
+        fails or no page has text, None is returned and the in-process path
+        runs as usual, raising the same error or falling back to the next
+        backend, so the result never differs from a sequential extraction.
+        """
+        if self.workers < 2 or multiprocessing.current_process().daemon:
+            return None
+        if hasattr(pdf_path, 'read') and not pdf_path.seekable():
+            # A pipe can only be read once, and the in-process path may still need it
+            return None
+        # The trailer's page count rules out short documents without opening them
+        pages = job_size(pdf_path).pages
+        if pages is not None and min(pages, max_pages or pages) < self.threshold:
+            return None
+        with open_pdf_source(pdf_path) as source:
+            backend, pages = self._open_with(chain, source)
+            if backend is None:
+                return None
+            if max_pages is not None:
+                pages = min(pages, max_pages)
+            if pages < self.threshold:
+                return None
+            spooled = None
+            if not isinstance(source, str):
+                # Spooled to one temporary file that every worker opens, rather than
+                # pickling the whole document into each task
+                descriptor, spooled = tempfile.mkstemp(suffix='.pdf')
+                with os.fdopen(descriptor, 'wb') as file:
+                    source.seek(0)
+                    shutil.copyfileobj(source, file)
+                source = spooled
+            tasks = [(backend.name, source, pages_range.start, pages_range.stop)
+                     for pages_range in self.ranges(pages)]
+        try:
+            chunks = self._get_pool().map(_extract_range, tasks, chunksize=1)
+        except Exception:
+            return None
+        finally:
+            if spooled is not None:
+                os.remove(spooled)
+        page_texts = [page_text for chunk in chunks for page_text in chunk]
+        if not any(page_text.strip() for page_text in page_texts):
+            return None
+        return page_texts
+
+    @staticmethod
+    def _open_with(chain: FallbackChain, source) -> Tuple[Optional[ExtractionBackend], int]:
+        for backend in chain.backends:
+            if not isinstance(source, str):
+                source.seek(0)
+            try:
+                return backend, backend.page_count(source)
+            except Exception:
+                continue
+        return None, 0
+
+    def close(self):
+        """Stop the pool; the next long document starts a new one"""
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.terminate()
+            self._pool = self._pool_pid = None
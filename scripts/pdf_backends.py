@@ -0,0 +1,276 @@
+import importlib
+import importlib.util
+import threading
+from importlib import metadata
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Union
+
+PDFSource = Union[str, BinaryIO]
+
+
+class ExtractionBackend:
+    """One way of turning a PDF into per-page text
+
+    Subclasses name the distribution they need; a backend whose library is
+    not installed reports itself unavailable and is skipped by 'auto'.
+    """
+
+    name = ''
+    module = ''
+    distribution = ''
+    _version = None
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def load(self):
+        """Import the library now instead of on the first document"""
+        importlib.import_module(self.module)
+
+    def version(self) -> str:
+        # Reading package metadata parses files, so do it once per backend
+        if self._version is None:
+            try:
+                self._version = f"{self.name}-{metadata.version(self.distribution)}"
+            except metadata.PackageNotFoundError:
+                self._version = self.name
+        return self._version
+
+    def iter_pages(self, source: PDFSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Yield the text of each page in order, or of pages start to stop (0-based, stop excluded)"""
+        raise NotImplementedError
+
+    def page_count(self, source: PDFSource) -> int:
+        raise NotImplementedError
+
+
+def _rewind(source: PDFSource):
+    if not isinstance(source, str):
+        source.seek(0)
+
+
+def _page_range(page_count: int, start: int, stop: Optional[int]) -> range:
+    return range(start, page_count if stop is None else min(stop, page_count))
+
+
+class PyPDF2Backend(ExtractionBackend):
+    """Pure-Python and always installed, but slow and prone to broken word spacing"""
+
+    name = 'pypdf2'
+    module = 'PyPDF2'
+    distribution = 'PyPDF2'
+
+    def iter_pages(self, source: PDFSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        import PyPDF2
+
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                yield from self._iter_reader_pages(PyPDF2.PdfReader(file), start, stop)
+        else:
+            yield from self._iter_reader_pages(PyPDF2.PdfReader(source), start, stop)
+
+    def _iter_reader_pages(self, pdf_reader, start: int, stop: Optional[int]) -> Iterator[str]:
+        for page_num in _page_range(len(pdf_reader.pages), start, stop):
+            try:
+                yield pdf_reader.pages[page_num].extract_text() or ""
+            except Exception as e:
+                print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
+                yield ""
+
+    def page_count(self, source: PDFSource) -> int:
+        import PyPDF2
+
+        # Only reads the xref and page tree, not the page contents
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                return len(PyPDF2.PdfReader(file).pages)
+        return len(PyPDF2.PdfReader(source).pages)
+
+
+class PyMuPDFBackend(ExtractionBackend):
+    """MuPDF through PyMuPDF: native code with better word spacing than PyPDF2"""
+
+    name = 'pymupdf'
+    module = 'pymupdf'
+    distribution = 'PyMuPDF'
+
+    # MuPDF's global context is not thread-safe, so calls into it are serialised
+    # per page; between pages other threads get their turn
+    _lock = threading.Lock()
+
+    def _open(self, source: PDFSource):
+        import pymupdf
+
+        if isinstance(source, str):
+            return pymupdf.open(source)
+        # In-memory streams lend their buffer instead of copying it out with read()
+        if hasattr(source, 'getbuffer'):
+            return pymupdf.open(stream=source.getbuffer(), filetype='pdf')
+        _rewind(source)
+        return pymupdf.open(stream=source.read(), filetype='pdf')
+
+    def iter_pages(self, source: PDFSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        with self._lock:
+            document = self._open(source)
+        try:
+            for page_num in _page_range(document.page_count, start, stop):
+                try:
+                    with self._lock:
+                        text = document[page_num].get_text()
+                    yield text.rstrip('\n')
+                except Exception as e:
+                    print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
+                    yield ""
+        finally:
+            with self._lock:
+                document.close()
+
+    def page_count(self, source: PDFSource) -> int:
+        with self._lock, self._open(source) as document:
+            return document.page_count
+
+
+class PdfiumBackend(ExtractionBackend):
+    """PDFium (Chrome's PDF engine) through pypdfium2, the fastest of the three"""
+
+    name = 'pdfium'
+    module = 'pypdfium2'
+    distribution = 'pypdfium2'
+
+    # PDFium must not be entered from two threads at once; each call, including
+    # closing the page objects, holds the lock so nothing is left to the garbage collector
+    _lock = threading.Lock()
+
+    def iter_pages(self, source: PDFSource, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        import pypdfium2
+
+        with self._lock:
+            document = pypdfium2.PdfDocument(source)
+        try:
+            for page_num in _page_range(len(document), start, stop):
+                try:
+                    with self._lock:
+                        page = document[page_num]
+                        try:
+                            textpage = page.get_textpage()
+                            text = textpage.get_text_range()
+                            textpage.close()
+                        finally:
+                            page.close()
+                    yield text.replace('\r\n', '\n').rstrip('\n')
+                except Exception as e:
+                    print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
+                    yield ""
+        finally:
+            with self._lock:
+                document.close()
+
+    def page_count(self, source: PDFSource) -> int:
+        import pypdfium2
+
+        with self._lock:
+            document = pypdfium2.PdfDocument(source)
+            try:
+                return len(document)
+            finally:
+                document.close()
+
+
+BACKENDS = {backend.name: backend for backend in (PdfiumBackend(), PyMuPDFBackend(), PyPDF2Backend())}
+
+# Preference order for 'auto': fastest first (see benchmarks/bench_backends.py), PyPDF2 as the last resort
+AUTO_ORDER = ('pdfium', 'pymupdf', 'pypdf2')
+
+
+class FallbackChain:
+    """Try backends in order, moving on when one raises or finds no text at all
+
+    Pages are streamed from the first backend that produces text. Leading
+    empty pages are held back until text shows up, so a fallback never
+    hands the caller the same pages twice. Once text has been yielded the
+    backend is committed and later errors propagate.
+    """
+
+    def __init__(self, backends: Sequence[ExtractionBackend]):
+        if not backends:
+            raise ValueError("No PDF extraction backend is available")
+        self.backends = list(backends)
+
+    @property
+    def name(self) -> str:
+        return '+'.join(backend.name for backend in self.backends)
+
+    def version(self) -> str:
+        return '+'.join(backend.version() for backend in self.backends)
+
+    def load(self):
+        for backend in self.backends:
+            backend.load()
+
+    def iter_pages(self, source: PDFSource) -> Iterator[str]:
+        last_error = None
+        empty_pages = None
+        for backend in self.backends:
+            _rewind(source)
+            held_empty = 0
+            committed = False
+            try:
+                for page_text in backend.iter_pages(source):
+                    if committed:
+                        yield page_text
+                    elif page_text.strip():
+                        committed = True
+                        for _ in range(held_empty):
+                            yield ""
+                        yield page_text
+                    else:
+                        held_empty += 1
+            except Exception as e:
+                if committed:
+                    raise
+                last_error = e
+                continue
+            if committed:
+                return
+            empty_pages = held_empty
+        if empty_pages is None:
+            raise last_error
+        # Every backend that could read the file came up empty, e.g. a scan with no text layer
+        for _ in range(empty_pages):
+            yield ""
+
+    def page_count(self, source: PDFSource) -> int:
+        last_error = None
+        for backend in self.backends:
+            _rewind(source)
+            try:
+                return backend.page_count(source)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+
+def resolve_backend(backend: Union[str, Sequence[str], ExtractionBackend, FallbackChain] = 'auto'
+                    ) -> FallbackChain:
+    """Build the backend chain for a name, a list of names, 'auto', or a backend instance"""
+    if isinstance(backend, FallbackChain):
+        return backend
+    if isinstance(backend, ExtractionBackend):
+        return FallbackChain([backend])
+    if backend == 'auto':
+        names: List[str] = list(AUTO_ORDER)
+    elif isinstance(backend, str):
+        names = [backend]
+    else:
+        names = list(backend)
+    unknown = [name for name in names if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown PDF backend(s): {', '.join(unknown)}; choose from {', '.join(BACKENDS)}")
+    chosen = [BACKENDS[name] for name in names if BACKENDS[name].available()]
+    if backend != 'auto' and len(chosen) < len(names):
+        missing = [name for name in names if not BACKENDS[name].available()]
+        raise ValueError(f"PDF backend(s) not installed: {', '.join(missing)}")
+    return FallbackChain(chosen)
+
+
+def available_backends() -> List[str]:
+    return [name for name in AUTO_ORDER if BACKENDS[name].available()]
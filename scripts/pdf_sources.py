@@ -0,0 +1,294 @@
+import contextlib
+import io
+import mmap
+import os
+import struct
+import tarfile
+import zipfile
+from typing import Any, BinaryIO, Callable, Iterator, NamedTuple, Optional, Union
+
+from pdf_backends import PDFSource
+
+# File name suffixes read as archives of PDFs rather than as a PDF
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+# Archive member names are reported as <archive>!<member>
+MEMBER_SEPARATOR = '!'
+
+# A page fault on a file mapping also maps its neighbours within a block this
+# size (Linux fault-around), so dropped pages are dropped block by block
+_FAULT_AROUND_BYTES = 64 * 1024
+
+# Fixed part of a ZIP local file header; the name and extra field lengths sit at its end
+_ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+
+class PDFDocument(NamedTuple):
+    """PDF content already in memory (or mapped), with the name it is reported under
+
+    data is any bytes-like object: bytes, bytearray, a memoryview or an
+    mmap. A memoryview is turned into bytes only when the document is
+    pickled for another process.
+    """
+    name: str
+    data: Any
+
+    def __reduce__(self):
+        data = self.data
+        if isinstance(data, (memoryview, mmap.mmap)):
+            data = bytes(data)
+        return PDFDocument, (self.name, data)
+
+
+PDFInput = Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap, BinaryIO, PDFDocument]
+
+
+class BufferStream(io.RawIOBase):
+    """Seekable read-only stream over a bytes-like object, without copying it
+
+    readinto copies straight from the buffer into the caller's, so a
+    backend reading through callbacks (PDFium) touches only the bytes it
+    needs, and getbuffer hands the whole buffer to one that wants it at
+    once (MuPDF).
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = max(0, min(len(buffer), len(self._view) - self._position))
+        memoryview(buffer).cast('B')[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def readall(self) -> bytes:
+        data = self._view[self._position:].tobytes()
+        self._position = len(self._view)
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def close(self):
+        # Release the view so the owner (e.g. an mmap) can be closed
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _is_buffer(source) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview, mmap.mmap))
+
+
+@contextlib.contextmanager
+def open_pdf_source(source: PDFInput) -> Iterator[PDFSource]:
+    """A path or seekable binary stream the extraction backends can read
+
+    Paths are passed through. Buffers are wrapped without copying, and
+    seekable file objects are read in place. Non-seekable streams (pipes,
+    sockets) are read into memory first, since a PDF's cross-reference
+    table sits at its end.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+    if isinstance(source, os.PathLike):
+        yield os.fspath(source)
+        return
+    if isinstance(source, PDFDocument):
+        source = source.data
+    if _is_buffer(source):
+        stream = BufferStream(source)
+    elif hasattr(source, 'read'):
+        if source.seekable():
+            yield source
+            return
+        stream = BufferStream(source.read())
+    else:
+        raise TypeError(f"Cannot read a PDF from {type(source).__name__}")
+    with stream:
+        yield stream
+
+
+def pdf_buffer(source: PDFInput):
+    """The whole PDF as a bytes-like object, without a copy where the source allows it"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            return file.read()
+    if isinstance(source, PDFDocument):
+        source = source.data
+    if _is_buffer(source):
+        return memoryview(source)
+    if hasattr(source, 'getbuffer'):
+        return source.getbuffer()
+    if source.seekable():
+        source.seek(0)
+    return source.read()
+
+
+def source_name(source: PDFInput) -> Optional[str]:
+    """The path or name a source is reported under, or None for an anonymous buffer or stream"""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    if isinstance(source, PDFDocument):
+        return source.name
+    name = getattr(source, 'name', None)
+    return name if isinstance(name, str) else None
+
+
+def is_archive(path: str) -> bool:
+    return os.path.isfile(path) and path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def iter_archive(path: str, select: Optional[Callable[[str], bool]] = None) -> Iterator[PDFDocument]:
+    """Yield the PDFs in a ZIP or TAR archive in stored order, one at a time
+
+    Nothing is extracted to disk. Members stored without compression are
+    memoryview slices of the memory-mapped archive, so they are never
+    copied; compressed members are decompressed one at a time. Either
+    way memory use does not grow with the size of the archive. select,
+    given the archive!member name, skips the members it rejects without
+    reading or decompressing them.
+    """
+    select = select or _select_all
+    if zipfile.is_zipfile(path):
+        yield from _iter_zip(path, select)
+        return
+    try:
+        archive = tarfile.open(path, 'r:')
+    except tarfile.ReadError:
+        yield from _iter_compressed_tar(path, select)
+        return
+    with archive, _MappedFile(path) as mapped:
+        for info in _iter_tar_members(archive):
+            name = _member_name(path, info.name)
+            if select(name):
+                yield mapped.document(name, info.offset_data, info.size)
+
+
+def iter_archive_names(path: str) -> Iterator[str]:
+    """The archive!member names iter_archive would yield, in the same order, without reading any PDF"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_pdf_name(info.filename):
+                    yield _member_name(path, info.filename)
+        return
+    # Transparent decompression; only the member headers are kept
+    with tarfile.open(path, 'r|*') as archive:
+        for info in _iter_tar_members(archive):
+            yield _member_name(path, info.name)
+
+
+def _select_all(name: str) -> bool:
+    return True
+
+
+def _member_name(path: str, member: str) -> str:
+    return f"{path}{MEMBER_SEPARATOR}{member}"
+
+
+def _is_pdf_name(name: str) -> bool:
+    return name.lower().endswith('.pdf')
+
+
+class _MappedFile:
+    """A read-only memory map of an archive, handing out members as zero-copy slices
+
+    Pages of the previous member are dropped from the process's resident
+    set once the caller asks for the next one. They are clean file pages,
+    so a caller still holding the slice just reads them back in.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.view = memoryview(self._mapping if self._mapping is not None else b'')
+        self._previous = None
+
+    def document(self, name: str, start: int, size: int) -> PDFDocument:
+        self._forget_previous()
+        self._previous = (start, size)
+        return PDFDocument(name, self.view[start:start + size])
+
+    def _forget_previous(self):
+        if self._previous is None or not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        start, size = self._previous
+        # From the start of the block, since touching this member may have re-mapped
+        # the tail of the one before it
+        aligned = start - start % max(mmap.PAGESIZE, _FAULT_AROUND_BYTES)
+        if size:
+            self._mapping.madvise(mmap.MADV_DONTNEED, aligned, start + size - aligned)
+
+    def __enter__(self) -> '_MappedFile':
+        return self
+
+    def __exit__(self, *exc_info):
+        self._forget_previous()
+        self.view.release()
+        if self._mapping is not None:
+            # Slices still held by the caller keep the mapping open until they are dropped
+            with contextlib.suppress(BufferError):
+                self._mapping.close()
+
+
+def _iter_zip(path: str, select: Callable[[str], bool]) -> Iterator[PDFDocument]:
+    with zipfile.ZipFile(path) as archive, _MappedFile(path) as mapped:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_pdf_name(info.filename):
+                continue
+            name = _member_name(path, info.filename)
+            if not select(name):
+                continue
+            if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+                # The data follows the local header, whose name and extra field may differ from the central directory's
+                header = _ZIP_LOCAL_HEADER.unpack_from(mapped.view, info.header_offset)
+                start = info.header_offset + _ZIP_LOCAL_HEADER.size + header[-2] + header[-1]
+                yield mapped.document(name, start, info.file_size)
+            else:
+                yield PDFDocument(name, archive.read(info))
+
+
+def _iter_tar_members(archive: tarfile.TarFile) -> Iterator[tarfile.TarInfo]:
+    while True:
+        info = archive.next()
+        if info is None:
+            return
+        # TarFile remembers every member it has read; forget them to keep memory flat
+        archive.members.clear()
+        if info.isfile() and _is_pdf_name(info.name):
+            yield info
+
+
+def _iter_compressed_tar(path: str, select: Callable[[str], bool]) -> Iterator[PDFDocument]:
+    # Stream mode decompresses front to back without seeking
+    with tarfile.open(path, 'r|*') as archive:
+        for info in _iter_tar_members(archive):
+            name = _member_name(path, info.name)
+            if select(name):
+                yield PDFDocument(name, archive.extractfile(info).read())
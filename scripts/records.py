@@ -0,0 +1,115 @@
+import collections
+import collections.abc
+import threading
+from typing import Any, Dict, Iterable, Sequence, Tuple, Type
+
+_record_types: Dict[Tuple[str, ...], Type['ResumeRecordBase']] = {}
+_record_types_lock = threading.Lock()
+
+
+class ResumeRecordBase:
+    """A read-only mapping of resume fields, stored as a named tuple
+
+    A record is a tuple in field order, so it costs no per-instance dict
+    and turns into DataFrame or Arrow columns without conversion. It reads
+    like the dicts the parsers used to return: iterating and `in` see the
+    field names, and record['field'], get(), items(), dict(record) and
+    csv.DictWriter all work, as do record.field and record[0].
+
+    It is still a tuple for hashing, equality and pickling, and json.dumps
+    treats it as one; use dict(record) or record._asdict() there.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...]
+    _keys = None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._keys:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self._keys else default
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def keys(self):
+        return self._keys
+
+    def values(self) -> Tuple[Any, ...]:
+        # A slice of a tuple subclass is a plain tuple of the values
+        return tuple.__getitem__(self, slice(None))
+
+    def items(self):
+        return zip(self._fields, self.values())
+
+    # The named tuple versions of these iterate the record, which now gives the field names
+    def _asdict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, self.values()))
+
+    def _replace(self, **changes) -> 'ResumeRecordBase':
+        record = self._make(changes.pop(name, value) for name, value in self.items())
+        if changes:
+            raise ValueError(f"Got unexpected field names: {list(changes)!r}")
+        return record
+
+    def __getnewargs__(self):
+        return self.values()
+
+    def __reduce__(self):
+        # The class is built at runtime, so pickle the field names rather than a class reference
+        return _rebuild_record, (self._fields, self.values())
+
+
+collections.abc.Mapping.register(ResumeRecordBase)
+
+
+def record_type(fields: Iterable[str]) -> Type[ResumeRecordBase]:
+    """The record class for a field list, created once and then reused"""
+    fields = tuple(fields)
+    record_class = _record_types.get(fields)
+    if record_class is None:
+        with _record_types_lock:
+            record_class = _record_types.get(fields)
+            if record_class is None:
+                base = collections.namedtuple('ResumeRecord', fields)
+                record_class = type('ResumeRecord', (ResumeRecordBase, base), {
+                    '__slots__': (),
+                    # A dict keys view so set operations (as in csv.DictWriter) work
+                    '_keys': dict.fromkeys(fields).keys(),
+                })
+                _record_types[fields] = record_class
+    return record_class
+
+
+def _rebuild_record(fields: Tuple[str, ...], values: Tuple[Any, ...]) -> ResumeRecordBase:
+    return record_type(fields)._make(values)
+
+
+def records_to_dataframe(records: Sequence[ResumeRecordBase]):
+    """DataFrame with one row per record, built straight from the tuples"""
+    import pandas as pd
+
+    return pd.DataFrame.from_records([record.values() for record in records],
+                                     columns=records[0]._fields if records else None)
+
+
+def records_to_arrow(records: Sequence[ResumeRecordBase]):
+    """Arrow table with the string schema used for Parquet output"""
+    import pyarrow
+
+    from output_writers import arrow_schema
+
+    if not records:
+        raise ValueError("No records to convert")
+    fields = records[0]._fields
+    columns = zip(*(record.values() for record in records))
+    return pyarrow.Table.from_arrays([pyarrow.array(column, pyarrow.string()) for column in columns],
+                                     schema=arrow_schema(list(fields)))
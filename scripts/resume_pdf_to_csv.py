@@ -1,11 +1,17 @@
-import PyPDF2
-import pandas as pd
 import re
-import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Mapping, Optional, Type
+from document import ResumeDocument, TextOrDocument, as_document
+from instrumentation import NULL_TRACE, Instrumentation, NullTrace
+from pdf_backends import resolve_backend
+from pdf_sources import PDFInput, open_pdf_source, source_name
+from records import ResumeRecordBase, record_type
 
 class ResumePDFToCSV:
-    def __init__(self):
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, backend='auto'):
+        # Optional per-document stage timings; costs nothing when left as None
+        self.instrumentation = instrumentation
+        # Text extraction library, or an ordered list to fall back through ('auto' = fastest installed)
+        self.backend = resolve_backend(backend)
         self.resume_data = {
             'name': '',
             'email': '',
@@ -21,15 +27,16 @@ class ResumePDFToCSV:
             'achievements': ''
         }
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def extract_text_from_pdf(self, pdf_path: PDFInput, trace: NullTrace = NULL_TRACE) -> str:
         """Extract text from PDF file"""
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            text = ""
+            # A path, or bytes, a buffer or a binary file object
+            with open_pdf_source(pdf_path) as source:
+                for page_text in self.backend.iter_pages(source):
+                    trace.count_page()
+                    text += page_text + "\n"
+            return text
         except Exception as e:
             print(f"Error reading PDF: {e}")
             return ""
@@ -43,7 +50,7 @@ class ResumePDFToCSV:
     def extract_phone(self, text: str) -> str:
         """Extract phone number from text"""
         phone_patterns = [
-            r'\+?1?[-.\s]?$$?([0-9]{3})$$?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
+            r'\+?1?[-.\s]?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})',
             r'\+?([0-9]{1,3})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})[-.\s]?([0-9]{3,4})',
             r'(\d{10})',
             r'\+\d{1,3}\s?\d{3,4}\s?\d{3,4}\s?\d{3,4}'
@@ -57,11 +64,10 @@ class ResumePDFToCSV:
                 return matches[0]
         return ""
     
-    def extract_name(self, text: str) -> str:
+    def extract_name(self, text: TextOrDocument) -> str:
         """Extract name from the beginning of the resume"""
-        lines = text.split('\n')
         # Usually name is in the first few lines
-        for line in lines[:5]:
+        for line in as_document(text).lines(5):
             line = line.strip()
             if line and len(line.split()) <= 4 and not any(char.isdigit() for char in line):
                 # Check if it's not an email or common resume words
@@ -70,18 +76,17 @@ class ResumePDFToCSV:
                     return line
         return ""
     
-    def extract_section_content(self, text: str, section_keywords: List[str], 
+    def extract_section_content(self, text: TextOrDocument, section_keywords: List[str], 
                               next_section_keywords: List[str] = None) -> str:
         """Extract content of a specific section"""
-        text_lower = text.lower()
+        document = as_document(text)
+        text = document.text
         
         # Find section start
         section_start = -1
         for keyword in section_keywords:
-            pattern = rf'\b{re.escape(keyword.lower())}\b'
-            match = re.search(pattern, text_lower)
-            if match:
-                section_start = match.start()
+            section_start = document.find_word(keyword.lower())
+            if section_start != -1:
                 break
         
         if section_start == -1:
@@ -91,30 +96,62 @@ class ResumePDFToCSV:
         section_end = len(text)
         if next_section_keywords:
             for keyword in next_section_keywords:
-                pattern = rf'\b{re.escape(keyword.lower())}\b'
-                match = re.search(pattern, text_lower[section_start + 50:])
-                if match:
-                    section_end = section_start + 50 + match.start()
+                # Searched as if the text began 50 characters into the section
+                position = document.find_word(keyword.lower(), section_start + 50)
+                if position != -1:
+                    section_end = position
                     break
         
-        section_content = text[section_start:section_end].strip()
-        # Clean up the content
-        lines = section_content.split('\n')
-        cleaned_lines = [line.strip() for line in lines[1:] if line.strip()]
-        return ' | '.join(cleaned_lines)
+        # Clean up the content: every non-empty line after the header line
+        header_end = text.find('\n', section_start, section_end)
+        if header_end == -1:
+            return ""
+        return document.join_lines(header_end + 1, section_end, ' | ')
     
-    def parse_resume(self, pdf_path: str) -> Dict[str, Any]:
-        """Main function to parse resume and extract all information"""
-        text = self.extract_text_from_pdf(pdf_path)
+    def record_type(self) -> Type[ResumeRecordBase]:
+        """The immutable record class parse_resume returns, one field per resume_data key"""
+        return record_type(self.resume_data)
+
+    def parse_resume(self, pdf_path: PDFInput) -> ResumeRecordBase:
+        """Main function to parse resume and extract all information
+
+        Returns a new immutable record per call, so one converter can be
+        shared between threads.
+        """
+        record_class = self.record_type()
+        data = dict.fromkeys(record_class._fields, '')
+        if self.instrumentation is None:
+            self._parse(pdf_path, NULL_TRACE, data)
+        else:
+            trace = self.instrumentation.start(source_name(pdf_path) or pdf_path, type(self).__name__)
+            try:
+                self._parse(pdf_path, trace, data)
+            except Exception as e:
+                trace.set('error', f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                trace.finish()
+        return record_class._make(data[key] for key in record_class._fields)
+
+    def _parse(self, pdf_path: PDFInput, trace: NullTrace, data: Dict[str, Any]):
+        """Fill data in place from the PDF"""
+        with trace.stage('extract_text_from_pdf'):
+            text = self.extract_text_from_pdf(pdf_path, trace)
+        trace.set('chars', len(text))
         
         if not text:
             print("Could not extract text from PDF")
-            return self.resume_data
+            return
+        # Built once; the name and the eight section searches share its lowercase text
+        document = ResumeDocument(text)
         
         # Extract basic information
-        self.resume_data['name'] = self.extract_name(text)
-        self.resume_data['email'] = self.extract_email(text)
-        self.resume_data['phone'] = self.extract_phone(text)
+        with trace.stage('extract_name'):
+            data['name'] = self.extract_name(document)
+        with trace.stage('extract_email'):
+            data['email'] = self.extract_email(text)
+        with trace.stage('extract_phone'):
+            data['phone'] = self.extract_phone(text)
         
         # Extract sections
         sections_config = [
@@ -160,19 +197,20 @@ class ResumePDFToCSV:
             }
         ]
         
-        for section in sections_config:
-            content = self.extract_section_content(
-                text, 
-                section['keywords'], 
-                section['next_keywords']
-            )
-            self.resume_data[section['key']] = content
-        
-        return self.resume_data
+        with trace.stage('extract_section_content'):
+            for section in sections_config:
+                content = self.extract_section_content(
+                    document, 
+                    section['keywords'], 
+                    section['next_keywords']
+                )
+                data[section['key']] = content
     
-    def save_to_csv(self, data: Dict[str, Any], output_path: str):
+    def save_to_csv(self, data: Mapping[str, Any], output_path: str):
         """Save extracted data to CSV file"""
-        df = pd.DataFrame([data])
+        import pandas as pd
+
+        df = pd.DataFrame([dict(data)])
         df.to_csv(output_path, index=False)
         print(f"Resume data saved to {output_path}")
         
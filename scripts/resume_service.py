@@ -0,0 +1,350 @@
+"""Long-running local HTTP service: POST PDF bytes, get the parsed record back as JSON
+
+Usage: python resume_service.py [--host 127.0.0.1] [--port 8080] [--workers N]
+                                [--queue 32] [--timeout 30] [--backend auto]
+                                [--page-workers N] [--page-threshold 40]
+
+    curl --data-binary @resume.pdf http://127.0.0.1:8080/parse
+    curl --data-binary @resume.pdf "http://127.0.0.1:8080/parse?fields=contact"
+    curl http://127.0.0.1:8080/health
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from advanced_resume_parser import CONTACT_FIELDS, AdvancedResumePDFToCSV
+from page_parallel import DEFAULT_PAGE_THRESHOLD, PageParallelExtractor
+
+# Parser owned by the current worker process, built once by _init_worker
+_worker_parser = None
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           411: 'Length Required', 413: 'Payload Too Large', 422: 'Unprocessable Entity',
+           500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+# Seconds to wait before starting another worker when a replacement fails to start
+RESTART_DELAY = 1.0
+
+
+def _init_worker(backend, page_workers: Optional[int], page_threshold: int):
+    global _worker_parser
+    page_parallel = PageParallelExtractor(page_workers, page_threshold) if page_workers else None
+    _worker_parser = AdvancedResumePDFToCSV(strict=True, backend=backend, page_parallel=page_parallel)
+    # Pay for the PDF library imports now rather than on the first request
+    _worker_parser.backend.load()
+
+
+def _parse_bytes(pdf_bytes: bytes, fields: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    return dict(_worker_parser.parse_resume(pdf_bytes, fields=fields))
+
+
+def _service_worker(conn, parent_conn, backend, page_workers: Optional[int], page_threshold: int):
+    """Report ready, then parse one (pdf_bytes, fields) request at a time until None or a closed pipe"""
+    # A forked child holds the service's end too; without closing it the pipe never reports EOF
+    parent_conn.close()
+    if hasattr(os, 'setpgrp'):
+        # A group of its own, so killing it also stops any page-parallel pool it started
+        os.setpgrp()
+    _init_worker(backend, page_workers, page_threshold)
+    conn.send(os.getpid())
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        try:
+            conn.send((True, _parse_bytes(*request)))
+        except Exception as e:
+            conn.send((False, f'{type(e).__name__}: {e}'))
+
+
+class _ServiceWorker:
+    """One parser process and its pipe; a worker that overruns or dies is killed and replaced"""
+
+    def __init__(self, initargs: Tuple[Any, ...]):
+        self.conn, child_conn = multiprocessing.Pipe()
+        # Not daemonic, so it may start a page-parallel pool of its own
+        self.process = multiprocessing.Process(target=_service_worker,
+                                               args=(child_conn, self.conn, *initargs))
+        self.process.start()
+        child_conn.close()
+
+    async def receive(self):
+        """The next message from the worker, without blocking the event loop; EOFError if it died"""
+        loop = asyncio.get_running_loop()
+        fd = self.conn.fileno()
+        readable = loop.create_future()
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+        return self.conn.recv()
+
+    def kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            # No group of its own yet, or no process groups on this platform
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ResumeService:
+    """Asyncio front end that hands parsing to a pre-warmed process pool
+
+    At most `workers` documents are parsed at once and at most `queue` more
+    wait for a worker; beyond that requests are refused with 503 straight
+    away. A request that takes longer than `timeout` seconds gets a 504
+    and its worker is killed, page-parallel pool and all, and replaced, so
+    a stuck document holds nothing once it has been answered. A worker
+    that crashes is replaced the same way and its request gets a 500;
+    the other workers carry on. With page_workers, each worker splits the
+    pages of a whole-document request with at least page_threshold pages
+    across its own pool of that many processes.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue: int = 32, timeout: float = 30.0,
+                 max_body: int = 20 * 1024 * 1024, backend='auto', page_workers: Optional[int] = None,
+                 page_threshold: int = DEFAULT_PAGE_THRESHOLD):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = queue
+        self.timeout = timeout
+        self.max_body = max_body
+        self.backend = backend
+        self.page_workers = page_workers
+        self.page_threshold = page_threshold
+        self.idle = None
+        self.busy = set()
+        self.restarts = set()
+        self.closed = False
+        self.admitted = 0
+        self.known_fields = set(AdvancedResumePDFToCSV().resume_data)
+
+    def _spawn(self) -> _ServiceWorker:
+        return _ServiceWorker((self.backend, self.page_workers, self.page_threshold))
+
+    async def start(self):
+        self.idle = asyncio.Queue()
+        workers = [self._spawn() for _ in range(self.workers)]
+        # Every worker has its parser built before the first request arrives
+        try:
+            await asyncio.gather(*(worker.receive() for worker in workers))
+        except BaseException:
+            for worker in workers:
+                worker.kill()
+            raise
+        for worker in workers:
+            self.idle.put_nowait(worker)
+
+    async def _replenish(self):
+        """Put a fresh worker in the pool once it is ready, in place of one that was killed"""
+        while not self.closed:
+            replacement = self._spawn()
+            try:
+                await replacement.receive()
+            except (EOFError, OSError):
+                replacement.kill()
+                await asyncio.sleep(RESTART_DELAY)
+                continue
+            except BaseException:
+                replacement.kill()
+                raise
+            if self.closed:
+                replacement.stop()
+            else:
+                self.idle.put_nowait(replacement)
+            return
+
+    def close(self):
+        self.closed = True
+        for restart in list(self.restarts):
+            restart.cancel()
+        if self.idle is not None:
+            while not self.idle.empty():
+                self.idle.get_nowait().stop()
+        for worker in self.busy:
+            worker.kill()
+        self.busy.clear()
+
+    async def parse(self, pdf_bytes: bytes, fields: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+        if self.admitted >= self.workers + self.queue:
+            raise HTTPError(503, 'Server busy, retry later')
+        self.admitted += 1
+        try:
+            worker = await self.idle.get()
+            self.busy.add(worker)
+            healthy = False
+            try:
+                worker.conn.send((pdf_bytes, fields))
+                ok, result = await asyncio.wait_for(worker.receive(), self.timeout)
+                healthy = True
+            except asyncio.TimeoutError:
+                raise HTTPError(504, f'Parsing took longer than {self.timeout:g}s')
+            except (EOFError, OSError):
+                worker.process.join(1)
+                raise HTTPError(500, f'Worker crashed (exit code {worker.process.exitcode}) on this document')
+            finally:
+                self.busy.discard(worker)
+                if healthy:
+                    self.idle.put_nowait(worker)
+                else:
+                    # Timed out, crashed, or the client went away mid-document
+                    worker.kill()
+                    restart = asyncio.get_running_loop().create_task(self._replenish())
+                    self.restarts.add(restart)
+                    restart.add_done_callback(self.restarts.discard)
+        finally:
+            self.admitted -= 1
+        if not ok:
+            raise HTTPError(422, result)
+        return result
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await self.read_request(reader)
+                except HTTPError as e:
+                    await self.respond(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                try:
+                    status, payload = await self.route(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                await self.respond(writer, status, payload, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, 'Malformed request line')
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        if method == 'POST':
+            if 'content-length' not in headers:
+                raise HTTPError(411, 'Content-Length is required')
+            try:
+                length = int(headers['content-length'])
+            except ValueError:
+                raise HTTPError(400, 'Invalid Content-Length')
+            if length > self.max_body:
+                raise HTTPError(413, f'Body larger than {self.max_body} bytes')
+            body = await reader.readexactly(length)
+        return method, target, headers, body
+
+    async def route(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        if url.path == '/health':
+            return 200, {'status': 'ok', 'workers': self.workers, 'in_flight': self.admitted}
+        if url.path != '/parse':
+            raise HTTPError(404, f'No route for {url.path}')
+        if method != 'POST':
+            raise HTTPError(405, 'POST the PDF bytes to /parse')
+        if not body:
+            raise HTTPError(400, 'Empty body')
+
+        fields = None
+        requested = parse_qs(url.query).get('fields')
+        if requested:
+            names = [name for value in requested for name in value.split(',') if name]
+            fields = CONTACT_FIELDS if names == ['contact'] else tuple(names)
+            unknown = [name for name in fields if name not in self.known_fields]
+            if unknown:
+                raise HTTPError(400, f"Unknown resume fields: {', '.join(unknown)}")
+        return 200, await self.parse(body, fields)
+
+    async def respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                      keep_alive: bool):
+        body = json.dumps(payload).encode('utf-8')
+        head = (f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+                'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n')
+        if status == 503:
+            head += 'Retry-After: 1\r\n'
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, service: ResumeService):
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Resume service on http://{host}:{port} with {service.workers} workers "
+          f"(queue {service.queue}, timeout {service.timeout:g}s)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help='parser processes (default: one per CPU)')
+    parser.add_argument('--queue', type=int, default=32, help='requests allowed to wait for a worker')
+    parser.add_argument('--timeout', type=float, default=30.0, help='seconds allowed per document')
+    parser.add_argument('--backend', default='auto',
+                        help="PDF text extractor, or a comma-separated fallback order (default: auto)")
+    parser.add_argument('--page-workers', type=int, default=None,
+                        help='processes per worker that split the pages of long PDFs (default: off)')
+    parser.add_argument('--page-threshold', type=int, default=DEFAULT_PAGE_THRESHOLD,
+                        help=f'only split PDFs with at least this many pages (default: {DEFAULT_PAGE_THRESHOLD})')
+    args = parser.parse_args()
+    backend = args.backend if args.backend == 'auto' else args.backend.split(',')
+    try:
+        asyncio.run(serve(args.host, args.port,
+                          ResumeService(args.workers, args.queue, args.timeout, backend=backend,
+                                        page_workers=args.page_workers, page_threshold=args.page_threshold)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
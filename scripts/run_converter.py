@@ -1,30 +1,237 @@
+import argparse
+import glob
+import os
 import sys
 from advanced_resume_parser import AdvancedResumePDFToCSV
+from batch_processing import DocumentLimits
+from duplicate_index import DuplicateIndex
+from instrumentation import Instrumentation
+from manifest import FileManifest
+from ner_fallback import DEFAULT_MODEL, NERFallback
+from output_writers import OUTPUT_FORMATS, CheckpointJournal, drop_rows, open_output_writer
+from page_parallel import DEFAULT_PAGE_THRESHOLD, PageParallelExtractor
+from pdf_backends import BACKENDS
+from pdf_sources import is_archive, iter_archive, iter_archive_names
+from scheduling import SCHEDULES
+from sharding import merge_shards, parse_shard, select_shard, shard_of, shard_output_path
+
+def print_metrics(metrics):
+    """Print one document's stage timings"""
+    stages = ', '.join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in metrics['stages'].items())
+    print(f"{metrics['source']}: {metrics['pages']} pages, {metrics['chars']} chars, "
+          f"{metrics['total_s'] * 1000:.1f}ms total ({stages})")
+
+def expand_inputs(pattern: str, recursive: bool = False):
+    """Turn a directory or glob into a sorted list of PDFs; None means a single file"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '**', '*.pdf') if recursive else os.path.join(pattern, '*.pdf')
+    elif not glob.has_magic(pattern):
+        return None
+    return sorted(path for path in glob.glob(pattern, recursive=True)
+                  if path.lower().endswith('.pdf') and os.path.isfile(path))
+
+def recover_incremental(converter, manifest, pdf_paths, output_path, journal_path, args):
+    """Record the files an interrupted incremental run checkpointed as done, then retire its journal"""
+    journal = CheckpointJournal(journal_path)
+    fieldnames = ['source_file'] + list(converter.resume_data)
+    # Opening the output against the journal cuts off rows written after the last checkpoint
+    with open_output_writer(output_path, fieldnames, journal=journal, append=True,
+                            output_format=args.format, partition_by=args.partition_by):
+        pass
+    finished = [path for path in pdf_paths if path in journal.done]
+    manifest.mark_done(finished)
+    manifest.save()
+    os.remove(journal_path)
+    print(f"Incremental: {len(finished)} PDFs were already converted by an interrupted run")
+
+def run_batch(converter, pdf_paths, args, shard=None):
+    """Convert many PDFs into one CSV, optionally only those new since the last run or one shard of them"""
+    output_path, failures_path, resume = args.output_csv_path, args.failures, args.resume
+    if shard is not None:
+        # Each shard has its own output, failures and journal, and always resumes from it
+        output_path = shard_output_path(output_path, shard)
+        if failures_path:
+            failures_path = shard_output_path(failures_path, shard)
+        resume = True
+        if isinstance(pdf_paths, list):
+            total = len(pdf_paths)
+            pdf_paths = list(select_shard(pdf_paths, shard))
+            print(f"Shard {shard}: {len(pdf_paths)} of {total} PDFs, writing {output_path}")
+        else:
+            print(f"Shard {shard}: writing {output_path}")
+
+    manifest = None
+    if args.incremental:
+        manifest = FileManifest(args.manifest or args.output_csv_path + '.manifest.json')
+        # Appended rows are checkpointed like a resumed run, so a crash neither loses nor repeats them
+        journal_path = output_path + '.journal'
+        resume = True
+        if os.path.exists(journal_path):
+            recover_incremental(converter, manifest, pdf_paths, output_path, journal_path, args)
+        changed = manifest.changed(pdf_paths)
+        print(f"Incremental: {len(changed)} new or changed of {len(pdf_paths)} PDFs")
+        pdf_paths = changed
+        if not pdf_paths:
+            manifest.save()
+            return
+        # A modified file's old row goes before its new one is appended
+        replaced = {os.path.abspath(path) for path in pdf_paths if manifest.known(path)}
+        if replaced:
+            dropped = drop_rows(output_path, lambda source: os.path.abspath(source) in replaced, args.format)
+            print(f"Incremental: removed {dropped} rows of {len(replaced)} modified PDFs")
+
+    limits = DocumentLimits(args.timeout, args.max_memory, args.max_page_count)
+    failures = converter.process_multiple_resumes(
+        pdf_paths, output_path, workers=args.workers, chunksize=args.chunksize,
+        resume=resume, append=args.incremental, source_column=True,
+        limits=limits, failures_path=failures_path, output_format=args.format,
+        partition_by=args.partition_by, schedule=args.schedule)
+
+    if manifest is not None:
+        # Failed files stay out of the manifest so the next run retries them
+        failed = {failure.pdf_path for failure in failures}
+        manifest.mark_done([path for path in pdf_paths if path not in failed])
+        manifest.save()
+        # The manifest now covers everything the journal recorded
+        os.remove(journal_path)
+
+def run_merge(converter, names, args):
+    """Combine the shard outputs of a sharded batch into output_csv_path"""
+    fieldnames = ['source_file'] + list(converter.resume_data)
+    result = merge_shards(names, args.output_csv_path, args.merge_shards, fieldnames, args.format)
+    print(f"Merged {args.merge_shards} shards: {result.rows} rows of {len(names)} PDFs "
+          f"saved to {args.output_csv_path}")
+    if result.failed:
+        print(f"{len(result.failed)} PDFs failed to parse in their shard (see the shard journals)")
 
 def main():
-    # Check if PDF file path is provided
-    if len(sys.argv) < 2:
-        print("Usage: python run_converter.py <pdf_file_path> [output_csv_path]")
-        print("If output_csv_path is not provided, it will default to 'extracted_resume_data.csv'")
-        sys.exit(1)
-    
-    # Get PDF file path
-    pdf_path = sys.argv[1]
-    
-    # Get output CSV path (optional)
-    output_path = sys.argv[2] if len(sys.argv) > 2 else "extracted_resume_data.csv"
-    
+    parser = argparse.ArgumentParser(
+        description="Convert resume PDFs to CSV",
+        epilog="If output_csv_path is not provided, it will default to 'extracted_resume_data.csv'")
+    parser.add_argument('pdf_file_path',
+                        help="a PDF, a directory of PDFs, a quoted glob like 'resumes/*.pdf', a ZIP or TAR "
+                             "archive of PDFs (read without extracting), or - to read one PDF from stdin")
+    parser.add_argument('output_csv_path', nargs='?', default="extracted_resume_data.csv")
+    parser.add_argument('--timings', action='store_true', help="print how long each parsing stage took")
+    parser.add_argument('--metrics-log', metavar='PATH', help="append per-document metrics as JSON lines")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="run under cProfile, save the stats to PATH and print the top functions")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default=None,
+                        help="output format (default: from the output path's extension, else csv)")
+    parser.add_argument('--dedupe', metavar='PATH',
+                        help="near-duplicate index (SQLite) kept across runs; adds a duplicate_of column")
+    parser.add_argument('--ner', nargs='?', const=DEFAULT_MODEL, metavar='MODEL',
+                        help="fill names and addresses the heuristics miss with a spaCy model "
+                             f"(default {DEFAULT_MODEL}), run in batches on the header only")
+    parser.add_argument('--page-workers', type=int, default=None, metavar='N',
+                        help="extract the pages of long PDFs on N processes; batch pool workers never do")
+    parser.add_argument('--page-threshold', type=int, default=DEFAULT_PAGE_THRESHOLD, metavar='PAGES',
+                        help=f"only split PDFs with at least this many pages (default: {DEFAULT_PAGE_THRESHOLD})")
+    parser.add_argument('--backend', default='auto',
+                        help="PDF text extractor: 'auto' (fastest installed, falling back to the others) "
+                             f"or a comma-separated fallback order of {', '.join(BACKENDS)}")
+
+    batch = parser.add_argument_group('batch options (directory or glob input)')
+    batch.add_argument('--recursive', action='store_true', help="include PDFs in subdirectories")
+    batch.add_argument('--workers', type=int, default=None, help="parser processes (default: one per CPU)")
+    batch.add_argument('--chunksize', type=int, default=None)
+    batch.add_argument('--schedule', choices=tuple(SCHEDULES), default='largest-first',
+                       help="order of work on the pool: biggest documents first with small ones grouped "
+                            "(default), or input order")
+    batch.add_argument('--resume', action='store_true', help="skip files an interrupted run already wrote")
+    batch.add_argument('--incremental', action='store_true',
+                       help="only parse PDFs that are new or changed since the last run and append them, "
+                            "replacing the rows of changed ones")
+    batch.add_argument('--manifest', metavar='PATH',
+                       help="manifest for --incremental (default: <output_csv_path>.manifest.json)")
+    batch.add_argument('--timeout', type=float, default=None, metavar='SECONDS',
+                       help="kill a document that takes longer than this")
+    batch.add_argument('--max-memory', type=int, default=None, metavar='MB',
+                       help="kill a document whose worker grows past this much resident memory")
+    batch.add_argument('--max-page-count', type=int, default=None, metavar='N',
+                       help="reject PDFs with more pages than this without extracting them")
+    batch.add_argument('--failures', metavar='PATH', help="write failed files and the reason to this CSV")
+    batch.add_argument('--partition-by', choices=('date', 'batch'), default=None,
+                       help="split parquet/arrow output into date=... or batch=... subdirectories")
+    sharding = batch.add_mutually_exclusive_group()
+    sharding.add_argument('--shard', metavar='I/N',
+                          help="parse only shard I of N (0 to N-1), chosen by a stable hash of each file name, "
+                               "into <output>.shard-I-of-N with its own resume journal")
+    sharding.add_argument('--merge-shards', type=int, metavar='N',
+                          help="combine the N shard outputs for this input into output_csv_path in input "
+                               "order, checking that no file is missing or duplicated")
+    args = parser.parse_args()
+
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.incremental:
+            parser.error("--shard keeps a resume journal and cannot be combined with --incremental")
+    if args.merge_shards is not None and args.merge_shards < 1:
+        parser.error("--merge-shards needs at least one shard")
+
+    page_parallel = None
     try:
-        # Create converter instance
-        converter = AdvancedResumePDFToCSV()
-        
+        # Create converter instance, instrumented only when asked to
+        instrumentation = None
+        if args.timings or args.metrics_log:
+            instrumentation = Instrumentation(print_metrics if args.timings else None, args.metrics_log)
+        backend = args.backend if args.backend == 'auto' else args.backend.split(',')
+        duplicate_index = DuplicateIndex(args.dedupe) if args.dedupe else None
+        ner = NERFallback(args.ner) if args.ner else None
+        page_parallel = PageParallelExtractor(args.page_workers, args.page_threshold) if args.page_workers else None
+        converter = AdvancedResumePDFToCSV(instrumentation=instrumentation, backend=backend,
+                                           duplicate_index=duplicate_index, ner=ner, page_parallel=page_parallel)
+
+        if is_archive(args.pdf_file_path):
+            if args.incremental:
+                parser.error("--incremental needs PDF files, not an archive")
+            if args.merge_shards:
+                run_merge(converter, list(iter_archive_names(args.pdf_file_path)), args)
+                return
+            # Streamed member by member; rows are named archive!member. Another
+            # shard's members are skipped without being read
+            select = (lambda name: shard_of(name, shard.count) == shard.index) if shard else None
+            run_batch(converter, iter_archive(args.pdf_file_path, select), args, shard)
+            return
+
+        pdf_paths = expand_inputs(args.pdf_file_path, args.recursive)
+        if pdf_paths is not None:
+            if not pdf_paths:
+                print(f"No PDF files found for {args.pdf_file_path}")
+                sys.exit(1)
+            if args.merge_shards:
+                run_merge(converter, pdf_paths, args)
+            else:
+                run_batch(converter, pdf_paths, args, shard)
+            return
+        if shard or args.merge_shards:
+            parser.error("--shard and --merge-shards need a directory, glob or archive of PDFs")
+
         # Parse resume and save to CSV
-        data = converter.parse_resume(pdf_path)
-        converter.save_to_csv(data, output_path)
-        
+        source = sys.stdin.buffer if args.pdf_file_path == '-' else args.pdf_file_path
+        if args.profile:
+            import cProfile
+            import pstats
+
+            profiler = cProfile.Profile()
+            data = profiler.runcall(converter.parse_resume, source)
+            profiler.dump_stats(args.profile)
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+            print(f"Profile saved to {args.profile}")
+        else:
+            data = converter.parse_resume(source)
+        converter.save_to_file(data, args.output_csv_path, args.format)
+
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if page_parallel is not None:
+            page_parallel.close()
 
 if __name__ == "__main__":
     main()
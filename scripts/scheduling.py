@@ -0,0 +1,246 @@
+import contextlib
+import os
+import re
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from pdf_sources import PDFDocument, PDFInput
+
+# How far from the end of a PDF to look for startxref, and how much of an object to read
+_TAIL_BYTES = 2048
+_READ_BYTES = 64 * 1024
+# Incremental updates chain xref sections through /Prev; stop following after this many
+_MAX_XREF_SECTIONS = 16
+
+_STARTXREF = re.compile(rb'startxref\s+(\d+)')
+_SUBSECTION = re.compile(rb'\s*(\d+)\s+(\d+)[ \t]*\r?\n')
+_ROOT = re.compile(rb'/Root\s+(\d+)\s+\d+\s+R')
+_PAGES = re.compile(rb'/Pages\s+(\d+)\s+\d+\s+R')
+_COUNT = re.compile(rb'/Count\s+(\d+)(?!\s+\d+\s+R)')
+_PREV = re.compile(rb'/Prev\s+(\d+)')
+_XREF_ENTRY_BYTES = 20
+
+Reader = Callable[[int, int], bytes]
+
+
+class JobSize(NamedTuple):
+    """Cheap metadata read before a document is scheduled; None where it could not be read"""
+    bytes: Optional[int]
+    pages: Optional[int]
+
+
+@contextlib.contextmanager
+def _random_access(source: PDFInput) -> Iterator[Optional[Tuple[Reader, int]]]:
+    """A read(offset, length) function and the size of a source, or None if it cannot seek"""
+    if isinstance(source, PDFDocument):
+        source = source.data
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            def read(offset, length):
+                file.seek(offset)
+                return file.read(length)
+            yield read, os.fstat(file.fileno()).st_size
+        return
+    if hasattr(source, 'read'):
+        if not source.seekable():
+            yield None
+            return
+        # Read in place, then put the stream back where the parser expects it
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+
+        def read(offset, length):
+            source.seek(offset)
+            return source.read(length)
+        try:
+            yield read, size
+        finally:
+            source.seek(position)
+        return
+    view = memoryview(source).cast('B')
+    with view:
+        yield (lambda offset, length: bytes(view[offset:offset + length])), len(view)
+
+
+def _read_xref_table(read: Reader, offset: int):
+    """Object offsets and trailer of a classic xref section, or None for an xref stream or garbage"""
+    data = read(offset, _READ_BYTES)
+    if not data.startswith(b'xref'):
+        return None
+    offsets = {}
+    position = len(b'xref')
+    while True:
+        match = _SUBSECTION.match(data, position)
+        if match is None:
+            break
+        first, count = int(match.group(1)), int(match.group(2))
+        position = match.end()
+        end = position + count * _XREF_ENTRY_BYTES
+        if end + _TAIL_BYTES > len(data):
+            data += read(offset + len(data), end + _TAIL_BYTES - len(data))
+        for number in range(count):
+            entry = data[position + number * _XREF_ENTRY_BYTES:position + (number + 1) * _XREF_ENTRY_BYTES]
+            if entry[17:18] == b'n':
+                offsets[first + number] = int(entry[:10])
+        position = end
+    trailer = data.find(b'trailer', position)
+    if trailer == -1:
+        return None
+    return offsets, data[trailer:trailer + _TAIL_BYTES]
+
+
+def _read_object(read: Reader, offset: int) -> bytes:
+    data = read(offset, _READ_BYTES)
+    end = data.find(b'endobj')
+    return data if end == -1 else data[:end]
+
+
+def trailer_page_count(read: Reader, size: int) -> Optional[int]:
+    """The page count from the trailer's /Root -> /Pages -> /Count, without parsing the document
+
+    Only follows classic xref tables (and their /Prev chain); PDFs that
+    use xref or object streams give None, as does anything malformed.
+    """
+    matches = list(_STARTXREF.finditer(read(max(0, size - _TAIL_BYTES), _TAIL_BYTES)))
+    if not matches:
+        return None
+    xref = int(matches[-1].group(1))
+    offsets, root, seen = {}, None, set()
+    while xref is not None and xref not in seen and len(seen) < _MAX_XREF_SECTIONS:
+        seen.add(xref)
+        section = _read_xref_table(read, xref)
+        if section is None:
+            return None
+        section_offsets, trailer = section
+        for number, object_offset in section_offsets.items():
+            # Newer sections come first and win
+            offsets.setdefault(number, object_offset)
+        if root is None:
+            match = _ROOT.search(trailer)
+            root = int(match.group(1)) if match else None
+        match = _PREV.search(trailer)
+        xref = int(match.group(1)) if match else None
+    if root not in offsets:
+        return None
+    match = _PAGES.search(_read_object(read, offsets[root]))
+    if match is None or int(match.group(1)) not in offsets:
+        return None
+    match = _COUNT.search(_read_object(read, offsets[int(match.group(1))]))
+    return int(match.group(1)) if match else None
+
+
+def job_size(source: PDFInput) -> JobSize:
+    """File size and trailer page count of a source, reading a few KB at most"""
+    try:
+        with _random_access(source) as access:
+            if access is None:
+                return JobSize(None, None)
+            read, size = access
+            try:
+                pages = trailer_page_count(read, size)
+            except (ValueError, IndexError):
+                pages = None
+            return JobSize(size, pages)
+    except (OSError, TypeError):
+        return JobSize(None, None)
+
+
+def job_costs(sizes: Sequence[JobSize]) -> List[float]:
+    """A relative cost per document: its page count, else its size in pages of the batch's average size"""
+    known = [size for size in sizes if size.pages is not None and size.bytes is not None]
+    pages, size_bytes = sum(size.pages for size in known), sum(size.bytes for size in known)
+    bytes_per_page = size_bytes / pages if pages else None
+    costs = []
+    for size in sizes:
+        if size.pages is not None:
+            cost = size.pages
+        elif size.bytes is None:
+            cost = 1
+        elif bytes_per_page:
+            cost = size.bytes / bytes_per_page
+        else:
+            cost = size.bytes
+        costs.append(max(cost, 1))
+    return costs
+
+
+# A policy turns per-document costs and a worker count into work units: lists of
+# document positions, in the order they are handed to the workers
+SchedulePolicy = Callable[[Sequence[float], int, Optional[int]], List[List[int]]]
+
+# Work units per worker: enough to balance load, few enough to keep per-unit overhead low
+UNITS_PER_WORKER = 4
+
+
+def default_chunksize(num_tasks: int, workers: int) -> int:
+    """Same heuristic as multiprocessing.Pool.map: about four chunks per worker"""
+    chunksize, extra = divmod(num_tasks, workers * UNITS_PER_WORKER)
+    return max(1, chunksize + (1 if extra else 0))
+
+
+def input_order(costs: Sequence[float], workers: int, chunksize: Optional[int] = None) -> List[List[int]]:
+    """Equal-length runs of documents in input order, ignoring cost"""
+    chunksize = chunksize or default_chunksize(len(costs), workers)
+    return [list(range(start, min(start + chunksize, len(costs)))) for start in range(0, len(costs), chunksize)]
+
+
+def largest_first(costs: Sequence[float], workers: int, chunksize: Optional[int] = None) -> List[List[int]]:
+    """Most expensive documents first, each alone; small ones grouped into units of similar cost
+
+    The largest-first order is the classic longest-processing-time rule:
+    the huge documents start while there is still other work to overlap
+    with them, so the batch no longer waits on one straggler at the end.
+    Documents cheaper than a unit's target cost share a unit, up to
+    chunksize documents, to keep the per-task overhead of small files down.
+    """
+    order = sorted(range(len(costs)), key=lambda position: costs[position], reverse=True)
+    target = sum(costs) / (workers * UNITS_PER_WORKER) if costs else 0
+    units: List[List[int]] = []
+    unit: List[int] = []
+    unit_cost = 0.0
+    for position in order:
+        if costs[position] >= target:
+            units.append([position])
+            continue
+        unit.append(position)
+        unit_cost += costs[position]
+        if unit_cost >= target or (chunksize is not None and len(unit) >= chunksize):
+            units.append(unit)
+            unit, unit_cost = [], 0.0
+    if unit:
+        units.append(unit)
+    return units
+
+
+SCHEDULES = {'input': input_order, 'largest-first': largest_first}
+
+
+def resolve_schedule(schedule: Union[str, SchedulePolicy]) -> SchedulePolicy:
+    if callable(schedule):
+        return schedule
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule {schedule!r}; choose from {', '.join(SCHEDULES)} or pass a function")
+    return SCHEDULES[schedule]
+
+
+# Documents per worker in a scheduling window. Results come out in input order,
+# so reordering within a window bounds how far output can lag behind the work
+WINDOW_PER_WORKER = 32
+
+
+def windowed_units(costs: Sequence[float], workers: int, chunksize: Optional[int] = None,
+                   schedule: Union[str, SchedulePolicy] = 'largest-first',
+                   window: Optional[int] = None) -> Iterator[Tuple[int, List[int]]]:
+    """(window number, unit) pairs: the schedule applied to each window of input positions in turn
+
+    Every window holds workers * WINDOW_PER_WORKER documents unless window
+    says otherwise; units are numbered by position in the whole input.
+    """
+    policy = resolve_schedule(schedule)
+    window = window or workers * WINDOW_PER_WORKER
+    for number, start in enumerate(range(0, len(costs), window)):
+        part = costs[start:start + window]
+        units = policy(part, workers, chunksize)
+        if sorted(position for unit in units for position in unit) != list(range(len(part))):
+            raise ValueError("The schedule must place every document in exactly one unit")
+        for unit in units:
+            yield number, [start + position for position in unit]
@@ -0,0 +1,299 @@
+import json
+import os
+import re
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from output_writers import CheckpointJournal
+
+# Fields that are not free text: the rest of a row (the resume sections) go into the full-text index
+NON_SECTION_FIELDS = ('source_file', 'name', 'email', 'phone', 'address', 'linkedin', 'github',
+                      'website', 'duplicate_of')
+
+# Looked up directly rather than searched; each gets a B-tree index
+_NOCASE_FIELDS = ('name', 'email')
+_PHONE_DIGITS = 'phone_digits'
+
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_NON_DIGITS = re.compile(r'\D')
+_LIKE_SPECIAL = re.compile(r'([\\%_])')
+
+# Words around a match in a search hit's snippet
+SNIPPET_TOKENS = 12
+
+
+class SearchHit(NamedTuple):
+    """One ranked search result: lower rank is better (SQLite's bm25)"""
+    rank: float
+    row: Dict[str, Any]
+    snippet: str
+
+
+def _digits(phone: str) -> str:
+    return _NON_DIGITS.sub('', phone or '')
+
+
+def _column_list(fields: Sequence[str], prefix: str = '') -> str:
+    return ', '.join(f'{prefix}"{field}"' for field in fields)
+
+
+def _create_schema(conn: sqlite3.Connection, fieldnames: List[str], section_fields: List[str]):
+    """The rows table, its full-text index kept in step by triggers, and the lookup indexes"""
+    columns = ', '.join(f'"{field}" TEXT' + (' COLLATE NOCASE' if field in _NOCASE_FIELDS else '')
+                        for field in fieldnames)
+    if 'phone' in fieldnames:
+        columns += f', {_PHONE_DIGITS} TEXT'
+    sections, new_sections = _column_list(section_fields), _column_list(section_fields, 'new.')
+    old_sections = _column_list(section_fields, 'old.')
+    # One statement at a time: executescript() would commit the caller's transaction
+    for statement in (
+            'CREATE TABLE index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)',
+            f'CREATE TABLE resumes (id INTEGER PRIMARY KEY, {columns})',
+            f"""CREATE VIRTUAL TABLE resumes_fts USING fts5({sections}, content='resumes', content_rowid='id',
+                                                         tokenize="unicode61 tokenchars '+#'")""",
+            f"""CREATE TRIGGER resumes_fts_insert AFTER INSERT ON resumes BEGIN
+                    INSERT INTO resumes_fts (rowid, {sections}) VALUES (new.id, {new_sections});
+                END""",
+            f"""CREATE TRIGGER resumes_fts_delete AFTER DELETE ON resumes BEGIN
+                    INSERT INTO resumes_fts (resumes_fts, rowid, {sections})
+                    VALUES ('delete', old.id, {old_sections});
+                END"""):
+        conn.execute(statement)
+    for field in _NOCASE_FIELDS:
+        if field in fieldnames:
+            conn.execute(f'CREATE INDEX resumes_{field} ON resumes ("{field}")')
+    if 'phone' in fieldnames:
+        conn.execute(f'CREATE INDEX resumes_{_PHONE_DIGITS} ON resumes ({_PHONE_DIGITS})')
+    conn.executemany('INSERT INTO index_meta (key, value) VALUES (?, ?)',
+                     [('fieldnames', json.dumps(fieldnames)), ('section_fields', json.dumps(section_fields))])
+
+
+def _read_meta(conn: sqlite3.Connection) -> Optional[Dict[str, List[str]]]:
+    try:
+        return {key: json.loads(value) for key, value in conn.execute('SELECT key, value FROM index_meta')}
+    except sqlite3.OperationalError:
+        return None
+
+
+def _drop_schema(conn: sqlite3.Connection):
+    for table in ('resumes_fts', 'resumes', 'index_meta'):
+        conn.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+def delete_rows(path: str, drop: Callable[[str], bool]) -> int:
+    """Delete the rows whose source_file drop() accepts; the triggers keep the full-text index in step"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        meta = _read_meta(conn)
+        if meta is None or 'source_file' not in meta['fieldnames']:
+            return 0
+        ids = [(row_id,) for row_id, source in conn.execute('SELECT id, source_file FROM resumes')
+               if drop(source or '')]
+        if ids:
+            conn.execute('BEGIN')
+            conn.executemany('DELETE FROM resumes WHERE id = ?', ids)
+            conn.execute('COMMIT')
+        return len(ids)
+    finally:
+        conn.close()
+
+
+class SearchIndexWriter:
+    """Load rows into a SQLite database with an FTS5 index over the resume sections
+
+    Rows go into a resumes table with one text column per field, and every
+    section field (everything but NON_SECTION_FIELDS) is indexed for full
+    text search. name and email are indexed case-insensitively and phone
+    by its digits, for direct lookups. Rows are inserted in bulk, one
+    transaction per batch_rows rows, or per flush when there is a journal
+    so each checkpoint is committed on its own; on resume, rows past the
+    last checkpoint are deleted. With append=True rows are added to an
+    existing index with the same fields, otherwise it is rebuilt.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], flush_every: int = 100,
+                 journal: Optional[CheckpointJournal] = None, append: bool = False,
+                 batch_rows: int = 10_000):
+        invalid = [field for field in fieldnames if not _IDENTIFIER.fullmatch(field)]
+        if invalid:
+            raise ValueError(f"Field names must be identifiers to be indexed: {', '.join(invalid)}")
+        self.path = path
+        self.fieldnames = fieldnames
+        self.section_fields = [field for field in fieldnames if field not in NON_SECTION_FIELDS]
+        if not self.section_fields:
+            raise ValueError("There are no section fields to index")
+        self.flush_every = flush_every
+        self.journal = journal
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self._since_flush = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._rows: List[tuple] = []
+        self._columns = list(fieldnames) + ([_PHONE_DIGITS] if 'phone' in fieldnames else [])
+        self._insert = (f'INSERT INTO resumes ({_column_list(fieldnames)}'
+                        f'{", " + _PHONE_DIGITS if "phone" in fieldnames else ""}) '
+                        f'VALUES ({", ".join("?" * len(self._columns))})')
+
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        meta = _read_meta(self._conn)
+        resuming = journal is not None and journal.committed_offset is not None
+        keep = meta is not None and (append or resuming)
+        if keep and (meta['fieldnames'] != fieldnames or meta['section_fields'] != self.section_fields):
+            raise ValueError(f"{path} indexes the fields {', '.join(meta['fieldnames'])}; "
+                             f"rebuild it to index {', '.join(fieldnames)}")
+        self._conn.execute('BEGIN')
+        if not keep:
+            _drop_schema(self._conn)
+            _create_schema(self._conn, fieldnames, self.section_fields)
+        elif resuming:
+            # Drop anything past the last checkpoint before adding rows
+            self._conn.execute('DELETE FROM resumes WHERE id > ?', (journal.committed_offset,))
+        self._conn.execute('COMMIT')
+        if append and journal is not None:
+            journal.start(self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM resumes').fetchone()[0])
+
+    def write_row(self, row: Dict[str, Any], source: Optional[str] = None):
+        """Write one parsed row; source is the file it came from, for the journal"""
+        values = [row.get(field) for field in self.fieldnames]
+        if 'phone' in self.fieldnames:
+            values.append(_digits(row.get('phone')))
+        self._rows.append(tuple(values))
+        self.rows_written += 1
+        if source is not None:
+            self._pending.append({'path': source, 'status': 'ok'})
+        if self.journal is None and len(self._rows) >= self.batch_rows:
+            self._write_buffer()
+        self._count_towards_flush()
+
+    def record_failure(self, source: str, error: str):
+        """Note a failed file in the journal without writing a row"""
+        self._pending.append({'path': source, 'status': 'failed', 'error': error})
+        self._count_towards_flush()
+
+    def _count_towards_flush(self):
+        self._since_flush += 1
+        if self._since_flush >= self.flush_every:
+            self.flush()
+
+    def _write_buffer(self):
+        if not self._rows:
+            return
+        self._conn.execute('BEGIN')
+        self._conn.executemany(self._insert, self._rows)
+        self._conn.execute('COMMIT')
+        self._rows = []
+
+    def flush(self):
+        self._since_flush = 0
+        if self.journal is None:
+            # Without checkpoints, keep buffering up to a full batch
+            return
+        self._write_buffer()
+        offset = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM resumes').fetchone()[0]
+        for entry in self._pending:
+            entry['offset'] = offset
+        self.journal.record(self._pending)
+        self._pending = []
+
+    def close(self):
+        if self.journal is not None:
+            self.flush()
+            self.journal.close()
+        else:
+            self._write_buffer()
+        if self.rows_written:
+            # Merge the index segments the batches left behind, so a query reads one b-tree
+            self._conn.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('optimize')")
+            self._conn.execute('PRAGMA optimize')
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ResumeSearchIndex:
+    """Read-only queries over an index written by SearchIndexWriter"""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No search index at {path}")
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA query_only=ON')
+        meta = _read_meta(self._conn)
+        if meta is None:
+            self._conn.close()
+            raise ValueError(f"{path} is not a resume search index")
+        self.fieldnames: List[str] = meta['fieldnames']
+        self.section_fields: List[str] = meta['section_fields']
+        self._columns = _column_list(self.fieldnames, 'resumes.')
+        self._select = f'SELECT {self._columns} FROM resumes'
+
+    def _row(self, values) -> Dict[str, Any]:
+        return dict(zip(self.fieldnames, values))
+
+    def search(self, query: str, fields: Optional[Sequence[str]] = None, limit: int = 20) -> List[SearchHit]:
+        """The best matches for an FTS5 query, e.g. 'kubernetes AND python' or 'skills: "c++"'
+
+        fields restricts the query to those section fields; the default
+        searches them all. Hits are ranked by bm25, best first.
+        """
+        unknown = [field for field in fields or () if field not in self.section_fields]
+        if unknown:
+            raise ValueError(f"Not a searchable field: {', '.join(unknown)}; "
+                             f"choose from {', '.join(self.section_fields)}")
+        match = f'{{{" ".join(fields)}}} : ({query})' if fields else query
+        sql = (f'SELECT {self._columns}, resumes_fts.rank, '
+               f"snippet(resumes_fts, -1, '[', ']', '...', {SNIPPET_TOKENS}) "
+               'FROM resumes_fts JOIN resumes ON resumes.id = resumes_fts.rowid '
+               'WHERE resumes_fts MATCH ? ORDER BY resumes_fts.rank LIMIT ?')
+        try:
+            rows = self._conn.execute(sql, (match, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Bad search query {query!r}: {e}") from None
+        return [SearchHit(values[-2], self._row(values[:-2]), values[-1]) for values in rows]
+
+    def find(self, email: Optional[str] = None, phone: Optional[str] = None, name: Optional[str] = None,
+             limit: int = 20) -> List[Dict[str, Any]]:
+        """Rows matching every given key: email exactly, phone by its digits, name by prefix, ignoring case"""
+        conditions, params = [], []
+        for field, value in (('email', email), ('phone', phone), ('name', name)):
+            if value is None:
+                continue
+            if field not in self.fieldnames:
+                raise ValueError(f"This index has no {field} field")
+            if field == 'email':
+                conditions.append('email = ?')
+                params.append(value)
+            elif field == 'phone':
+                conditions.append(f'{_PHONE_DIGITS} = ?')
+                params.append(_digits(value))
+            else:
+                conditions.append("name LIKE ? ESCAPE '\\'")
+                params.append(_LIKE_SPECIAL.sub(r'\\\1', value) + '%')
+        if not conditions:
+            raise ValueError("Give at least one of email, phone or name")
+        sql = f'{self._select} WHERE {" AND ".join(conditions)} ORDER BY id LIMIT ?'
+        return [self._row(values) for values in self._conn.execute(sql, (*params, limit))]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Every row in the order it was loaded"""
+        for values in self._conn.execute(f'{self._select} ORDER BY id'):
+            yield self._row(values)
+
+    def count(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
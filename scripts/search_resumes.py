@@ -0,0 +1,79 @@
+import argparse
+import sys
+import time
+from output_writers import OUTPUT_FORMATS, open_output_writer, read_rows
+from search_index import ResumeSearchIndex
+
+# Columns shown for each hit besides the snippet, when the index has them
+SUMMARY_FIELDS = ('name', 'email', 'phone', 'source_file')
+
+def describe(row):
+    return ' | '.join(row[field] for field in SUMMARY_FIELDS if row.get(field))
+
+def run_load(args):
+    """Index a converted CSV, JSON Lines or Parquet/Arrow output"""
+    rows = read_rows(args.converted, args.format)
+    first = next(rows, None)
+    if first is None:
+        print(f"No rows in {args.converted}")
+        return
+    started = time.perf_counter()
+    with open_output_writer(args.index, list(first), append=args.append, output_format='sqlite') as writer:
+        writer.write_row(first)
+        for row in rows:
+            writer.write_row(row)
+    print(f"Indexed {writer.rows_written} rows into {args.index} in {time.perf_counter() - started:.1f}s")
+
+def run_query(args):
+    fields = args.fields.split(',') if args.fields else None
+    with ResumeSearchIndex(args.index) as index:
+        started = time.perf_counter()
+        hits = index.search(args.query, fields, args.limit)
+        elapsed = time.perf_counter() - started
+        for hit in hits:
+            print(f"{-hit.rank:8.3f}  {describe(hit.row)}")
+            print(f"          {' '.join(hit.snippet.split())}")
+    print(f"{len(hits)} results in {elapsed * 1000:.1f}ms")
+
+def run_find(args):
+    with ResumeSearchIndex(args.index) as index:
+        started = time.perf_counter()
+        rows = index.find(args.email, args.phone, args.name, args.limit)
+        elapsed = time.perf_counter() - started
+        for row in rows:
+            print(describe(row))
+    print(f"{len(rows)} results in {elapsed * 1000:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Search converted resumes through a SQLite full-text index")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('load', help="build an index from a converter output")
+    load.add_argument('converted', help="output of run_converter.py (CSV, JSON Lines, Parquet or Arrow)")
+    load.add_argument('index', help="SQLite index to write, e.g. candidates.db")
+    load.add_argument('--format', choices=OUTPUT_FORMATS, default=None,
+                      help="format of the converted output (default: from its extension)")
+    load.add_argument('--append', action='store_true', help="add to the index instead of rebuilding it")
+
+    query = commands.add_parser('query', help="full-text search over the resume sections, best matches first")
+    query.add_argument('index')
+    query.add_argument('query', help='FTS5 query, e.g. "kubernetes AND python", "machine learning" or py*')
+    query.add_argument('--fields', help="comma-separated sections to search, e.g. skills,experience")
+    query.add_argument('--limit', type=int, default=20)
+
+    find = commands.add_parser('find', help="look up resumes by email, phone or name")
+    find.add_argument('index')
+    find.add_argument('--email')
+    find.add_argument('--phone', help="matched on its digits, so any formatting works")
+    find.add_argument('--name', help="case-insensitive prefix of the name")
+    find.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        {'load': run_load, 'query': run_query, 'find': run_find}[args.command](args)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import re
+from typing import Dict, Iterator, List, Tuple
+
+# Rank of each way a header can match, best first. This mirrors the order the
+# per-keyword patterns were tried in: "\n keyword:", "\n keyword\n", then the
+# same two anchored at the very start of the text.
+_NEWLINE_COLON, _NEWLINE_LINE, _START_COLON, _START_LINE = range(4)
+
+
+class SectionHeaderMatcher:
+    """All section header keywords compiled into one regex
+
+    A single finditer over the lowercased text finds every header line; the
+    per-section result is then picked with the same priorities as trying
+    each keyword's patterns one by one.
+
+    A header at the very start of the text is matched separately, so the
+    main pattern begins with a literal newline and the regex engine can
+    skip straight from one line break to the next.
+    """
+
+    def __init__(self, section_headers: Dict[str, List[str]]):
+        # Keep our own copy so the parser can tell when its headers changed
+        self.section_headers = {key: list(keywords) for key, keywords in section_headers.items()}
+        keywords = {keyword for words in self.section_headers.values() for keyword in words if keyword}
+        # Longest first so a keyword never shadows a longer one sharing its prefix
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        header = rf'(?P<keyword>{alternation})(?=\s*(?P<colon>:)|\s*\n)'
+        self.pattern = re.compile(r'\n\s*' + header) if keywords else None
+        self.start_pattern = re.compile(header) if keywords else None
+
+    def find(self, text_lower: str) -> Dict[str, int]:
+        """Map each section found in text_lower to its start position"""
+        # keyword -> {rank: earliest position}
+        matches: Dict[str, Dict[int, int]] = {}
+        for keyword, rank, start in self._scan(text_lower):
+            matches.setdefault(keyword, {}).setdefault(rank, start)
+        return self._positions(matches)
+
+    def _scan(self, text_lower: str, offset: int = 0) -> Iterator[Tuple[str, int, int]]:
+        """(keyword, rank, start) of each header line in text_lower, which begins offset characters into the text"""
+        if self.pattern is None:
+            return
+        position = 0
+        if offset == 0:
+            match = self.start_pattern.match(text_lower)
+            if match:
+                yield match.group('keyword'), _START_COLON if match.group('colon') else _START_LINE, 0
+                position = match.end()
+        for match in self.pattern.finditer(text_lower, position):
+            yield (match.group('keyword'), _NEWLINE_COLON if match.group('colon') else _NEWLINE_LINE,
+                   offset + match.start())
+
+    def _positions(self, matches: Dict[str, Dict[int, int]]) -> Dict[str, int]:
+        section_positions = {}
+        for section_key, keywords in self.section_headers.items():
+            for keyword in keywords:
+                ranks = matches.get(keyword)
+                if ranks:
+                    section_positions[section_key] = ranks[min(ranks)]
+                    break
+        return section_positions
+
+
+class GrowingTextSections:
+    """Section positions of a text read a part at a time, without rescanning what came before
+
+    A header match, colon lookahead included, never reads past the next
+    non-blank text, so every header before the last non-blank line is
+    final; only that line and whatever follows it are scanned again with
+    the next part. The positions always equal matcher.find() on the whole
+    lowercase text so far.
+    """
+
+    def __init__(self, matcher: SectionHeaderMatcher):
+        self.matcher = matcher
+        # Final headers only: keyword -> {rank: earliest position}
+        self._matches: Dict[str, Dict[int, int]] = {}
+        # The lowercase text from _offset on, scanned again with the next part
+        self._pending = ''
+        self._offset = 0
+
+    def add(self, text_lower: str) -> Dict[str, int]:
+        """Append the next lowercase part; returns the positions for all the text so far"""
+        pending = self._pending + text_lower
+        stable = _stable_end(pending)
+        matches = {keyword: dict(ranks) for keyword, ranks in self._matches.items()}
+        for keyword, rank, start in self.matcher._scan(pending, self._offset):
+            matches.setdefault(keyword, {}).setdefault(rank, start)
+            if start < self._offset + stable:
+                self._matches.setdefault(keyword, {}).setdefault(rank, start)
+        self._pending = pending[stable:]
+        self._offset += stable
+        return self.matcher._positions(matches)
+
+
+def _stable_end(text: str) -> int:
+    """Where the content before the last non-blank line ends, or 0 if there is none"""
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    end = text.rfind('\n', 0, end)
+    while end > 0 and text[end - 1].isspace():
+        end -= 1
+    return max(end, 0)
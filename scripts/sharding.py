@@ -0,0 +1,167 @@
+import hashlib
+import heapq
+import os
+import shutil
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from output_writers import CheckpointJournal, infer_output_format, open_output_writer, read_rows
+from pdf_sources import PDFInput, source_name
+
+# Names listed in a merge error before the rest are only counted
+_LISTED_NAMES = 5
+
+
+class Shard(NamedTuple):
+    """Shard index of count, numbered from 0"""
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(spec: str) -> Shard:
+    """Read an 'i/N' shard spec, e.g. '0/4' through '3/4'"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {spec!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be between 0 and N-1, got {spec!r}")
+    return Shard(index, count)
+
+
+def shard_of(name: str, count: int) -> int:
+    """The shard a document belongs to, from a hash of its name
+
+    A keyed hash rather than hash(), which is randomized per process, and
+    rather than the position in the input list, so every machine agrees
+    and adding files to the input never moves the ones already assigned.
+    """
+    digest = hashlib.blake2b(name.encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % count
+
+
+def select_shard(pdf_paths: Iterable[PDFInput], shard: Shard) -> Iterator[PDFInput]:
+    """The inputs belonging to shard, lazily and in input order"""
+    for pdf in pdf_paths:
+        name = source_name(pdf)
+        if name is None:
+            raise ValueError("Sharding needs named inputs (paths or archive members)")
+        if shard_of(name, shard.count) == shard.index:
+            yield pdf
+
+
+def shard_output_path(output_path: str, shard: Shard) -> str:
+    """Where a shard writes: out.csv becomes out.shard-0-of-4.csv"""
+    root, extension = os.path.splitext(output_path.rstrip('/\\'))
+    return f"{root}.shard-{shard.index}-of-{shard.count}{extension}"
+
+
+def shard_journal_path(output_path: str, shard: Shard) -> str:
+    """The shard's resume journal, which is also its progress record for the merge"""
+    return shard_output_path(output_path, shard) + '.journal'
+
+
+class MergeResult(NamedTuple):
+    rows: int
+    failed: List[str]
+
+
+class ShardMergeError(ValueError):
+    """The shard outputs do not add up to the input manifest"""
+
+
+def _describe(names: Sequence[str]) -> str:
+    listed = ', '.join(names[:_LISTED_NAMES])
+    return listed + (f" and {len(names) - _LISTED_NAMES} more" if len(names) > _LISTED_NAMES else '')
+
+
+def merge_shards(manifest: Sequence[str], output_path: str, count: int, fieldnames: List[str],
+                 output_format: Optional[str] = None, flush_every: int = 1000) -> MergeResult:
+    """Combine the count shard outputs of output_path into output_path, in manifest order
+
+    manifest is every input name in the original order, as the shards
+    listed it. Each shard's rows are already in that order, so they are
+    merged as sorted streams and only one row per shard is held at a time.
+    Every row's source_file must be in the manifest, belong to the shard
+    that wrote it, appear once, and be marked done in that shard's
+    journal. Every manifest entry must have a row or be recorded as
+    failed. Otherwise ShardMergeError is raised before the output is
+    replaced.
+    """
+    output_format = output_format or infer_output_format(output_path)
+    positions: Dict[str, int] = {}
+    for position, name in enumerate(manifest):
+        if positions.setdefault(name, position) != position:
+            raise ShardMergeError(f"{name} is listed twice in the input")
+
+    shards = [Shard(index, count) for index in range(count)]
+    done, failed = set(), set()
+    for shard in shards:
+        path, journal_path = shard_output_path(output_path, shard), shard_journal_path(output_path, shard)
+        if not (os.path.exists(path) and os.path.exists(journal_path)):
+            raise ShardMergeError(f"Shard {shard} has no output at {path} (or no journal); run it first")
+        journal = CheckpointJournal(journal_path)
+        journal.close()
+        done |= journal.done
+        failed |= journal.failed - journal.done
+
+    missing: Dict[Shard, List[str]] = {}
+    for name in manifest:
+        if name not in done and name not in failed:
+            missing.setdefault(Shard(shard_of(name, count), count), []).append(name)
+    if missing:
+        incomplete = '; '.join(f"shard {shard} is missing {len(names)} inputs ({_describe(names)})"
+                               for shard, names in sorted(missing.items()))
+        raise ShardMergeError(f"Shards are incomplete, rerun them to finish: {incomplete}")
+    unknown = sorted(done - positions.keys())
+    if unknown:
+        raise ShardMergeError(f"{len(unknown)} shard rows are not in the input: {_describe(unknown)}")
+
+    def ordered_rows(shard: Shard) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        last = -1
+        for row in read_rows(shard_output_path(output_path, shard), output_format):
+            name = row['source_file']
+            position = positions.get(name)
+            if position is None or name not in done:
+                raise ShardMergeError(f"Shard {shard} has a row for {name} that its journal never "
+                                      f"checkpointed; rerun the shard to finish it")
+            if shard_of(name, count) != shard.index:
+                raise ShardMergeError(f"Shard {shard} has a row for {name}, which belongs to shard "
+                                      f"{shard_of(name, count)}/{count}; were the shards run with N={count}?")
+            if position == last:
+                raise ShardMergeError(f"{name} appears twice in shard {shard}")
+            if position < last:
+                raise ShardMergeError(f"Shard {shard} is not in input order at {name}")
+            last = position
+            yield position, row
+
+    # Written beside the output and renamed over it only once every row checked out
+    temp_path = output_path.rstrip('/\\') + '.merging'
+    rows = 0
+    written = bytearray(len(manifest))
+    try:
+        with open_output_writer(temp_path, fieldnames, flush_every, output_format=output_format) as writer:
+            for position, row in heapq.merge(*(ordered_rows(shard) for shard in shards),
+                                             key=lambda item: item[0]):
+                written[position] = 1
+                writer.write_row(row)
+                rows += 1
+        unwritten = [name for name in manifest if name in done and not written[positions[name]]]
+        if unwritten:
+            raise ShardMergeError(f"{len(unwritten)} inputs are marked done but have no row: "
+                                  f"{_describe(unwritten)}")
+    except BaseException:
+        _remove_output(temp_path)
+        raise
+    _remove_output(output_path)
+    os.replace(temp_path, output_path)
+    return MergeResult(rows, [name for name in manifest if name in failed])
+
+
+def _remove_output(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)